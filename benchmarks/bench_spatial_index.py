@@ -0,0 +1,81 @@
+import os
+import sys
+import random
+import time
+
+# Add the project root to the path so we can import from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.unit.unit import Unit
+from src.unit.unit_manager import UnitManager
+
+
+def timed(label, func, repeat=1):
+    """Run func repeat times and print the average time per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<42} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def run_benchmark(unit_count=50000, map_size=1024, seed=0):
+    """
+    Stress the unit spatial index with unit_count units on a map_size x map_size map.
+    Each query is also timed against a linear scan of all units for comparison.
+    """
+    rng = random.Random(seed)
+    print(f"Spatial index benchmark: {unit_count} units on a {map_size}x{map_size} map\n")
+
+    units = [
+        Unit(i, "Spearmen", (rng.randrange(map_size), rng.randrange(map_size)))
+        for i in range(unit_count)
+    ]
+    manager = UnitManager()
+
+    def insert_all():
+        for unit in units:
+            manager.add_unit(unit)
+    timed("insert all units", insert_all)
+
+    moves = [(rng.randrange(unit_count), rng.randrange(map_size), rng.randrange(map_size))
+             for _ in range(10000)]
+
+    def move_batch():
+        for unit_id, x, y in moves:
+            manager.move_unit(unit_id, (x, y))
+    timed("move 10000 units", move_batch)
+
+    # A viewport-sized rectangle (roughly 32x24 tiles) in the middle of the map
+    min_x, min_y = map_size // 2, map_size // 2
+    max_x, max_y = min_x + 31, min_y + 23
+    index = manager.spatial_index
+
+    found = timed("query_rect 32x24 (index)", lambda: index.query_rect(min_x, min_y, max_x, max_y), 200)
+    expected = timed("query_rect 32x24 (linear scan)", lambda: [
+        u for u in manager.units.values()
+        if min_x <= u.position[0] <= max_x and min_y <= u.position[1] <= max_y
+    ], 5)
+    assert len(found) == len(expected)
+
+    center = (map_size // 3, map_size // 3)
+    found = timed("query_radius r=10 (index)", lambda: index.query_radius(center, 10), 200)
+    expected = timed("query_radius r=10 (linear scan)", lambda: [
+        u for u in manager.units.values()
+        if (u.position[0] - center[0]) ** 2 + (u.position[1] - center[1]) ** 2 <= 100
+    ], 5)
+    assert len(found) == len(expected)
+
+    probes = [(rng.randrange(map_size), rng.randrange(map_size)) for _ in range(1000)]
+    timed("nearest x1000 (index)", lambda: [index.nearest("unit", p) for p in probes])
+
+    def remove_all():
+        for unit_id in list(manager.units):
+            manager.remove_unit(unit_id)
+    timed("remove all units", remove_all)
+    assert len(index) == 0
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import platform
+import subprocess
+
+# Render without a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+# Add the project root to the path so we can import from src
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from src.tile_engine.tile_engine import TileEngine
+from src.tile_engine.chunk_cache import TERRAIN_COLORS
+
+SCREEN_SIZE = (1280, 720)
+MAP_SIZES = (64, 256)
+ZOOMS = (0.25, 0.5, 1.0, 2.0)
+UNIT_COUNTS = (0, 2000)
+FOG_COVERAGES = (0.0, 0.5, 1.0)   # Fraction of the map the player can currently see
+PAN_STEP = 7                      # Screen pixels panned per frame
+
+
+class BenchUnit:
+    """Minimal unit the tile engine can place and draw."""
+    def __init__(self, unit_type):
+        self.unit_type = unit_type
+
+
+class DrawCallCounter:
+    """
+    Counts draw calls made while it is installed.
+
+    pygame.Surface is swapped for a subclass counting blit, blits, fill and
+    scroll on every surface created meanwhile (layers, chunks, frames), and
+    the pygame.draw primitives are wrapped. Surfaces made by pygame itself,
+    such as scaled copies, are only counted as sources.
+    """
+    OPERATIONS = ('blit', 'blits', 'fill', 'scroll', 'primitive')
+
+    def __init__(self):
+        self.counts = dict.fromkeys(self.OPERATIONS, 0)
+        self.saved = None
+
+    def install(self):
+        counts = self.counts
+        original_surface = pygame.Surface
+
+        class CountingSurface(original_surface):
+            def blit(self, *args, **kwargs):
+                counts['blit'] += 1
+                return super().blit(*args, **kwargs)
+
+            def blits(self, *args, **kwargs):
+                counts['blits'] += 1
+                return super().blits(*args, **kwargs)
+
+            def fill(self, *args, **kwargs):
+                counts['fill'] += 1
+                return super().fill(*args, **kwargs)
+
+            def scroll(self, *args, **kwargs):
+                counts['scroll'] += 1
+                return super().scroll(*args, **kwargs)
+
+        def counted(func):
+            def wrapper(*args, **kwargs):
+                counts['primitive'] += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        names = ('rect', 'circle', 'polygon', 'line', 'lines', 'ellipse', 'arc', 'aaline', 'aalines')
+        self.saved = (original_surface, {name: getattr(pygame.draw, name) for name in names})
+        pygame.Surface = CountingSurface
+        for name, func in self.saved[1].items():
+            setattr(pygame.draw, name, counted(func))
+
+    def uninstall(self):
+        original_surface, draw_functions = self.saved
+        pygame.Surface = original_surface
+        for name, func in draw_functions.items():
+            setattr(pygame.draw, name, func)
+
+    def take(self):
+        """Return the counts since the last call and reset them"""
+        counts = dict(self.counts)
+        for name in self.counts:
+            self.counts[name] = 0
+        return counts
+
+
+def build_engine(map_size, unit_count, fog_coverage, seed):
+    """Create a tile engine with a random map, units and fog"""
+    rng = np.random.default_rng(seed)
+    engine = TileEngine(SCREEN_SIZE[0], SCREEN_SIZE[1], map_size, map_size)
+    player = engine.add_player("Bench", (220, 40, 40))
+
+    names = sorted(TERRAIN_COLORS)
+    codes = rng.integers(len(names), size=(map_size, map_size))
+    engine.map.generate_map([[names[code] for code in row] for row in codes.tolist()])
+
+    positions = rng.integers(map_size, size=(unit_count, 2)).tolist()
+    for i, (x, y) in enumerate(positions):
+        unit = BenchUnit("Warriors" if i % 2 else "Cavalry")
+        player.add_unit(unit)
+        engine.unit_manager.add_unit(unit, x, y)
+
+    visible = rng.random((map_size, map_size)) < fog_coverage
+    player.visible_mask = visible
+    player.visibility_version += 1
+    engine.map.exploration.set_mask(player.id, visible)
+    return engine
+
+
+def percentile_ms(samples, q):
+    return round(float(np.percentile(samples, q)) * 1000, 3)
+
+
+def run_scenario(map_size, zoom, unit_count, fog_coverage, frames, warmup, seed, counter):
+    """
+    Time update() + render() for frames frames while panning back and forth.
+
+    Returns:
+        Result dict for the scenario
+    """
+    engine = build_engine(map_size, unit_count, fog_coverage, seed)
+    screen = pygame.Surface(SCREEN_SIZE)
+    viewport = engine.viewport
+    viewport.zoom = zoom
+    viewport.center_on_position(map_size * 128, map_size * 128)
+
+    times = []
+    counts = dict.fromkeys(DrawCallCounter.OPERATIONS, 0)
+    for frame in range(warmup + frames):
+        # Pan in a square so every frame exposes new pixels
+        step = PAN_STEP / zoom
+        direction = (frame // 30) % 4
+        viewport.x += (step, 0, -step, 0)[direction]
+        viewport.y += (0, step, 0, -step)[direction]
+        viewport.clamp_to_map_bounds()
+
+        counter.take()
+        start = time.perf_counter()
+        engine.update()
+        engine.render(screen)
+        elapsed = time.perf_counter() - start
+        if frame >= warmup:
+            times.append(elapsed)
+            for name, count in counter.take().items():
+                counts[name] += count
+
+    return {
+        'map_size': map_size,
+        'zoom': zoom,
+        'units': unit_count,
+        'fog_coverage': fog_coverage,
+        'frame_ms': {
+            'p50': percentile_ms(times, 50),
+            'p95': percentile_ms(times, 95),
+            'p99': percentile_ms(times, 99),
+            'mean': round(float(np.mean(times)) * 1000, 3),
+        },
+        'draw_calls_per_frame': {name: round(count / frames, 2) for name, count in counts.items()},
+    }
+
+
+def git_commit():
+    """Current commit of the project, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(map_sizes=MAP_SIZES, zooms=ZOOMS, unit_counts=UNIT_COUNTS, fog_coverages=FOG_COVERAGES,
+                  frames=120, warmup=10, seed=0):
+    """
+    Sweep map size, zoom, unit count and fog coverage, timing TileEngine
+    rendering headlessly.
+
+    Returns:
+        Report dict with one result per scenario, ready to dump as JSON
+    """
+    os.chdir(PROJECT_ROOT)  # Tile manifests and atlas paths are project relative
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    counter = DrawCallCounter()
+    counter.install()
+    try:
+        results = []
+        for map_size, zoom, unit_count, fog_coverage in itertools.product(map_sizes, zooms, unit_counts, fog_coverages):
+            result = run_scenario(map_size, zoom, unit_count, fog_coverage, frames, warmup, seed, counter)
+            frame_ms = result['frame_ms']
+            print(f"map {map_size:>4}  zoom {zoom:<5} units {unit_count:>6}  fog {fog_coverage:<4}"
+                  f"  p50 {frame_ms['p50']:8.3f} ms  p95 {frame_ms['p95']:8.3f} ms  p99 {frame_ms['p99']:8.3f} ms",
+                  file=sys.stderr)
+            results.append(result)
+    finally:
+        counter.uninstall()
+
+    return {
+        'benchmark': 'tile_render',
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'screen': list(SCREEN_SIZE),
+        'frames': frames,
+        'warmup': warmup,
+        'seed': seed,
+        'results': results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless TileEngine frame time benchmark")
+    parser.add_argument("--map-sizes", type=int, nargs="+", default=MAP_SIZES)
+    parser.add_argument("--zooms", type=float, nargs="+", default=ZOOMS)
+    parser.add_argument("--units", type=int, nargs="+", default=UNIT_COUNTS)
+    parser.add_argument("--fog", type=float, nargs="+", default=FOG_COVERAGES)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.map_sizes, args.zooms, args.units, args.fog, args.frames, args.warmup, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -3,19 +3,25 @@ import pygame
 import configparser
 from src.engine.game_engine import GameEngine
 from src.engine.core_states import GameState
+from src.ui.image_cache import ImageCache, MENU_BACKDROP, MENU_LOGO
 
 def load_config():
     config = configparser.ConfigParser()
     config.read('config.ini')
     screen_width = int(config['Graphics']['screen_width'])
     screen_height = int(config['Graphics']['screen_height'])
-    return screen_width, screen_height
+    # Optional: present only the rectangles that changed instead of flipping every frame
+    dirty_rects = config['Graphics'].getboolean('dirty_rects', fallback=False)
+    return screen_width, screen_height, dirty_rects
 
 def main():
     pygame.init()
-    screen_width, screen_height = load_config()
+    screen_width, screen_height, dirty_rects = load_config()
     screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("Civ Game")
+    
+    # Decode the menu art while the engine and audio start up
+    ImageCache().warm_up([MENU_BACKDROP, MENU_LOGO])
 
     engine = GameEngine()
     # Add game_name attribute to store new game name
@@ -44,6 +50,16 @@ def main():
 
         engine.update()
 
+        if dirty_rects:
+            # Skip the frame entirely when nothing changed
+            rects = engine.collect_dirty_rects()
+            if rects:
+                screen.fill((0, 0, 0))
+                engine.render(screen)
+                pygame.display.update(rects)
+            clock.tick(60)
+            continue
+
         # Clear the screen
         screen.fill((0, 0, 0))
         
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import glob
+import hashlib
+import argparse
+import pygame
+
+ATLAS_DIR = os.path.join("assets", "atlas")
+MANIFEST_NAME = "atlas_manifest.json"
+SHEET_SIZE = 2048
+
+class MaxRectsPacker:
+    """
+    Packs rectangles into a fixed size sheet with the max-rects algorithm.
+    Every free area is kept as a maximal rectangle; each image goes into the
+    free rectangle that leaves the shortest leftover side (best short side fit).
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free_rects = [pygame.Rect(0, 0, width, height)]
+
+    def insert(self, width, height):
+        """Place a width x height rectangle, returning its Rect or None if it doesn't fit"""
+        best = None
+        best_score = None
+        for free in self.free_rects:
+            if width <= free.width and height <= free.height:
+                score = (min(free.width - width, free.height - height),
+                         max(free.width - width, free.height - height))
+                if best_score is None or score < best_score:
+                    best, best_score = free, score
+        if best is None:
+            return None
+
+        placed = pygame.Rect(best.x, best.y, width, height)
+        self._split(placed)
+        return placed
+
+    def _split(self, placed):
+        """Cut the placed rectangle out of every free rectangle it overlaps"""
+        remaining = []
+        for free in self.free_rects:
+            if not free.colliderect(placed):
+                remaining.append(free)
+                continue
+            if placed.left > free.left:
+                remaining.append(pygame.Rect(free.left, free.top, placed.left - free.left, free.height))
+            if placed.right < free.right:
+                remaining.append(pygame.Rect(placed.right, free.top, free.right - placed.right, free.height))
+            if placed.top > free.top:
+                remaining.append(pygame.Rect(free.left, free.top, free.width, placed.top - free.top))
+            if placed.bottom < free.bottom:
+                remaining.append(pygame.Rect(free.left, placed.bottom, free.width, free.bottom - placed.bottom))
+
+        # Drop free rectangles contained in another one
+        self.free_rects = [rect for i, rect in enumerate(remaining)
+                           if not any(j != i and other.contains(rect) and (other != rect or j < i)
+                                      for j, other in enumerate(remaining))]
+
+def collect_tile_images(project_root):
+    """
+    Find every image referenced by data/tiles/*.json that exists on disk.
+
+    Returns:
+        Sorted list of asset paths, relative to the project root as written in the JSON files
+    """
+    images = set()
+    for json_file in glob.glob(os.path.join(project_root, "data", "tiles", "*.json")):
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Could not read JSON file {json_file}: {e}")
+            continue
+
+        paths = [data.get('base_image')]
+        if isinstance(data.get('variants'), dict):
+            paths.extend(data['variants'].values())
+        for image_path in paths:
+            if image_path and os.path.exists(os.path.join(project_root, image_path)):
+                images.add(image_path)
+    return sorted(images)
+
+def hash_file(path):
+    """Content hash of an input image"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def pack_images(sizes, sheet_size):
+    """
+    Pack images onto as few sheets as needed, largest first.
+
+    Args:
+        sizes: {name: (width, height)}
+        sheet_size: Width and height of each sheet
+
+    Returns:
+        {name: (sheet index, Rect)}
+    """
+    packers = []
+    placements = {}
+    for name in sorted(sizes, key=lambda name: (-sizes[name][0] * sizes[name][1], name)):
+        width, height = sizes[name]
+        if width > sheet_size or height > sheet_size:
+            raise ValueError(f"{name} ({width}x{height}) does not fit a {sheet_size}px atlas sheet")
+        for index, packer in enumerate(packers):
+            rect = packer.insert(width, height)
+            if rect is not None:
+                break
+        else:
+            packers.append(MaxRectsPacker(sheet_size, sheet_size))
+            index, rect = len(packers) - 1, packers[-1].insert(width, height)
+        placements[name] = (index, rect)
+    return placements
+
+def build_tile_atlas(project_root=None, output_dir=None, sheet_size=SHEET_SIZE, force=False):
+    """
+    Pack the tile images into atlas sheets and write the atlas manifest.
+
+    Inputs whose content hash matches the existing manifest are skipped: if
+    nothing changed no file is written, and if only image contents changed
+    (same names and sizes) just those images are redrawn into the existing
+    sheets. Anything else repacks every sheet.
+
+    Returns:
+        Number of images drawn into sheets
+    """
+    if project_root is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if output_dir is None:
+        output_dir = os.path.join(project_root, ATLAS_DIR)
+
+    names = collect_tile_images(project_root)
+    hashes = {name: hash_file(os.path.join(project_root, name)) for name in names}
+    previous = None if force else load_manifest(output_dir)
+
+    if previous and previous.get('sheet_size') == sheet_size and previous.get('hashes') == hashes:
+        print("Tile atlas is up to date.")
+        return 0
+
+    changed = [name for name in names if not previous or previous.get('hashes', {}).get(name) != hashes[name]]
+    images = {name: pygame.image.load(os.path.join(project_root, name)) for name in changed}
+
+    reuse = (previous is not None and previous.get('sheet_size') == sheet_size
+             and set(previous.get('images', {})) == set(names)
+             and all(tuple(previous['images'][name][3:5]) == images[name].get_size() for name in changed)
+             and all(os.path.exists(os.path.join(output_dir, sheet)) for sheet in previous['sheets']))
+
+    if reuse:
+        # Same layout: redraw only the changed images into the existing sheets
+        placements = {name: (entry[0], pygame.Rect(entry[1:5])) for name, entry in previous['images'].items()}
+        sheet_files = previous['sheets']
+        sheets = [pygame.image.load(os.path.join(output_dir, sheet)) for sheet in sheet_files]
+    else:
+        for name in names:
+            if name not in images:
+                images[name] = pygame.image.load(os.path.join(project_root, name))
+        changed = names
+        placements = pack_images({name: image.get_size() for name, image in images.items()}, sheet_size)
+        sheet_count = max((index for index, _ in placements.values()), default=-1) + 1
+        sheet_files = [f"tiles_{index}.png" for index in range(sheet_count)]
+        # Trim each sheet to the area its images cover
+        sheets = []
+        for index in range(sheet_count):
+            rects = [rect for sheet, rect in placements.values() if sheet == index]
+            size = (max(rect.right for rect in rects), max(rect.bottom for rect in rects))
+            sheets.append(pygame.Surface(size, pygame.SRCALPHA))
+
+    for name in changed:
+        index, rect = placements[name]
+        sheets[index].fill((0, 0, 0, 0), rect)
+        sheets[index].blit(images[name], rect)
+
+    os.makedirs(output_dir, exist_ok=True)
+    touched = {placements[name][0] for name in changed}
+    for index in sorted(touched):
+        pygame.image.save(sheets[index], os.path.join(output_dir, sheet_files[index]))
+
+    manifest = {
+        'sheet_size': sheet_size,
+        'sheets': sheet_files,
+        'images': {name: [index] + list(rect) for name, (index, rect) in sorted(placements.items())},
+        'hashes': hashes,
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+
+    print(f"Packed {len(changed)} of {len(names)} tile images into {len(sheet_files)} atlas sheet(s).")
+    return len(changed)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack tile images into atlas sheets")
+    parser.add_argument("--sheet-size", type=int, default=SHEET_SIZE)
+    parser.add_argument("--force", action="store_true", help="Repack even if no input changed")
+    args = parser.parse_args()
+    try:
+        build_tile_atlas(sheet_size=args.sheet_size, force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
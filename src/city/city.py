@@ -1,3 +1,5 @@
+from src.engine.core_states import CityStatus
+
 class City:
     def __init__(self, id, name, position):
         self.id = id
@@ -1,11 +1,31 @@
 from src.city.city_serializer import CitySerializer
+from src.engine.spatial_index import SpatialIndex
 
 class CityManager:
-    def __init__(self):
+    def __init__(self, spatial_index=None):
         self.cities = {}  # {city_id: City}
+        # Spatial index shared with other managers (e.g. units) when one is passed in
+        self.spatial_index = spatial_index if spatial_index is not None else SpatialIndex()
 
     def add_city(self, city):
         self.cities[city.id] = city
+        self.spatial_index.insert(city, city.position, "city")
+
+    def remove_city(self, city_id):
+        """Remove a razed city"""
+        city = self.cities.pop(city_id, None)
+        if city is None:
+            return False
+        self.spatial_index.remove(city)
+        return True
+
+    def get_cities_in_radius(self, position, radius):
+        """Return all cities within a tile radius of a position"""
+        return self.spatial_index.query_radius(position, radius, "city")
+
+    def get_nearest_city(self, position, predicate=None):
+        """Return the city closest to a position, optionally filtered by predicate"""
+        return self.spatial_index.nearest("city", position, predicate=predicate)
 
     def update_cities(self):
         # Update resource collection, growth, and production in each city
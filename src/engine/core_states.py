@@ -5,6 +5,7 @@ class GameState(Enum):
     MAIN_MENU = auto()
     NEW_GAME = auto()
     LOAD_GAME = auto()  # Added missing enum value
+    OPTIONS_MENU = auto()
     IN_GAME = auto()
     PAUSED = auto()
     GAME_OVER = auto()
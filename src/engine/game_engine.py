@@ -2,6 +2,7 @@ from src.engine.core_states import GameState
 from src.engine.map import Map
 from src.unit.unit_manager import UnitManager
 from src.city.city_manager import CityManager
+from src.engine.spatial_index import SpatialIndex
 from src.ai.ai_manager import AIManager
 from src.ui.ui_manager import UIManager
 from src.event.event_manager import EventManager
@@ -37,8 +38,10 @@ class GameEngine:
         self.map = Map()   # procedural map using tiles
         
         # Managers for different domains of the game
-        self.unit_manager = UnitManager()
-        self.city_manager = CityManager()
+        # Units and cities share one spatial index for "what's near here" queries
+        self.spatial_index = SpatialIndex()
+        self.unit_manager = UnitManager(self.spatial_index)
+        self.city_manager = CityManager(self.spatial_index)
         self.ai_manager = AIManager()
         self.ui_manager = UIManager()
         self.event_manager = EventManager()
@@ -352,6 +355,7 @@ class GameEngine:
             return
             
         self.options_menu = OptionsMenuScreen(self.screen, self.sound_manager, self.return_to_main_menu)
+        self.game_state = GameState.OPTIONS_MENU
         if self.audio_debug:
             self.logger.debug("Changing audio state to OPTIONS_MENU")
         self.audio_state_manager.change_state(GameAudioState.OPTIONS_MENU)
@@ -449,6 +453,15 @@ class GameEngine:
                 self.logger.error(f"Error updating options menu: {str(e)}")
                 self.return_to_main_menu()
     
+    def collect_dirty_rects(self):
+        """Return the screen rectangles that need presenting this frame."""
+        # Always ask the UI manager so it sees state changes into and out of options
+        rects = self.ui_manager.collect_dirty_rects()
+        if self.options_menu:
+            # The options menu redraws itself every frame
+            return [self.screen.get_rect()]
+        return rects
+    
     def render(self, screen):
         """Render the current game state."""
         # First check if options menu is active and render it
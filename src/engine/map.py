@@ -1,4 +1,5 @@
 from src.engine.tile import Tile  # added import
+from src.engine.tile_bitsets import PlayerTileBitsets
 from src.engine.map_serializer import MapSerializer
 
 class Map:
@@ -6,6 +7,19 @@ class Map:
         self.width = width
         self.height = height
         self.tiles = [[Tile("grassland", (x, y)) for x in range(width)] for y in range(height)]
+        self.explored = PlayerTileBitsets(width, height)  # one packed bit row per player
+    
+    def mark_explored(self, player_id, x, y):
+        """Record that a player has explored the tile at (x, y)"""
+        self.explored.set_tile(player_id, x, y)
+    
+    def is_explored(self, player_id, x, y):
+        """Check whether a player has explored the tile at (x, y)"""
+        return self.explored.is_set(player_id, x, y)
+    
+    def explored_by(self, x, y):
+        """Return the ids of all players who have explored the tile at (x, y)"""
+        return self.explored.players_at(x, y)
     
     def serialize(self):
         """Serialize map data using the MapSerializer"""
@@ -1,3 +1,5 @@
+from src.engine.tile_bitsets import PlayerTileBitsets
+
 class MapSerializer:
     """
     Handles serialization and deserialization of Map objects.
@@ -15,7 +17,8 @@ class MapSerializer:
         serialized_data = {
             'width': game_map.width,
             'height': game_map.height,
-            'tiles': MapSerializer.serialize_tiles(game_map)
+            'tiles': MapSerializer.serialize_tiles(game_map),
+            'explored': game_map.explored.serialize()
         }
         
         return serialized_data
@@ -29,14 +32,15 @@ class MapSerializer:
                 tile = game_map.tiles[y][x]
                 serialized_tiles.append({
                     'position': (x, y),
-                    'tile_type': tile.tile_type,
-                    'explored_by': tile.explored_by.copy() if hasattr(tile, 'explored_by') else []
+                    'tile_type': tile.tile_type
                 })
         return serialized_tiles
     
     @staticmethod
     def deserialize_map(map_data, map_instance):
         """Apply serialized map data to a Map instance"""
-        # This would rebuild the map from saved data
-        # Implementation depends on how Map is constructed
-        pass
+        # Exploration is stored as packed bytes per player and restored directly
+        if map_data.get('explored'):
+            map_instance.explored = PlayerTileBitsets.deserialize(map_data['explored'])
+        
+        # Rebuilding tiles from saved data depends on how Map is constructed
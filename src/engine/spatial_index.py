@@ -0,0 +1,183 @@
+import heapq
+import math
+
+
+class SpatialIndex:
+    """
+    Uniform grid index of objects positioned on map tiles.
+
+    Objects are grouped per tile, and occupied tiles are grouped into square
+    buckets of bucket_size x bucket_size tiles. Rectangle, radius and nearest
+    neighbour queries only visit the buckets that overlap the query area.
+    Objects are used as their own keys, so units and cities can share an index.
+    """
+    def __init__(self, bucket_size=8):
+        self.bucket_size = bucket_size
+        self.buckets = {}     # {(bucket_x, bucket_y): set of occupied (x, y) tiles}
+        self.tiles = {}       # {(x, y): {obj: kind}}
+        self.positions = {}   # {obj: (x, y)}
+        self.extent = None    # (min_bx, min_by, max_bx, max_by) of buckets ever occupied
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, obj):
+        return obj in self.positions
+
+    def _bucket_of(self, x, y):
+        return x // self.bucket_size, y // self.bucket_size
+
+    def insert(self, obj, position, kind=None):
+        """Add an object at a tile position, replacing any previous entry"""
+        if obj in self.positions:
+            self.remove(obj)
+
+        x, y = int(position[0]), int(position[1])
+        occupants = self.tiles.get((x, y))
+        if occupants is None:
+            occupants = self.tiles[(x, y)] = {}
+            bx, by = self._bucket_of(x, y)
+            self.buckets.setdefault((bx, by), set()).add((x, y))
+            self._grow_extent(bx, by)
+        occupants[obj] = kind
+        self.positions[obj] = (x, y)
+
+    def remove(self, obj):
+        """Remove an object from the index; returns False if it was not indexed"""
+        position = self.positions.pop(obj, None)
+        if position is None:
+            return False
+
+        occupants = self.tiles[position]
+        del occupants[obj]
+        if not occupants:
+            del self.tiles[position]
+            bucket_key = self._bucket_of(*position)
+            bucket = self.buckets[bucket_key]
+            bucket.discard(position)
+            if not bucket:
+                del self.buckets[bucket_key]
+        return True
+
+    def move(self, obj, position):
+        """Move an indexed object to a new tile position"""
+        x, y = int(position[0]), int(position[1])
+        old_position = self.positions.get(obj)
+        if old_position == (x, y):
+            return
+        kind = self.tiles[old_position][obj] if old_position is not None else None
+        self.insert(obj, (x, y), kind)
+
+    def position_of(self, obj):
+        """Return the tile position of an object, or None if it is not indexed"""
+        return self.positions.get(obj)
+
+    def query_tile(self, x, y, kind=None):
+        """Return all objects on a single tile"""
+        occupants = self.tiles.get((x, y))
+        if not occupants:
+            return []
+        return [obj for obj, obj_kind in occupants.items() if kind is None or obj_kind == kind]
+
+    def query_rect(self, min_x, min_y, max_x, max_y, kind=None):
+        """Return all objects on tiles inside an inclusive tile rectangle"""
+        results = []
+        min_bx, min_by = self._bucket_of(min_x, min_y)
+        max_bx, max_by = self._bucket_of(max_x, max_y)
+
+        # Iterate whichever is smaller: the covered buckets or the occupied ones
+        if (max_bx - min_bx + 1) * (max_by - min_by + 1) <= len(self.buckets):
+            bucket_keys = ((bx, by) for by in range(min_by, max_by + 1)
+                           for bx in range(min_bx, max_bx + 1))
+        else:
+            bucket_keys = (key for key in self.buckets
+                           if min_bx <= key[0] <= max_bx and min_by <= key[1] <= max_by)
+
+        for bucket_key in bucket_keys:
+            bucket = self.buckets.get(bucket_key)
+            if not bucket:
+                continue
+            for tile_x, tile_y in bucket:
+                if min_x <= tile_x <= max_x and min_y <= tile_y <= max_y:
+                    for obj, obj_kind in self.tiles[(tile_x, tile_y)].items():
+                        if kind is None or obj_kind == kind:
+                            results.append(obj)
+        return results
+
+    def query_radius(self, position, radius, kind=None):
+        """Return all objects within a Euclidean tile distance of a position"""
+        center_x, center_y = position
+        reach = int(math.floor(radius))
+        radius_sq = radius * radius
+        return [
+            obj for obj in self.query_rect(center_x - reach, center_y - reach,
+                                           center_x + reach, center_y + reach, kind)
+            if (self.positions[obj][0] - center_x) ** 2 + (self.positions[obj][1] - center_y) ** 2 <= radius_sq
+        ]
+
+    def nearest(self, kind, position, max_radius=None, predicate=None):
+        """
+        Find the object of a kind closest to a tile position.
+
+        Args:
+            kind: Kind to match, or None to match any object
+            position (tuple): (x, y) tile position to search from
+            max_radius (float, optional): Ignore objects further away than this
+            predicate (callable, optional): Extra filter, e.g. to skip own units
+
+        Returns:
+            The nearest matching object, or None if there is none
+        """
+        if not self.positions:
+            return None
+
+        center_x, center_y = position
+        center_bx, center_by = self._bucket_of(center_x, center_y)
+        best, best_dist_sq = None, math.inf
+
+        # Visit buckets in order of their minimum possible distance to the position
+        heap = [(0, center_bx, center_by)]
+        seen = {(center_bx, center_by)}
+        max_ring = self._max_ring(center_bx, center_by)
+        while heap:
+            bound_sq, bx, by = heapq.heappop(heap)
+            if bound_sq > best_dist_sq or (max_radius is not None and bound_sq > max_radius * max_radius):
+                break
+
+            for tile_x, tile_y in self.buckets.get((bx, by), ()):
+                dist_sq = (tile_x - center_x) ** 2 + (tile_y - center_y) ** 2
+                if dist_sq >= best_dist_sq or (max_radius is not None and dist_sq > max_radius * max_radius):
+                    continue
+                for obj, obj_kind in self.tiles[(tile_x, tile_y)].items():
+                    if (kind is None or obj_kind == kind) and (predicate is None or predicate(obj)):
+                        best, best_dist_sq = obj, dist_sq
+                        break
+
+            for nbx, nby in ((bx + 1, by), (bx - 1, by), (bx, by + 1), (bx, by - 1)):
+                if (nbx, nby) in seen or max(abs(nbx - center_bx), abs(nby - center_by)) > max_ring:
+                    continue
+                seen.add((nbx, nby))
+                heapq.heappush(heap, (self._bucket_distance_sq(nbx, nby, center_x, center_y), nbx, nby))
+
+        return best
+
+    def _grow_extent(self, bx, by):
+        """Widen the occupied bucket extent to include a bucket"""
+        if self.extent is None:
+            self.extent = (bx, by, bx, by)
+        else:
+            min_bx, min_by, max_bx, max_by = self.extent
+            self.extent = (min(min_bx, bx), min(min_by, by), max(max_bx, bx), max(max_by, by))
+
+    def _max_ring(self, center_bx, center_by):
+        """Chebyshev bucket distance to the edge of the occupied extent"""
+        min_bx, min_by, max_bx, max_by = self.extent
+        return max(center_bx - min_bx, max_bx - center_bx, center_by - min_by, max_by - center_by, 0)
+
+    def _bucket_distance_sq(self, bx, by, x, y):
+        """Squared distance from a tile position to the closest tile in a bucket"""
+        min_x, min_y = bx * self.bucket_size, by * self.bucket_size
+        max_x, max_y = min_x + self.bucket_size - 1, min_y + self.bucket_size - 1
+        dx = max(min_x - x, 0, x - max_x)
+        dy = max(min_y - y, 0, y - max_y)
+        return dx * dx + dy * dy
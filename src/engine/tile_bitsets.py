@@ -0,0 +1,157 @@
+import base64
+import numpy as np
+
+# Number of set bits for every possible byte value, used to count packed rows
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class PlayerTileBitsets:
+    """
+    Stores one packed bit array per player covering every tile of a map.
+
+    Tile (x, y) maps to bit index y * width + x. Rows use the same bit order as
+    np.packbits (most significant bit first), so a row can be unpacked with
+    np.unpackbits(row, count=width * height) and reshaped to (height, width).
+    An existing (capacity, row_bytes) uint8 array, such as an np.memmap, can be
+    passed as bits; such storage has a fixed capacity and is never reallocated
+    unless growable is set. Growing copy-on-write storage (anything with a
+    snapshot() method, such as a ChunkedLayer) copies it into a new root of the
+    same type, so snapshots sharing the old storage are left untouched.
+    """
+    def __init__(self, width, height, capacity=8, bits=None, growable=None):
+        self.width = width
+        self.height = height
+        self.tile_count = width * height
+        self.row_bytes = (self.tile_count + 7) // 8
+        if bits is None:
+            self.bits = np.zeros((capacity, self.row_bytes), dtype=np.uint8)
+        else:
+            self.bits = bits
+        self.growable = bits is None if growable is None else growable
+        self.rows = {}  # {player_id: row index into self.bits}
+
+    @property
+    def capacity(self):
+        """Number of player rows that can be stored without growing"""
+        return self.bits.shape[0]
+
+    def player_ids(self):
+        """Return the ids of all players that have a row"""
+        return list(self.rows.keys())
+
+    def snapshot(self):
+        """
+        Return bitsets sharing storage with these until either side writes.
+        Only available when bits is copy-on-write storage with a snapshot() method.
+        """
+        # Growing a snapshot copies it, so it can grow even when these can't
+        snapshot = PlayerTileBitsets(self.width, self.height, bits=self.bits.snapshot(), growable=True)
+        snapshot.rows = dict(self.rows)
+        return snapshot
+
+    def add_player(self, player_id):
+        """Reserve a row for a player and return its index"""
+        if player_id in self.rows:
+            return self.rows[player_id]
+
+        row = len(self.rows)
+        if row >= self.capacity:
+            if not self.growable:
+                raise ValueError(f"No free bitset row for player {player_id} (capacity {self.capacity})")
+            # Double the capacity, keeping existing rows intact
+            grown = np.zeros((max(1, self.capacity * 2), self.row_bytes), dtype=np.uint8)
+            grown[:self.capacity] = np.asarray(self.bits)
+            self.bits = type(self.bits)(grown) if hasattr(self.bits, 'snapshot') else grown
+
+        self.rows[player_id] = row
+        return row
+
+    def _locate(self, x, y):
+        """Return the (byte index, bit mask) for a tile"""
+        index = y * self.width + x
+        return index >> 3, 0x80 >> (index & 7)
+
+    def set_tile(self, player_id, x, y):
+        """Set the bit for a single tile"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            row = self.add_player(player_id)
+            byte_index, bit = self._locate(x, y)
+            self.bits[row, byte_index] |= bit
+
+    def is_set(self, player_id, x, y):
+        """Check whether the bit for a tile is set for a player"""
+        row = self.rows.get(player_id)
+        if row is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        byte_index, bit = self._locate(x, y)
+        return bool(self.bits[row, byte_index] & bit)
+
+    def set_mask(self, player_id, mask):
+        """OR a boolean (height, width) mask into a player's row"""
+        row = self.add_player(player_id)
+        packed = np.packbits(np.asarray(mask, dtype=bool).reshape(-1))
+        # Assign rather than OR in place so copy-on-write storage sees the write
+        self.bits[row] = self.bits[row] | packed
+
+    def players_at(self, x, y):
+        """Return the ids of all players with the bit for a tile set"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return []
+        byte_index, bit = self._locate(x, y)
+        column = self.bits[:, byte_index] & bit
+        return [player_id for player_id, row in self.rows.items() if column[row]]
+
+    def row(self, player_id):
+        """Return the packed row for a player (all zeros if unknown)"""
+        row = self.rows.get(player_id)
+        if row is None:
+            return np.zeros(self.row_bytes, dtype=np.uint8)
+        return self.bits[row]
+
+    def union(self, player_ids=None):
+        """Return the packed OR of several players' rows (all players by default)"""
+        if player_ids is None:
+            player_ids = self.player_ids()
+        rows = [self.rows[player_id] for player_id in player_ids if player_id in self.rows]
+        if not rows:
+            return np.zeros(self.row_bytes, dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bits[rows], axis=0)
+
+    def count(self, player_id=None):
+        """Count set tiles for one player, or for the union of all players"""
+        packed = self.union() if player_id is None else self.row(player_id)
+        return int(_POPCOUNT[packed].sum(dtype=np.int64))
+
+    def to_mask(self, player_id=None):
+        """Unpack a player's row (or the union of all players) into a (height, width) bool array"""
+        packed = self.union() if player_id is None else self.row(player_id)
+        flat = np.unpackbits(packed, count=self.tile_count)
+        return flat.reshape(self.height, self.width).astype(bool)
+
+    def clear(self, player_id=None):
+        """Clear the bits of one player, or of every player"""
+        if player_id is None:
+            self.bits[:] = 0
+        elif player_id in self.rows:
+            self.bits[self.rows[player_id]] = 0
+
+    def serialize(self):
+        """Convert the bitsets to a JSON friendly dictionary of packed bytes"""
+        return {
+            'width': self.width,
+            'height': self.height,
+            'players': [
+                [player_id, base64.b64encode(self.bits[row].tobytes()).decode('ascii')]
+                for player_id, row in self.rows.items()
+            ]
+        }
+
+    @staticmethod
+    def deserialize(data):
+        """Rebuild bitsets from the output of serialize()"""
+        bitsets = PlayerTileBitsets(data['width'], data['height'],
+                                    capacity=max(1, len(data.get('players', []))))
+        for player_id, encoded in data.get('players', []):
+            row = bitsets.add_player(player_id)
+            bitsets.bits[row] = np.frombuffer(base64.b64decode(encoded), dtype=np.uint8)
+        return bitsets
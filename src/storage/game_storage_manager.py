@@ -1,4 +1,5 @@
 import os
+import hashlib
 import sqlite3
 import json
 from datetime import datetime
@@ -7,6 +8,7 @@ from src.player.player_serializer import PlayerSerializer
 from src.engine.map_serializer import MapSerializer
 from src.unit.unit_serializer import UnitSerializer
 from src.city.city_serializer import CitySerializer
+from src.tile_engine.map import GameMap
 
 class GameStorageManager:
     """
@@ -42,6 +44,34 @@ class GameStorageManager:
         conn.commit()
         conn.close()
     
+    def get_map_file_path(self, game_name):
+        """
+        Get the path of the memory-mapped map layer file for a game.
+        Map layers are too large for the JSON save data, so they are stored in a
+        single file next to the save database. The file name keeps a readable
+        form of the game name plus a hash of the exact name, so names that read
+        the same ("My World", "My_World") never share a file.
+        """
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in game_name)
+        digest = hashlib.sha1(game_name.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(os.path.dirname(self.db_path), f"{safe_name}-{digest}.map")
+    
+    def save_map_layers(self, game_name, game_map):
+        """Write a GameMap's layers to the game's map file; the map stays backed by it"""
+        game_map.save(self.get_map_file_path(game_name))
+    
+    def load_map_layers(self, game_name, mode='r+'):
+        """
+        Memory-map the layers saved for a game.
+        
+        Returns:
+            GameMap paged in from the map file, or None if the game has no map file
+        """
+        map_file_path = self.get_map_file_path(game_name)
+        if not os.path.exists(map_file_path):
+            return None
+        return GameMap.open(map_file_path, mode)
+    
     def check_game_name_exists(self, game_name):
         """Check if a game with the given name already exists"""
         conn = sqlite3.connect(self.db_path)
@@ -73,13 +103,15 @@ class GameStorageManager:
         conn.close()
         return game_list
     
-    def save_game(self, game_data_dto, force_override=False):
+    def save_game(self, game_data_dto, force_override=False, game_map=None):
         """
         Save the game data to the database
         
         Args:
             game_data_dto (GameDataDTO): The game data to save
             force_override (bool): If True, will override existing save with the same name
+            game_map (GameMap): Optional tile map whose layers are written to the
+                                memory-mapped map file next to the database
             
         Returns:
             bool: True if save was successful, False otherwise
@@ -114,9 +146,12 @@ class GameStorageManager:
         
         conn.commit()
         conn.close()
+        
+        if game_map is not None:
+            self.save_map_layers(game_data_dto.game_name, game_map)
         return True
     
-    def update_game(self, game_data_dto):
+    def update_game(self, game_data_dto, game_map=None):
         """
         Update an existing game save
         
@@ -129,7 +164,7 @@ class GameStorageManager:
         if not self.check_game_name_exists(game_data_dto.game_name):
             return False
         
-        return self.save_game(game_data_dto, force_override=True)
+        return self.save_game(game_data_dto, force_override=True, game_map=game_map)
     
     def load_game(self, game_name):
         """
@@ -175,6 +210,11 @@ class GameStorageManager:
         
         conn.commit()
         conn.close()
+        
+        # Remove the map layer file saved alongside the database, if any
+        map_file_path = self.get_map_file_path(game_name)
+        if os.path.exists(map_file_path):
+            os.remove(map_file_path)
         return True
     
     def apply_game_data_to_engine(self, game_data_dto, game_engine):
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Neighbour bits, in the same order as GameMap.get_tile_bitmask
+NW, N, NE, W, E, SW, S, SE = (1 << bit for bit in range(8))
+NEIGHBOUR_OFFSETS = (
+    (-1, -1), (0, -1), (1, -1),  # NW, N, NE
+    (-1, 0),           (1, 0),   # W, E
+    (-1, 1),  (0, 1),  (1, 1)    # SW, S, SE
+)
+
+# A corner only changes how a tile looks when both edges next to it match too
+_CORNERS = ((NW, N, W), (NE, N, E), (SW, S, W), (SE, S, E))
+
+
+def reduce_mask(mask):
+    """Drop corner bits whose adjacent edges do not both match"""
+    for corner, edge_a, edge_b in _CORNERS:
+        if mask & corner and not (mask & edge_a and mask & edge_b):
+            mask &= ~corner
+    return mask
+
+
+def _variant_name(mask):
+    """Name of the closest variant in data/tiles/*.json for a reduced mask"""
+    exposed = [side for side, bit in (('top', N), ('bottom', S), ('left', W), ('right', E)) if not mask & bit]
+    if not exposed:
+        for corner, bit in (('top_left', NW), ('top_right', NE), ('bottom_left', SW), ('bottom_right', SE)):
+            if not mask & bit:
+                return f"inner_corner_{corner}"
+        return "fully_surrounded"
+    if len(exposed) == 1:
+        side = exposed[0]
+        return ("horizontal_edge_" if side in ('top', 'bottom') else "vertical_edge_") + side
+    if len(exposed) == 2 and exposed[0] in ('top', 'bottom') and exposed[1] in ('left', 'right'):
+        return f"outer_corner_{exposed[0]}_{exposed[1]}"
+    return "isolated"
+
+
+# The 47 distinct blob masks, their variant names and the 256 -> 47 lookup table
+VARIANT_MASKS = np.array(sorted({reduce_mask(mask) for mask in range(256)}), dtype=np.uint8)
+VARIANT_NAMES = tuple(_variant_name(int(mask)) for mask in VARIANT_MASKS)
+BLOB_TABLE = np.searchsorted(VARIANT_MASKS, [reduce_mask(mask) for mask in range(256)]).astype(np.uint8)
+
+assert len(VARIANT_MASKS) == 47
+
+
+def variant_ids(terrain, y0=0, y1=None, x0=0, x1=None):
+    """
+    Resolve the autotile variant id of every tile in a region at once.
+
+    Args:
+        terrain: (height, width) array of terrain codes (ndarray or ChunkedLayer)
+        y0, y1, x0, x1: Region to resolve, defaulting to the whole map
+
+    Returns:
+        (y1 - y0, x1 - x0) uint8 array of indices into VARIANT_NAMES
+    """
+    height, width = terrain.shape
+    y1 = height if y1 is None else y1
+    x1 = width if x1 is None else x1
+
+    # Copy the region plus a one tile border; tiles off the map never match
+    window = np.full((y1 - y0 + 2, x1 - x0 + 2), -1, dtype=np.int16)
+    ry0, ry1, rx0, rx1 = max(y0 - 1, 0), min(y1 + 1, height), max(x0 - 1, 0), min(x1 + 1, width)
+    window[ry0 - y0 + 1:ry1 - y0 + 1, rx0 - x0 + 1:rx1 - x0 + 1] = terrain[ry0:ry1, rx0:rx1]
+
+    rows, cols = window.shape
+    centre = window[1:-1, 1:-1]
+    mask = np.zeros(centre.shape, dtype=np.uint8)
+    for bit, (dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+        neighbour = window[1 + dy:rows - 1 + dy, 1 + dx:cols - 1 + dx]
+        mask |= (neighbour == centre).astype(np.uint8) << bit
+    return BLOB_TABLE[mask]
@@ -0,0 +1,125 @@
+from collections import deque
+import numpy as np
+
+CHUNK_SIZE = 16  # Tiles per side of a versioned chunk
+
+
+class ChangeSet:
+    """
+    Tiles and chunks that changed since a given journal version.
+    When full is True the journal no longer holds enough history and every
+    chunk is reported dirty; consumers should rebuild instead of patching.
+    """
+    def __init__(self, version, tiles, chunks, width, full=False):
+        self.version = version  # Journal version this change set is current up to
+        self.tiles = tiles      # Unique flat tile indices (y * width + x)
+        self.chunks = chunks    # Unique flat chunk indices (cy * chunks_x + cx)
+        self.width = width
+        self.full = full
+
+    def __bool__(self):
+        return self.full or len(self.tiles) > 0
+
+    def tile_coords(self):
+        """Return the dirty tiles as (xs, ys) coordinate arrays"""
+        return self.tiles % self.width, self.tiles // self.width
+
+
+class ChangeJournal:
+    """
+    Records which map tiles changed, batched per frame or turn.
+
+    Mutations call mark(); commit() closes the current batch under a new,
+    monotonically increasing version and stamps every touched chunk with it.
+    Consumers remember the last version they saw and pull changes_since() it,
+    or hold a JournalSubscription that does the bookkeeping for them.
+    """
+    def __init__(self, width, height, chunk_size=CHUNK_SIZE, max_batches=256):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunks_x = (width + chunk_size - 1) // chunk_size
+        self.chunks_y = (height + chunk_size - 1) // chunk_size
+        self.max_batches = max_batches
+
+        self.version = 0
+        self.chunk_versions = np.zeros(self.chunks_x * self.chunks_y, dtype=np.int64)
+        self._pending = []          # Flat tile indices marked since the last commit
+        self._pending_full = False  # Whole map marked since the last commit
+        self._batches = deque()     # (version, tile indices or None for the whole map)
+        self._oldest_version = 0    # changes_since() is exact for versions >= this
+
+    def mark(self, x, y):
+        """Record a change to the tile at (x, y)"""
+        self._pending.append(y * self.width + x)
+
+    def mark_all(self):
+        """Record a change to every tile, e.g. after generating or loading a map"""
+        self._pending_full = True
+        self._pending = []
+
+    def chunk_index(self, x, y):
+        """Return the flat chunk index containing tile (x, y)"""
+        return (y // self.chunk_size) * self.chunks_x + (x // self.chunk_size)
+
+    def chunk_version(self, cx, cy):
+        """Return the version at which a chunk last changed"""
+        return int(self.chunk_versions[cy * self.chunks_x + cx])
+
+    def commit(self):
+        """Close the current batch of changes and return the journal version"""
+        if not self._pending and not self._pending_full:
+            return self.version
+
+        self.version += 1
+        if self._pending_full:
+            tiles = None
+            self.chunk_versions[:] = self.version
+        else:
+            tiles = np.unique(np.asarray(self._pending, dtype=np.int64))
+            xs, ys = tiles % self.width, tiles // self.width
+            chunks = (ys // self.chunk_size) * self.chunks_x + (xs // self.chunk_size)
+            self.chunk_versions[chunks] = self.version
+
+        self._batches.append((self.version, tiles))
+        while len(self._batches) > self.max_batches:
+            dropped_version, _ = self._batches.popleft()
+            self._oldest_version = dropped_version
+
+        self._pending = []
+        self._pending_full = False
+        return self.version
+
+    def changes_since(self, version):
+        """
+        Return a ChangeSet with everything that changed after a version.
+        Pending marks are committed first so no change is ever missed.
+        """
+        self.commit()
+        chunks = np.flatnonzero(self.chunk_versions > version)
+        if version >= self.version:
+            return ChangeSet(self.version, np.empty(0, dtype=np.int64), chunks, self.width)
+
+        batches = [tiles for batch_version, tiles in self._batches if batch_version > version]
+        if version < self._oldest_version or any(tiles is None for tiles in batches):
+            return ChangeSet(self.version, np.empty(0, dtype=np.int64), chunks, self.width, full=True)
+
+        tiles = np.unique(np.concatenate(batches)) if len(batches) > 1 else batches[0]
+        return ChangeSet(self.version, tiles, chunks, self.width)
+
+    def subscribe(self):
+        """Create a subscription that starts at the current version"""
+        return JournalSubscription(self)
+
+
+class JournalSubscription:
+    """Cursor into a ChangeJournal for one consumer (renderer, minimap, saves...)"""
+    def __init__(self, journal, version=None):
+        self.journal = journal
+        self.version = journal.version if version is None else version
+
+    def poll(self):
+        """Return the changes since the last poll and advance the cursor"""
+        changes = self.journal.changes_since(self.version)
+        self.version = changes.version
+        return changes
@@ -0,0 +1,368 @@
+import collections
+import math
+import threading
+import numpy as np
+import pygame
+from .zoom_pyramid import PyramidBuilder, nearest_level
+
+TILE_SIZE = 256   # World size of a tile in pixels
+CHUNK_TILES = 8   # Chunk surfaces cover CHUNK_TILES x CHUNK_TILES tiles
+
+# Flat colours used until terrain textures are loaded
+TERRAIN_COLORS = {
+    'grass': (100, 200, 100),
+    'desert': (240, 220, 130),
+    'water': (64, 164, 223),
+    'mountain': (139, 137, 137),
+    'forest': (34, 139, 34),
+}
+DEFAULT_TERRAIN_COLOR = (128, 128, 128)
+RESOURCE_COLOR = (255, 215, 0)  # Gold color for resources
+
+# Zoom levels chunks are rasterized at; larger zooms scale the composed 1.0 view
+CHUNK_LEVELS = (0.25, 0.5, 1.0)
+TEXTURE_SHARE = 8  # Scaled tile textures may use up to 1/TEXTURE_SHARE of the budget
+
+
+class TerrainChunkCache:
+    """
+    Keeps the static map layers (terrain and resources) pre-rasterized into
+    surfaces of CHUNK_TILES x CHUNK_TILES tiles, so drawing the map is a few
+    chunk blits per frame instead of a draw call per tile.
+
+    Chunks exist once per zoom level in CHUNK_LEVELS. The first time a chunk
+    is needed at a new level it is built in the background while the nearest
+    level already cached is drawn in its place; zooms between levels scale
+    each tile being redrawn from the nearest level.
+
+    A chunk is re-rasterized only after the map's change journal reports a
+    change inside it. Surfaces are kept under budget_bytes by evicting the
+    least recently drawn chunks that are not on screen this frame. The tile
+    textures chunks are drawn from count towards the budget too and are
+    dropped least recently used first once they outgrow their share of it.
+    """
+    def __init__(self, game_map, chunk_tiles=CHUNK_TILES, budget_bytes=256 * 1024 * 1024,
+                 builder=None, levels=CHUNK_LEVELS, atlas=None):
+        self.map = game_map
+        self.atlas = atlas                       # Optional TileAtlas; flat colours are drawn without one
+        self.textures = collections.OrderedDict()  # {(terrain code, variant id, tile_px): scaled tile Surface}
+        self.texture_bytes = 0
+        self.texture_lock = threading.Lock()     # Chunks are rasterized on the builder's thread too
+        self.raster_lock = threading.Lock()      # Serializes blits from shared textures and atlas pages
+        self.chunk_tiles = chunk_tiles
+        self.budget_bytes = budget_bytes
+        self.levels = levels
+        self.builder = builder if builder is not None else PyramidBuilder()
+        self.chunks = collections.OrderedDict()  # {(cx, cy, level): Surface}, least recent first
+        self.used_bytes = 0
+        self.frame_keys = set()                  # Chunks drawn this frame, never evicted
+        self.view_range = None                   # (level, cx0, cy0, cx1, cy1) of the last rendered view
+        self.rasterized_count = 0                # Total chunks rasterized, for profiling
+        self.collected_count = 0                 # Builds installed for chunks on screen; drawn views are stale
+        self.generations = {}                    # {(cx, cy): int}, bumped when a chunk goes stale
+        self.epoch = 0                           # Bumped when every chunk goes stale
+        self.subscription = game_map.journal.subscribe()
+        self.terrain_version = game_map.terrain_version  # Unit and city marks don't touch chunk pixels
+
+    def begin_frame(self):
+        """Start a new frame: apply map changes and pick up finished background builds"""
+        self.poll()
+        self.frame_keys = set()
+
+    def poll(self):
+        """
+        Apply map changes and install finished background builds.
+
+        Returns:
+            collected_count, which changes when the last rendered view is stale
+        """
+        self.sync()
+        for (cx, cy, level, generation), surface in self.builder.collect():
+            self.install(cx, cy, level, generation, surface)
+        return self.collected_count
+
+    def install(self, cx, cy, level, generation, surface):
+        """
+        Store a chunk built off the main thread.
+
+        Returns:
+            False if the map changed since the build started or the chunk is already cached
+        """
+        key = (cx, cy, level)
+        if generation != self.generation(cx, cy) or key in self.chunks:
+            return False
+        self._store(key, surface)
+        if self.in_view(cx, cy, level):
+            self.collected_count += 1  # On screen, drawn from a fallback level until now
+        return True
+
+    def in_view(self, cx, cy, level):
+        """Whether a chunk at a level is part of the last rendered view"""
+        if self.view_range is None:
+            return False
+        view_level, cx0, cy0, cx1, cy1 = self.view_range
+        return level == view_level and cx0 <= cx < cx1 and cy0 <= cy < cy1
+
+    def sync(self):
+        """Drop every cached chunk the map has changed since the last sync"""
+        changes = self.subscription.poll()
+        if not changes or self.map.terrain_version == self.terrain_version:
+            return
+        self.terrain_version = self.map.terrain_version
+        if changes.full:
+            self.clear()
+            return
+
+        xs, ys = changes.tile_coords()
+        dirty = set(zip((xs // self.chunk_tiles).tolist(), (ys // self.chunk_tiles).tolist()))
+        for chunk in dirty:
+            self.generations[chunk] = self.generations.get(chunk, 0) + 1
+        for key in [key for key in self.chunks if (key[0], key[1]) in dirty]:
+            self._drop(key)
+
+    def clear(self):
+        """Drop every cached chunk"""
+        self.chunks.clear()
+        with self.texture_lock:
+            self.textures.clear()
+            self.texture_bytes = 0
+        self.used_bytes = 0
+        self.epoch += 1
+
+    def get_chunk(self, cx, cy, level):
+        """
+        Get the surface for a chunk at a zoom level.
+
+        Args:
+            cx, cy: Chunk coordinates
+            level: One of self.levels
+
+        Returns:
+            (surface, level) - the level differs from the one requested while
+            the requested level is still being built in the background
+        """
+        key = (cx, cy, level)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self._touch(key)
+            return surface, level
+
+        fallback = self._nearest_cached(cx, cy, level)
+        if fallback is None:
+            # Nothing to show yet, so this chunk has to be drawn right away
+            surface = self.rasterize(cx, cy, level)
+            self._store(key, surface)
+            self._touch(key)
+            return surface, level
+
+        self.builder.submit(key + (self.generation(cx, cy),), self.build_job(cx, cy, level))
+        self._touch(fallback)
+        return self.chunks[fallback], fallback[2]
+
+    def build_job(self, cx, cy, level):
+        """
+        Return a callable rasterizing a chunk on the builder's thread.
+
+        The chunk's tiles are copied here, on the main thread, so the job
+        never reads map layers or resolves variant ids while the map is
+        being edited; a job that outlives an edit is discarded by its
+        generation when collected.
+        """
+        tiles = self.read_tiles(cx, cy)
+        return lambda: self.rasterize(cx, cy, level, tiles)
+
+    def read_tiles(self, cx, cy):
+        """Copy a chunk's (terrain, resources, variant ids or None) out of the map"""
+        x0, y0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        x1 = min(x0 + self.chunk_tiles, self.map.width)
+        y1 = min(y0 + self.chunk_tiles, self.map.height)
+        layers = self.map.layers
+        variants = np.array(self.map.get_variant_ids(x0, y0, x1, y1)) if self.atlas is not None else None
+        return np.array(layers.terrain[y0:y1, x0:x1]), np.array(layers.resource[y0:y1, x0:x1]), variants
+
+    def rasterize(self, cx, cy, level, tiles=None):
+        """
+        Draw the terrain and resources of one chunk at a zoom level into a new surface.
+
+        Args:
+            cx, cy: Chunk coordinates
+            level: Zoom level to draw at
+            tiles: Tiles copied by read_tiles(); read from the map when None,
+                   which is only safe on the main thread
+        """
+        tile_px = max(1, round(TILE_SIZE * level))
+        terrain, resources, variants = tiles if tiles is not None else self.read_tiles(cx, cy)
+        rows, cols = terrain.shape
+        surface = pygame.Surface((cols * tile_px, rows * tile_px))
+
+        colors = [TERRAIN_COLORS.get(name, DEFAULT_TERRAIN_COLOR) for name in self.map.layers.terrain_names]
+        resource_radius = max(1, tile_px // 8)
+
+        # A blit locks its source, and textures may be subsurfaces of shared
+        # atlas pages, so two threads blitting them at once would fail
+        with self.raster_lock:
+            for ty in range(rows):
+                for tx in range(cols):
+                    rect = (tx * tile_px, ty * tile_px, tile_px, tile_px)
+                    texture = None
+                    if variants is not None:
+                        texture = self.get_texture(int(terrain[ty, tx]), int(variants[ty, tx]), tile_px)
+                    if texture is not None:
+                        surface.blit(texture, rect)
+                    else:
+                        surface.fill(colors[terrain[ty, tx]], rect)
+                    if resources[ty, tx]:
+                        center = (tx * tile_px + tile_px // 2, ty * tile_px + tile_px // 2)
+                        pygame.draw.circle(surface, RESOURCE_COLOR, center, resource_radius)
+
+        self.rasterized_count += 1
+        return surface
+
+    def get_texture(self, terrain_code, variant_id, tile_px):
+        """Get the atlas image for a terrain variant scaled to tile_px, or None"""
+        key = (terrain_code, variant_id, tile_px)
+        with self.texture_lock:
+            if key in self.textures:
+                self.textures.move_to_end(key)
+                return self.textures[key]
+
+        # Scaled outside the lock; a texture scaled twice by two threads is just stored once
+        image = self.atlas.get_surface(self.map.layers.terrain_names[terrain_code], variant_id)
+        if image is not None and image.get_size() != (tile_px, tile_px):
+            image = pygame.transform.smoothscale(image, (tile_px, tile_px))
+
+        with self.texture_lock:
+            if key not in self.textures:
+                self.textures[key] = image
+                self.texture_bytes += self._surface_bytes(image) if image is not None else 0
+                # Least recently used first, never the texture just stored
+                while self.texture_bytes > self.budget_bytes // TEXTURE_SHARE and len(self.textures) > 1:
+                    _, old = self.textures.popitem(last=False)
+                    self.texture_bytes -= self._surface_bytes(old) if old is not None else 0
+            return self.textures[key]
+
+    def render(self, screen, viewport, rect=None):
+        """
+        Blit every chunk overlapping the viewport at the current zoom.
+
+        Args:
+            screen: Surface to draw on
+            viewport: View to draw
+            rect: Screen area to draw, or None to begin a new frame and draw
+                  the whole screen. Only chunks touching rect are drawn, and
+                  between levels only the tiles touching it are scaled; they
+                  may spill past it, so callers drawing part of a surface
+                  clip to it first, as MapCompositor does.
+        """
+        if rect is None:
+            self.begin_frame()
+            rect = screen.get_rect()
+        else:
+            self.poll()  # Part of a frame already begun: keep the chunks drawn so far
+        zoom = viewport.zoom
+        level = nearest_level(zoom, self.levels)
+        chunk_world = self.chunk_tiles * TILE_SIZE
+        chunk_px = self.chunk_tiles * max(1, round(TILE_SIZE * level))  # Chunk size at the level, as rasterized
+        columns = math.ceil(self.map.width / self.chunk_tiles)
+        rows = math.ceil(self.map.height / self.chunk_tiles)
+
+        # Remembered across frames where the view isn't redrawn, so late builds still invalidate it
+        view_w = screen.get_width() / zoom
+        view_h = screen.get_height() / zoom
+        self.view_range = (level,
+                           max(0, int(viewport.x // chunk_world)), max(0, int(viewport.y // chunk_world)),
+                           min(math.ceil((viewport.x + view_w) / chunk_world), columns),
+                           min(math.ceil((viewport.y + view_h) / chunk_world), rows))
+
+        # Positions are measured from the same whole pixel origin the compositor scrolls by
+        origin_x, origin_y = viewport.pixel_origin()
+        if zoom != level:
+            self._render_scaled(screen, rect, level, zoom, origin_x, origin_y)
+            return
+
+        cx0, cy0 = max(0, (origin_x + rect.left) // chunk_px), max(0, (origin_y + rect.top) // chunk_px)
+        cx1 = min(-(-(origin_x + rect.right) // chunk_px), columns)
+        cy1 = min(-(-(origin_y + rect.bottom) // chunk_px), rows)
+        for cy in range(cy0, cy1):
+            for cx in range(cx0, cx1):
+                surface = self._level_chunk(cx, cy, level)
+                screen.blit(surface, (cx * chunk_px - origin_x, cy * chunk_px - origin_y))
+
+    def _render_scaled(self, screen, rect, level, zoom, origin_x, origin_y):
+        """
+        Draw the tiles touching rect at a zoom between levels.
+
+        Each tile is scaled on its own from the nearest level into the whole
+        pixels its edges round to, so a tile comes out the same whether it is
+        drawn by a full redraw or in a strip a scroll exposed; scaling any
+        larger area would resample it at a phase that depends on the area.
+        """
+        tile_px = max(1, round(TILE_SIZE * level))
+        tile_zoomed = TILE_SIZE * zoom
+        tx0 = max(0, int((origin_x + rect.left) // tile_zoomed))
+        ty0 = max(0, int((origin_y + rect.top) // tile_zoomed))
+        tx1 = min(math.ceil((origin_x + rect.right) / tile_zoomed), self.map.width)
+        ty1 = min(math.ceil((origin_y + rect.bottom) / tile_zoomed), self.map.height)
+        if tx0 >= tx1 or ty0 >= ty1:
+            return
+
+        edges_x = [round(tx * tile_zoomed) - origin_x for tx in range(tx0, tx1 + 1)]
+        edges_y = [round(ty * tile_zoomed) - origin_y for ty in range(ty0, ty1 + 1)]
+        tiles = self.chunk_tiles
+        for cy in range(ty0 // tiles, (ty1 - 1) // tiles + 1):
+            for cx in range(tx0 // tiles, (tx1 - 1) // tiles + 1):
+                surface = self._level_chunk(cx, cy, level)
+                for ty in range(max(ty0, cy * tiles), min(ty1, (cy + 1) * tiles)):
+                    top, bottom = edges_y[ty - ty0], edges_y[ty - ty0 + 1]
+                    for tx in range(max(tx0, cx * tiles), min(tx1, (cx + 1) * tiles)):
+                        left, right = edges_x[tx - tx0], edges_x[tx - tx0 + 1]
+                        tile = surface.subsurface(((tx - cx * tiles) * tile_px, (ty - cy * tiles) * tile_px,
+                                                   tile_px, tile_px))
+                        screen.blit(pygame.transform.scale(tile, (right - left, bottom - top)), (left, top))
+
+    def _level_chunk(self, cx, cy, level):
+        """Get a chunk's surface at a level, scaling a stand-in while that level is built"""
+        surface, surface_level = self.get_chunk(cx, cy, level)
+        if surface_level != level:
+            surface = pygame.transform.scale(
+                surface, (round(surface.get_width() * level / surface_level),
+                          round(surface.get_height() * level / surface_level)))
+        return surface
+
+    def generation(self, cx, cy):
+        """Token that changes whenever a chunk's cached pixels go stale"""
+        return (self.epoch, self.generations.get((cx, cy), 0))
+
+    def _nearest_cached(self, cx, cy, level):
+        """Return the key of the cached level of a chunk closest to level, or None"""
+        for candidate in sorted(self.levels, key=lambda l: abs(math.log2(l) - math.log2(level))):
+            if (cx, cy, candidate) in self.chunks:
+                return (cx, cy, candidate)
+        return None
+
+    def _store(self, key, surface):
+        self.chunks[key] = surface
+        self.used_bytes += self._surface_bytes(surface)
+
+    def _touch(self, key):
+        """Mark a chunk as drawn this frame, evicting others if over budget"""
+        self.chunks.move_to_end(key)
+        self.frame_keys.add(key)
+        if self.used_bytes + self.texture_bytes > self.budget_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently drawn off-screen chunks until within budget"""
+        for key in list(self.chunks):
+            if self.used_bytes + self.texture_bytes <= self.budget_bytes:
+                break
+            if key not in self.frame_keys:
+                self._drop(key)
+
+    def _drop(self, key):
+        surface = self.chunks.pop(key)
+        self.used_bytes -= self._surface_bytes(surface)
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
@@ -0,0 +1,140 @@
+import math
+import time
+from .chunk_cache import TILE_SIZE
+from .zoom_pyramid import nearest_level
+
+LOOKAHEAD = 0.5          # Seconds of movement to rasterize ahead of the viewport
+FRAME_BUDGET = 0.002     # Seconds of main thread time prefetching may use per frame
+MAX_IN_FLIGHT = 8        # Chunks queued or building at once
+MIN_SPEED = 1.0          # World pixels per second below which the viewport counts as still
+
+
+class ChunkPrefetcher:
+    """
+    Rasterizes the terrain chunks a moving viewport is about to reach.
+
+    Each frame the viewport velocity is estimated from its last position,
+    the view is extrapolated LOOKAHEAD seconds ahead, and chunks of the
+    predicted view that aren't cached yet are queued on the cache's own
+    PyramidBuilder, nearest to the current view first, within a per-frame
+    time budget. Jobs use the same keys as the cache's on-demand builds, so
+    a chunk is never built twice, and finished chunks are installed by the
+    cache's begin_frame(). Turning around or zooming drops queued prefetches
+    meant for the old direction.
+    """
+    def __init__(self, cache, lookahead=LOOKAHEAD, frame_budget=FRAME_BUDGET,
+                 max_in_flight=MAX_IN_FLIGHT, clock=time.perf_counter):
+        self.cache = cache
+        self.builder = cache.builder
+        self.lookahead = lookahead
+        self.frame_budget = frame_budget
+        self.max_in_flight = max_in_flight
+        self.clock = clock
+        self.last_view = None     # (x, y, zoom, time) at the previous update
+        self.velocity = (0.0, 0.0)
+        self.direction = 0        # Bumped whenever queued prefetches are cancelled
+        self.submitted = set()    # Keys of prefetch jobs not yet installed or dropped
+        self.prefetched_count = 0  # Prefetched chunks installed in the cache, for profiling
+        self.cancelled_count = 0
+
+    def update(self, viewport, screen_size=None):
+        """
+        Track the viewport and queue chunks ahead of it for one frame.
+
+        Returns:
+            Number of prefetched chunks the cache installed since the last update
+        """
+        now = self.clock()
+        deadline = now + self.frame_budget
+        self._track(viewport, now)
+        installed = self._account()
+        if self.clock() < deadline:
+            self._submit(viewport, screen_size, deadline)
+        return installed
+
+    def _track(self, viewport, now):
+        """Update the velocity estimate, cancelling work when the motion changes"""
+        last = self.last_view
+        self.last_view = (viewport.x, viewport.y, viewport.zoom, now)
+        if last is None:
+            return
+        if viewport.zoom != last[2]:
+            self.velocity = (0.0, 0.0)
+            self.cancel()
+            return
+
+        elapsed = now - last[3]
+        if elapsed <= 0:
+            return
+        velocity = ((viewport.x - last[0]) / elapsed, (viewport.y - last[1]) / elapsed)
+        if velocity[0] * self.velocity[0] + velocity[1] * self.velocity[1] < 0:
+            self.cancel()  # Turned around: chunks ahead of the old motion aren't needed
+        self.velocity = velocity
+
+    def cancel(self):
+        """Drop queued prefetches; on-demand builds of the cache are left alone"""
+        self.direction += 1
+        submitted = self.submitted
+        self.cancelled_count += self.builder.cancel(lambda key: key in submitted)
+        self.submitted = {key for key in submitted if key in self.builder.pending}
+
+    def _account(self):
+        """Forget prefetch jobs the cache has installed or the builder has dropped"""
+        installed = 0
+        for key in list(self.submitted):
+            if key[:3] in self.cache.chunks:
+                installed += 1
+            elif key in self.builder.pending:
+                continue
+            self.submitted.discard(key)
+        self.prefetched_count += installed
+        return installed
+
+    def predicted_chunks(self, viewport, screen_size=None):
+        """
+        Chunks of the view predicted LOOKAHEAD seconds ahead that aren't on
+        screen now, nearest to the current view first.
+        """
+        vx, vy = self.velocity
+        if math.hypot(vx, vy) < MIN_SPEED:
+            return []
+
+        width, height = screen_size or (viewport.screen_width, viewport.screen_height)
+        zoom = viewport.zoom
+        chunk_world = self.cache.chunk_tiles * TILE_SIZE
+        chunks_x = math.ceil(self.cache.map.width / self.cache.chunk_tiles)
+        chunks_y = math.ceil(self.cache.map.height / self.cache.chunk_tiles)
+
+        def chunk_range(x, y):
+            cx0, cy0 = max(0, int(x // chunk_world)), max(0, int(y // chunk_world))
+            cx1 = min(math.ceil((x + width / zoom) / chunk_world), chunks_x)
+            cy1 = min(math.ceil((y + height / zoom) / chunk_world), chunks_y)
+            return cx0, cy0, cx1, cy1
+
+        now = chunk_range(viewport.x, viewport.y)
+        ahead = chunk_range(viewport.x + vx * self.lookahead, viewport.y + vy * self.lookahead)
+        # Cover the whole sweep from here to the predicted view
+        cx0, cy0 = min(now[0], ahead[0]), min(now[1], ahead[1])
+        cx1, cy1 = max(now[2], ahead[2]), max(now[3], ahead[3])
+
+        centre_x = (now[0] + now[2]) / 2
+        centre_y = (now[1] + now[3]) / 2
+        chunks = [(cx, cy) for cy in range(cy0, cy1) for cx in range(cx0, cx1)
+                  if not (now[0] <= cx < now[2] and now[1] <= cy < now[3])]
+        chunks.sort(key=lambda chunk: math.hypot(chunk[0] + 0.5 - centre_x, chunk[1] + 0.5 - centre_y))
+        return chunks
+
+    def _submit(self, viewport, screen_size, deadline):
+        """Queue rasterization of predicted chunks that aren't cached yet"""
+        level = nearest_level(viewport.zoom, self.cache.levels)
+        for cx, cy in self.predicted_chunks(viewport, screen_size):
+            if len(self.builder.pending) >= self.max_in_flight or self.clock() >= deadline:
+                return
+            if (cx, cy, level) in self.cache.chunks:
+                continue
+            # Same key as the cache's own background builds, so the builder deduplicates them
+            key = (cx, cy, level, self.cache.generation(cx, cy))
+            if key in self.builder.pending:
+                continue
+            self.builder.submit(key, self.cache.build_job(cx, cy, level))
+            self.submitted.add(key)
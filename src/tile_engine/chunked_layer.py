@@ -0,0 +1,203 @@
+import weakref
+import numpy as np
+from .change_journal import CHUNK_SIZE
+
+
+class ChunkedLayer:
+    """
+    A 2D array split into square chunks that supports copy-on-write snapshots.
+
+    The root layer owns one contiguous array (which may be an np.memmap).
+    snapshot() returns a layer that initially owns no chunks and reads through
+    to its source; a chunk is copied into the snapshot only when either side
+    writes to it, so creating a snapshot costs nothing per tile.
+
+    Reads return read-only arrays; all writes must go through item assignment
+    (layer[y, x] = v, layer[y0:y1, x0:x1] = values) so sharing is respected.
+    """
+    def __init__(self, data=None, source=None, chunk_size=CHUNK_SIZE):
+        self.source = source
+        self.data = data                      # Contiguous array, root layers only
+        self.chunk_size = chunk_size if source is None else source.chunk_size
+        self.shape = data.shape if data is not None else source.shape
+        self.dtype = data.dtype if data is not None else source.dtype
+        self.chunks_x = (self.shape[1] + self.chunk_size - 1) // self.chunk_size
+        self.private = {}                     # {chunk index: array}, snapshots only
+        self.dependents = weakref.WeakSet()   # Snapshots that may share our chunks
+
+        if data is not None:
+            self._readonly = data.view()
+            self._readonly.flags.writeable = False
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def snapshot(self):
+        """Return a copy-on-write snapshot of this layer"""
+        snapshot = ChunkedLayer(source=self)
+        self.dependents.add(snapshot)
+        return snapshot
+
+    def _chunk_index(self, y, x):
+        return (y // self.chunk_size) * self.chunks_x + (x // self.chunk_size)
+
+    def _chunk_bounds(self, index):
+        """Return (y0, y1, x0, x1) covered by a chunk"""
+        cy, cx = divmod(index, self.chunks_x)
+        y0, x0 = cy * self.chunk_size, cx * self.chunk_size
+        return y0, min(y0 + self.chunk_size, self.shape[0]), x0, min(x0 + self.chunk_size, self.shape[1])
+
+    def _chunk(self, index):
+        """Return the current contents of a chunk without copying"""
+        if self.data is not None:
+            y0, y1, x0, x1 = self._chunk_bounds(index)
+            return self.data[y0:y1, x0:x1]
+        chunk = self.private.get(index)
+        if chunk is not None:
+            return chunk
+        return self.source._chunk(index)
+
+    def _prepare_write(self, index):
+        """Detach a chunk from everything sharing it before it is written"""
+        current = None
+        for dependent in list(self.dependents):
+            if index not in dependent.private:
+                if current is None:
+                    current = self._chunk(index)
+                dependent.private[index] = current.copy()
+        if self.data is None and index not in self.private:
+            self.private[index] = self.source._chunk(index).copy()
+
+    def get(self, y, x):
+        """Read a single element"""
+        if self.data is not None:
+            return self.data[y, x]
+        chunk = self.private.get(self._chunk_index(y, x))
+        if chunk is not None:
+            return chunk[y % self.chunk_size, x % self.chunk_size]
+        return self.source.get(y, x)
+
+    def set(self, y, x, value):
+        """Write a single element"""
+        if self.data is not None and not self.dependents:
+            self.data[y, x] = value
+            return
+        index = self._chunk_index(y, x)
+        self._prepare_write(index)
+        if self.data is not None:
+            self.data[y, x] = value
+        else:
+            self.private[index][y % self.chunk_size, x % self.chunk_size] = value
+
+    def _normalize(self, key):
+        """
+        Convert an index into ((y0, y1), (x0, x1), key relative to that region),
+        or None when it cannot be expressed as a unit-step rectangle.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 2:
+            return None
+        key = key + (slice(None),) * (2 - len(key))
+
+        bounds, relative = [], []
+        for axis, part in enumerate(key):
+            size = self.shape[axis]
+            if isinstance(part, (int, np.integer)):
+                index = int(part) + size if part < 0 else int(part)
+                if not 0 <= index < size:
+                    raise IndexError(f"index {part} is out of bounds for axis {axis} with size {size}")
+                bounds.append((index, index + 1))
+                relative.append(0)
+            elif isinstance(part, slice):
+                start, stop, step = part.indices(size)
+                if step != 1:
+                    return None
+                bounds.append((start, max(start, stop)))
+                relative.append(slice(None))
+            else:
+                return None
+        return bounds[0], bounds[1], tuple(relative)
+
+    def _overlapping_chunks(self, y0, y1, x0, x1):
+        """Yield every chunk index that intersects a region"""
+        if y0 >= y1 or x0 >= x1:
+            return
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                yield cy * self.chunks_x + cx
+
+    def read(self, y0, y1, x0, x1):
+        """Return a copy of a rectangular region"""
+        if self.data is not None:
+            return np.array(self.data[y0:y1, x0:x1])
+        out = np.empty((y1 - y0, x1 - x0), dtype=self.dtype)
+        for index in self._overlapping_chunks(y0, y1, x0, x1):
+            cy0, cy1, cx0, cx1 = self._chunk_bounds(index)
+            iy0, iy1, ix0, ix1 = max(y0, cy0), min(y1, cy1), max(x0, cx0), min(x1, cx1)
+            out[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = \
+                self._chunk(index)[iy0 - cy0:iy1 - cy0, ix0 - cx0:ix1 - cx0]
+        return out
+
+    def to_array(self):
+        """Return the whole layer as a read-only array (a view for root layers)"""
+        if self.data is not None:
+            return self._readonly
+        array = self.read(0, self.shape[0], 0, self.shape[1])
+        array.flags.writeable = False
+        return array
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.to_array()
+        if dtype is not None:
+            return array.astype(dtype)
+        return array.copy() if copy else array
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and len(key) == 2 and all(isinstance(k, (int, np.integer)) for k in key):
+            return self.get(*key)
+        if self.data is not None:
+            return self._readonly[key]
+
+        normalized = self._normalize(key)
+        if normalized is None:
+            return self.to_array()[key]
+        (y0, y1), (x0, x1), relative = normalized
+        region = self.read(y0, y1, x0, x1)
+        region.flags.writeable = False
+        return region[relative]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple) and len(key) == 2 and all(isinstance(k, (int, np.integer)) for k in key):
+            self.set(key[0], key[1], value)
+            return
+
+        normalized = self._normalize(key)
+        if normalized is None:
+            raise TypeError("ChunkedLayer only supports integer and unit-step slice assignment")
+        (y0, y1), (x0, x1), _ = normalized
+        values = np.broadcast_to(np.asarray(value, dtype=self.dtype), (y1 - y0, x1 - x0))
+
+        if self.data is not None and not self.dependents:
+            self.data[y0:y1, x0:x1] = values
+            return
+
+        for index in self._overlapping_chunks(y0, y1, x0, x1):
+            self._prepare_write(index)
+            cy0, cy1, cx0, cx1 = self._chunk_bounds(index)
+            iy0, iy1, ix0, ix1 = max(y0, cy0), min(y1, cy1), max(x0, cx0), min(x1, cx1)
+            block = values[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0]
+            if self.data is not None:
+                self.data[iy0:iy1, ix0:ix1] = block
+            else:
+                self.private[index][iy0 - cy0:iy1 - cy0, ix0 - cx0:ix1 - cx0] = block
+
+    def flush(self):
+        """Flush a memory-mapped root layer to disk"""
+        if self.data is not None and hasattr(self.data, 'flush'):
+            self.data.flush()
@@ -0,0 +1,57 @@
+from src.engine.spatial_index import SpatialIndex
+
+class CityManager:
+    """
+    Tracks the cities founded on the tile engine map, indexed by tile.
+    """
+    def __init__(self, game_map):
+        self.map = game_map
+        self.cities = []
+        self.spatial_index = SpatialIndex()
+        self.version = 0  # Bumped whenever a city is founded or removed
+    
+    def add_city(self, city, x, y):
+        """Found a city on the tile at (x, y)"""
+        tile = self.map.get_tile(x, y)
+        if tile is None or tile.has_city:
+            return False
+        
+        tile.has_city = True
+        tile.city = city
+        self.map.mark_dirty(x, y)
+        city.tile_position = (x, y)
+        self.cities.append(city)
+        self.spatial_index.insert(city, (x, y), "city")
+        self.version += 1
+        return True
+    
+    def remove_city(self, city):
+        """Remove a razed city from the map"""
+        if city not in self.spatial_index:
+            return False
+        
+        tile = self.map.get_tile(*city.tile_position)
+        if tile is not None:
+            tile.has_city = False
+            tile.city = None
+            self.map.mark_dirty(*city.tile_position)
+        self.cities.remove(city)
+        self.spatial_index.remove(city)
+        self.version += 1
+        return True
+    
+    def get_cities_in_rect(self, min_x, min_y, max_x, max_y):
+        """Return all cities inside an inclusive tile rectangle"""
+        return self.spatial_index.query_rect(min_x, min_y, max_x, max_y)
+    
+    def get_cities_in_radius(self, position, radius):
+        """Return all cities within a tile radius of a position"""
+        return self.spatial_index.query_radius(position, radius)
+    
+    def get_nearest_city(self, position, predicate=None):
+        """Return the city closest to a position, optionally filtered by predicate"""
+        return self.spatial_index.nearest("city", position, predicate=predicate)
+    
+    def update(self):
+        """Update city growth and production each frame"""
+        pass
@@ -0,0 +1,147 @@
+import pygame
+
+
+class Layer:
+    """One cached, screen sized layer of the map view."""
+    def __init__(self, name, source, draw, opaque=False):
+        self.name = name
+        self.source = source    # Callable returning a value that changes whenever the layer must be redrawn
+        self.draw = draw        # Callable(surface, rect) drawing the part of the layer touching rect
+        self.opaque = opaque
+        self.surface = None
+        self.key = None
+        self.redraw_count = 0
+        self.scroll_count = 0
+
+
+class MapCompositor:
+    """
+    Composes the map view from separately cached layers.
+
+    Each layer is redrawn only when its invalidation source or the viewport
+    changes; otherwise its surface from an earlier frame is reused. The
+    composed frame is itself cached, so a frame where no layer changed is a
+    single blit.
+
+    Panning at a constant zoom doesn't redraw a layer whose source is
+    unchanged: its previous pixels are moved with Surface.scroll and only
+    the strips the scroll exposed are drawn. Each strip is passed to the
+    layer's draw callback, which should draw only what touches it, and the
+    surface is clipped to it. The scroll is the change in
+    Viewport.pixel_origin(), the same offset the layers draw against, so
+    strips line up with the pixels they border.
+    """
+    def __init__(self):
+        self.layers = []
+        self.frame = None       # Composite of every layer
+        self.frame_valid = False
+        self.drawn_area = 0     # Pixels drawn into layers last frame, for profiling
+
+    def add_layer(self, name, source, draw, opaque=False):
+        """Add a layer above the existing ones"""
+        layer = Layer(name, source, draw, opaque)
+        self.layers.append(layer)
+        return layer
+
+    def get_layer(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def invalidate(self, name=None):
+        """Force one layer, or every layer, to be redrawn next frame"""
+        for layer in self.layers:
+            if name is None or layer.name == name:
+                layer.key = None
+
+    def render(self, screen, viewport):
+        """
+        Redraw the layers that changed and draw the composite onto screen.
+
+        Returns:
+            Names of the layers redrawn this frame
+        """
+        size = screen.get_size()
+        view = (viewport.x, viewport.y, viewport.zoom, size, viewport.pixel_origin())
+        redrawn = []
+        self.drawn_area = 0
+
+        for layer in self.layers:
+            source = layer.source()
+            key = (view, source)
+            if key == layer.key:
+                continue
+
+            offset = self.scroll_offset(layer, view, source)
+            if offset is not None:
+                # Reuse the shifted pixels and draw only what scrolled into view
+                layer.surface.scroll(*offset)
+                for strip in self.exposed_strips(size, *offset):
+                    self._draw(layer, strip)
+                layer.scroll_count += 1
+            else:
+                if layer.surface is None or layer.surface.get_size() != size:
+                    flags = 0 if layer.opaque else pygame.SRCALPHA
+                    layer.surface = pygame.Surface(size, flags, 32)
+                self._draw(layer, layer.surface.get_rect())
+                layer.redraw_count += 1
+            layer.key = key
+            redrawn.append(layer.name)
+
+        if redrawn or not self.frame_valid or self.frame.get_size() != size:
+            if self.frame is None or self.frame.get_size() != size:
+                self.frame = pygame.Surface(size)
+            self.frame.fill((0, 0, 0))
+            self.frame.blits([(layer.surface, (0, 0)) for layer in self.layers], doreturn=False)
+            self.frame_valid = True
+
+        screen.blit(self.frame, (0, 0))
+        return redrawn
+
+    def _draw(self, layer, rect):
+        """Clear and draw one area of a layer"""
+        layer.surface.fill((0, 0, 0) if layer.opaque else (0, 0, 0, 0), rect)
+        layer.surface.set_clip(rect)
+        layer.draw(layer.surface, rect)
+        layer.surface.set_clip(None)
+        self.drawn_area += rect.width * rect.height
+
+    def scroll_offset(self, layer, view, source):
+        """
+        Return the whole pixel (dx, dy) that turns a layer's last frame into
+        this one, or None if the layer has to be redrawn in full.
+        """
+        if layer.key is None or layer.key[1] != source:
+            return None
+        old_x, old_y, old_zoom, old_size, old_origin = layer.key[0]
+        x, y, zoom, size, origin = view
+        if zoom != old_zoom or size != old_size:
+            return None
+
+        dx, dy = (old_x - x) * zoom, (old_y - y) * zoom
+        if abs(dx - round(dx)) > 1e-6 or abs(dy - round(dy)) > 1e-6:
+            return None  # Sub-pixel pans can't reuse pixels exactly
+        # Taken from the origins the layers draw against rather than rounding
+        # the pan again, which can disagree by a pixel and leave a seam
+        offset = (old_origin[0] - origin[0], old_origin[1] - origin[1])
+        if abs(offset[0]) >= size[0] or abs(offset[1]) >= size[1]:
+            return None  # Nothing left on screen to reuse
+        return offset
+
+    def exposed_strips(self, size, dx, dy):
+        """Rectangles of a size surface left uncovered after scrolling by (dx, dy)"""
+        width, height = size
+        strips = []
+        if dx > 0:
+            strips.append(pygame.Rect(0, 0, dx, height))
+        elif dx < 0:
+            strips.append(pygame.Rect(width + dx, 0, -dx, height))
+        # Leave out the corner already covered by the vertical strip
+        x0 = dx if dx > 0 else 0
+        x1 = width + dx if dx < 0 else width
+        if dy > 0:
+            strips.append(pygame.Rect(x0, 0, x1 - x0, dy))
+        elif dy < 0:
+            strips.append(pygame.Rect(x0, height + dy, x1 - x0, -dy))
+        return strips
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+import pygame
+from .lod import scale_tiles
+
+UNEXPLORED_ALPHA = 255  # Never seen: fully black
+EXPLORED_ALPHA = 128    # Seen before but not visible now: dimmed
+VISIBLE_ALPHA = 0
+CLEAR_KEY = (255, 0, 255)  # Colour key for see-through tiles when fog is drawn solid
+
+
+class FogOverlay:
+    """
+    Fog of war for one player drawn as a single low resolution layer.
+
+    The fog is kept in an SRCALPHA surface with one black pixel per tile whose
+    alpha comes from the player's exploration bitset and visibility mask. It
+    is rebuilt only when either of those changes, and the part under the
+    viewport is scaled to the screen in one operation.
+
+    With blend turned off the fog is drawn solid instead: unexplored tiles
+    are opaque black, every other tile is left clear, and the surface uses a
+    colour key rather than per-pixel alpha, which is cheaper to blit.
+    """
+    def __init__(self, game_map, tile_size=256):
+        self.map = game_map
+        self.tile_size = tile_size
+        self.surface = pygame.Surface((game_map.width, game_map.height), pygame.SRCALPHA, 32)
+        self.surface.fill((0, 0, 0, UNEXPLORED_ALPHA))
+        self.blend = True         # Alpha blended fog; False draws it solid
+        self.solid_surface = None
+        self.state = None         # (player id, visibility version, packed explored row, blend)
+        self.version = 0          # Bumped on every rebuild
+        self.scaled = None        # Scaled fog for the last viewport
+        self.scaled_key = None
+
+    def update(self, player):
+        """
+        Rebuild the fog if the player's visibility or exploration changed.
+
+        Returns:
+            True if the fog was rebuilt
+        """
+        explored_row = np.array(self.map.exploration.row(player.id))
+        state = self.state
+        if (state is not None and state[0] == player.id and state[1] == player.visibility_version
+                and np.array_equal(state[2], explored_row) and state[3] == self.blend):
+            return False
+
+        alpha = np.full((self.map.height, self.map.width), UNEXPLORED_ALPHA, dtype=np.uint8)
+        alpha[self.map.exploration.to_mask(player.id)] = EXPLORED_ALPHA
+        if player.visible_mask is not None:
+            alpha[player.visible_mask] = VISIBLE_ALPHA
+
+        if self.blend:
+            pixels = pygame.surfarray.pixels_alpha(self.surface)
+            pixels[...] = alpha.T
+            del pixels  # Unlock the surface
+        else:
+            if self.solid_surface is None:
+                self.solid_surface = pygame.Surface((self.map.width, self.map.height), 0, 32)
+                self.solid_surface.set_colorkey(CLEAR_KEY)
+            rgb = np.where((alpha == UNEXPLORED_ALPHA)[..., None], np.uint8(0), np.array(CLEAR_KEY, dtype=np.uint8))
+            pygame.surfarray.blit_array(self.solid_surface, rgb.transpose(1, 0, 2))
+
+        self.state = (player.id, player.visibility_version, explored_row, self.blend)
+        self.version += 1
+        return True
+
+    def render(self, screen, viewport, player):
+        """Draw the fog over the tiles under the viewport"""
+        self.update(player)
+        zoom = viewport.zoom
+        tile_world = self.tile_size
+
+        # Whole tiles overlapping the viewport
+        x0 = max(0, int(viewport.x // tile_world))
+        y0 = max(0, int(viewport.y // tile_world))
+        x1 = min(self.map.width, math.ceil((viewport.x + screen.get_width() / zoom) / tile_world))
+        y1 = min(self.map.height, math.ceil((viewport.y + screen.get_height() / zoom) / tile_world))
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Tile edges in whole pixels from the viewport's pixel origin, so
+        # strips drawn after a scroll meet the pixels already on screen
+        origin_x, origin_y = viewport.pixel_origin()
+        left, top = round(x0 * tile_world * zoom), round(y0 * tile_world * zoom)
+        key = (x0, y0, x1, y1, zoom, self.version)
+        if key != self.scaled_key:
+            source = self.surface if self.blend else self.solid_surface
+            self.scaled = scale_tiles(source, x0, y0, x1, y1, tile_world * zoom)
+            self.scaled_key = key
+
+        screen.blit(self.scaled, (left - origin_x, top - origin_y))
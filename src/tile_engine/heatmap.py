@@ -0,0 +1,116 @@
+import numpy as np
+from .lod import LodRenderer
+from .tile_atlas import read_manifests, find_manifest
+
+HEATMAP_ALPHA = 150            # Surface alpha of an overlay over the map
+NO_DATA_KEY = (255, 0, 255)    # Colour key for tiles an overlay leaves clear
+# Colour ramp stops from the lowest to the highest value
+DEFAULT_RAMP = ((40, 160, 60), (240, 220, 60), (220, 50, 40))
+
+# Yield overlays, each read from the "<category>_yield" field of the tile manifests
+YIELD_CATEGORIES = ('food', 'production', 'gold')
+
+
+def ramp_table(stops, size=256):
+    """Return a (size, 3) uint8 table interpolated linearly between colour stops"""
+    stops = np.array(stops, dtype=np.float64)
+    positions = np.linspace(0, 1, len(stops))
+    samples = np.linspace(0, 1, size)
+    return np.stack([np.interp(samples, positions, stops[:, channel]) for channel in range(3)],
+                    axis=1).round().astype(np.uint8)
+
+
+class HeatmapRenderer(LodRenderer):
+    """
+    A per-tile NumPy layer drawn as a translucent colour-mapped overlay.
+
+    Like the low detail terrain view it keeps one pixel per tile, repaints
+    only the tiles the map journal reports after the layer's version
+    changes, and scales the viewport's region to the screen in one go.
+
+    Args:
+        game_map: GameMap the overlay is drawn over
+        name: Overlay name
+        values: Callable returning a (height, width) array of tile values
+        value_range: (low, high) values mapped to the ends of the ramp
+        version: Callable returning a token that changes with the values;
+                 defaults to the map's terrain version
+        no_data: Value drawn clear instead of coloured, or None
+        ramp: Colour stops from low to high
+    """
+    def __init__(self, game_map, name, values, value_range, version=None, no_data=None,
+                 ramp=DEFAULT_RAMP, alpha=HEATMAP_ALPHA, tile_size=256):
+        super().__init__(game_map, tile_size)
+        self.name = name
+        self.values = values
+        self.value_range = value_range
+        self.version_source = version
+        self.no_data = no_data
+        self.table = ramp_table(ramp)
+        self.surface.set_colorkey(NO_DATA_KEY)
+        self.surface.set_alpha(alpha)
+
+    def source_version(self):
+        if self.version_source is not None:
+            return self.version_source()
+        return super().source_version()
+
+    def update(self):
+        if self.version_source is not None and self.source_version() != self.terrain_version:
+            self.terrain_version = None  # The journal doesn't track custom layers: repaint it whole
+        return super().update()
+
+    def tile_colors(self, ys, xs):
+        """Ramp colours for the values at (xs, ys), clear where there is no data"""
+        values = np.asarray(self.values())[ys, xs]
+        low, high = self.value_range
+        scaled = (values.astype(np.float64) - low) / max(high - low, 1e-9)
+        colors = self.table[np.clip(scaled * (len(self.table) - 1), 0, len(self.table) - 1).astype(np.intp)]
+        if self.no_data is not None:
+            colors[values == self.no_data] = NO_DATA_KEY
+        return colors
+
+
+def terrain_yield_table(terrain_names, manifests, category):
+    """Yield of a category per terrain code, from the tile manifests; 0 for terrains without one"""
+    table = np.zeros(max(len(terrain_names), 1), dtype=np.int32)
+    for code, name in enumerate(terrain_names):
+        manifest = find_manifest(manifests, name)
+        if manifest is not None:
+            table[code] = manifest.get(f'{category}_yield', 0)
+    return table
+
+
+def yield_values(game_map, category, manifests):
+    """
+    Yield of a category on every tile: its terrain's yield plus its resource's.
+
+    Resources only record a yield value, not which yield it is, so a
+    resource adds to every category.
+    """
+    layers = game_map.layers
+    table = terrain_yield_table(layers.terrain_names, manifests, category)
+    return table[np.asarray(layers.terrain)] + np.asarray(layers.resource_yield)
+
+
+def create_heatmaps(game_map, manifests=None):
+    """
+    The standard overlays: movement cost, defense bonus and food, production and gold yields.
+
+    Args:
+        game_map: GameMap the overlays are drawn over
+        manifests: {terrain: manifest dict} with the terrain yields, read
+                   from data/tiles when None
+    """
+    if manifests is None:
+        manifests = read_manifests()
+    # Layers are looked up on every repaint: saving or reopening the map replaces them
+    heatmaps = [
+        HeatmapRenderer(game_map, 'movement_cost', lambda: game_map.layers.movement_cost, (1, 3)),
+        HeatmapRenderer(game_map, 'defense_bonus', lambda: game_map.layers.defense_bonus, (0, 50), no_data=0),
+    ]
+    for category in YIELD_CATEGORIES:
+        heatmaps.append(HeatmapRenderer(game_map, f'{category}_yield',
+                                        lambda category=category: yield_values(game_map, category, manifests),
+                                        (0, 10), no_data=0))
+    return {heatmap.name: heatmap for heatmap in heatmaps}
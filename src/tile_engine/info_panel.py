@@ -0,0 +1,69 @@
+import pygame
+from src.ui.text_cache import TextCache
+
+PANEL_WIDTH = 260
+LINE_HEIGHT = 22
+FONT_SIZE = 20
+PANEL_COLOR = (20, 20, 30, 200)
+TEXT_COLOR = (230, 230, 230)
+
+
+class InfoPanel:
+    """
+    Shows the selected tile's terrain, resource, units and city in the
+    bottom right corner of the map view.
+    """
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.terrain = None
+        self.resource = None
+        self.units = []
+        self.city = None
+        self.surface = None     # Panel drawn for the current contents
+        self.lines = None
+
+    def set_terrain(self, terrain_type, movement_cost):
+        """Show the selected tile's terrain; a new tile clears the other fields"""
+        self.terrain = (terrain_type, movement_cost)
+        self.resource = None
+        self.units = []
+        self.city = None
+
+    def set_resource(self, resource_type, yield_value):
+        self.resource = (resource_type, yield_value)
+
+    def set_unit_list(self, units):
+        self.units = list(units)
+
+    def set_city(self, city):
+        self.city = city
+
+    def get_lines(self):
+        """Text lines for the current contents"""
+        if self.terrain is None:
+            return []
+        lines = [f"Terrain: {self.terrain[0]} (move {self.terrain[1]})"]
+        if self.resource is not None:
+            lines.append(f"Resource: {self.resource[0]} (+{self.resource[1]})")
+        if self.units:
+            lines.append(f"Units: {len(self.units)}")
+        if self.city is not None:
+            lines.append(f"City: {getattr(self.city, 'name', 'Unnamed')}")
+        return lines
+
+    def render(self, screen):
+        """Draw the panel, re-rendering it only when its text changes"""
+        lines = self.get_lines()
+        if not lines:
+            return
+        if lines != self.lines:
+            text_cache = TextCache()
+            self.surface = pygame.Surface((PANEL_WIDTH, LINE_HEIGHT * len(lines) + 12), pygame.SRCALPHA)
+            self.surface.fill(PANEL_COLOR)
+            for i, line in enumerate(lines):
+                self.surface.blit(text_cache.render(line, FONT_SIZE, TEXT_COLOR), (8, 6 + i * LINE_HEIGHT))
+            self.lines = lines
+
+        screen.blit(self.surface, (self.screen_width - PANEL_WIDTH - 10,
+                                   self.screen_height - self.surface.get_height() - 10))
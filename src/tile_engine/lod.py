@@ -0,0 +1,142 @@
+import math
+import numpy as np
+import pygame
+from .chunk_cache import TERRAIN_COLORS, DEFAULT_TERRAIN_COLOR
+
+LOD_ENTER_ZOOM = 0.3   # Switch to the low detail view below this zoom
+LOD_EXIT_ZOOM = 0.45   # ...and back to detailed tiles only above this one
+
+
+def scale_tiles(surface, x0, y0, x1, y1, tile_zoomed):
+    """
+    Scale the one pixel per tile region [x0, x1) x [y0, y1) of surface so that
+    tile t covers the whole pixels from round(t * tile_zoomed) to
+    round((t + 1) * tile_zoomed), measured from round(x0 * tile_zoomed).
+
+    Unlike pygame.transform.scale, where a tile lands depends only on the
+    tile and not on the region around it, so regions scaled for different
+    views line up exactly and a scroll can reuse pixels at any zoom.
+    Colour key and surface alpha are carried over.
+    """
+    edges_x = np.round(np.arange(x0, x1 + 1) * tile_zoomed).astype(np.intp)
+    edges_y = np.round(np.arange(y0, y1 + 1) * tile_zoomed).astype(np.intp)
+    cols = np.repeat(np.arange(x0, x1), np.diff(edges_x))
+    rows = np.repeat(np.arange(y0, y1), np.diff(edges_y))
+    index = np.ix_(cols, rows)
+
+    scaled = pygame.Surface((len(cols), len(rows)), surface.get_flags(), surface)
+    pixels = pygame.surfarray.pixels3d(surface)
+    pygame.surfarray.blit_array(scaled, pixels[index])
+    del pixels  # Unlock the surface
+    if surface.get_masks()[3]:  # Per-pixel alpha
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        scaled_alpha = pygame.surfarray.pixels_alpha(scaled)
+        scaled_alpha[...] = alpha[index]
+        del alpha, scaled_alpha
+    scaled.set_colorkey(surface.get_colorkey())
+    scaled.set_alpha(surface.get_alpha())
+    return scaled
+
+
+class LodSwitch:
+    """
+    Decides whether the low detail view is in use, with hysteresis so a zoom
+    hovering around a single threshold doesn't flip between renderers.
+    """
+    def __init__(self, enter_zoom=LOD_ENTER_ZOOM, exit_zoom=LOD_EXIT_ZOOM):
+        self.enter_zoom = enter_zoom
+        self.exit_zoom = exit_zoom
+        self.active = False
+
+    def update(self, zoom):
+        """Return whether the low detail view should be drawn at this zoom"""
+        if self.active:
+            self.active = zoom < self.exit_zoom
+        else:
+            self.active = zoom < self.enter_zoom
+        return self.active
+
+
+class LodRenderer:
+    """
+    Low detail terrain: one pixel per tile, scaled to the screen in one go
+    with scale_tiles().
+
+    The pixels come from the terrain code array through the same colour
+    lookup table the detailed chunks use, so switching renderers doesn't
+    change colours. Only tiles the map journal reports are repainted after
+    terrain changes.
+    """
+    def __init__(self, game_map, tile_size=256):
+        self.map = game_map
+        self.tile_size = tile_size
+        self.surface = pygame.Surface((game_map.width, game_map.height), 0, 32)
+        self.subscription = game_map.journal.subscribe()
+        self.terrain_version = None   # source_version() the surface reflects
+        self.version = 0              # Bumped whenever the surface is repainted
+        self.scaled = None            # Scaled region for the last viewport
+        self.scaled_key = None
+
+    def color_table(self):
+        """Return a (terrain codes, 3) uint8 colour lookup table"""
+        return np.array([TERRAIN_COLORS.get(name, DEFAULT_TERRAIN_COLOR)
+                         for name in self.map.layers.terrain_names], dtype=np.uint8)
+
+    def source_version(self):
+        """Version of the data the pixels are coloured from"""
+        return self.map.terrain_version
+
+    def tile_colors(self, ys, xs):
+        """Terrain colours for the tiles at (xs, ys)"""
+        return self.color_table()[np.asarray(self.map.layers.terrain)[ys, xs]]
+
+    def update(self):
+        """
+        Bring the surface up to date with the map.
+
+        Returns:
+            True if any pixel was repainted
+        """
+        changes = self.subscription.poll()
+        source_version = self.source_version()
+        if self.terrain_version == source_version:
+            return False
+
+        if self.terrain_version is None or changes.full:
+            ys, xs = np.indices((self.map.height, self.map.width))
+            rgb = self.tile_colors(ys, xs)
+            pygame.surfarray.blit_array(self.surface, rgb.transpose(1, 0, 2))
+        else:
+            xs, ys = changes.tile_coords()
+            pixels = pygame.surfarray.pixels3d(self.surface)
+            pixels[xs, ys] = self.tile_colors(ys, xs)
+            del pixels  # Unlock the surface
+
+        self.terrain_version = source_version
+        self.version += 1
+        return True
+
+    def render(self, screen, viewport):
+        """Draw the tiles under the viewport from the one pixel per tile surface"""
+        self.update()
+        zoom = viewport.zoom
+        tile_world = self.tile_size
+
+        # Whole tiles overlapping the viewport
+        x0 = max(0, int(viewport.x // tile_world))
+        y0 = max(0, int(viewport.y // tile_world))
+        x1 = min(self.map.width, math.ceil((viewport.x + screen.get_width() / zoom) / tile_world))
+        y1 = min(self.map.height, math.ceil((viewport.y + screen.get_height() / zoom) / tile_world))
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Tile edges in whole pixels from the viewport's pixel origin, so
+        # strips drawn after a scroll meet the pixels already on screen
+        origin_x, origin_y = viewport.pixel_origin()
+        left, top = round(x0 * tile_world * zoom), round(y0 * tile_world * zoom)
+        key = (x0, y0, x1, y1, zoom, self.version)
+        if key != self.scaled_key:
+            self.scaled = scale_tiles(self.surface, x0, y0, x1, y1, tile_world * zoom)
+            self.scaled_key = key
+
+        screen.blit(self.scaled, (left - origin_x, top - origin_y))
@@ -1,16 +1,58 @@
+import numpy as np
+from .autotile import VARIANT_NAMES, BLOB_TABLE, variant_ids
+from .change_journal import ChangeJournal, CHUNK_SIZE
+from .chunked_layer import ChunkedLayer
+from .tile_layers import TileLayers
+
 class Tile:
-    def __init__(self, x, y, terrain_type='grass'):
+    """
+    A single map cell.
+    Terrain, costs and resources are read from the map's tile layers; the tile
+    itself only keeps sparse state such as its unit slots and city.
+    """
+    def __init__(self, x, y, game_map):
         self.x = x
         self.y = y
-        self.terrain_type = terrain_type
-        self.movement_cost = 1  # Default movement cost
-        self.defense_bonus = 0  # Default defense bonus
-        self.resource = None
+        self.map = game_map
         self.improvement = None
         self.unit_grid = [[None for _ in range(8)] for _ in range(8)]  # 8x8 grid for units
         self.has_city = False
         self.city = None
     
+    @property
+    def terrain_type(self):
+        return self.map.get_terrain(self.x, self.y)
+    
+    @terrain_type.setter
+    def terrain_type(self, terrain_type):
+        self.map.set_terrain(self.x, self.y, terrain_type)
+    
+    @property
+    def movement_cost(self):
+        return int(self.map.layers.movement_cost[self.y, self.x])
+    
+    @property
+    def defense_bonus(self):
+        return int(self.map.layers.defense_bonus[self.y, self.x])
+    
+    @property
+    def resource(self):
+        return self.map.get_resource(self.x, self.y)
+    
+    def has_state(self):
+        """Check whether the tile holds any sparse state worth copying"""
+        return (self.has_city or self.improvement is not None
+                or any(unit is not None for row in self.unit_grid for unit in row))
+    
+    def clone(self, game_map):
+        """Copy this tile's sparse state onto the same cell of another map"""
+        tile = Tile(self.x, self.y, game_map)
+        tile.improvement = self.improvement
+        tile.unit_grid = [row[:] for row in self.unit_grid]
+        tile.has_city = self.has_city
+        tile.city = self.city
+        return tile
+    
     def __repr__(self):
         return f"Tile({self.x}, {self.y}, {self.terrain_type})"
 
@@ -20,44 +62,156 @@ class Resource:
         self.yield_value = yield_value
 
 class GameMap:
-    def __init__(self, width, height):
+    def __init__(self, width, height, layers=None, backing_path=None, _variants=None):
         self.width = width
         self.height = height
-        self.tiles = [[Tile(x, y) for x in range(width)] for y in range(height)]
+        # Per-tile data lives in arrays; pass backing_path to memory-map them from a file
+        self.layers = layers if layers is not None else TileLayers.create(width, height, backing_path)
+        self.tiles = {}  # {(x, y): Tile}, created on first access
+        self.journal = ChangeJournal(width, height)  # Dirty tiles and per-chunk versions
+        self.terrain_version = 0  # Bumped when terrain or resources change; unit and city marks leave it alone
+        
+        # Cached autotile variant ids, resolved one chunk at a time on first use;
+        # snapshot() passes in (variants, variants_ready) copied from its map
+        if _variants is None:
+            _variants = (ChunkedLayer(np.zeros((height, width), dtype=np.uint8)),
+                         np.zeros(((height + CHUNK_SIZE - 1) // CHUNK_SIZE,
+                                   (width + CHUNK_SIZE - 1) // CHUNK_SIZE), dtype=bool))
+        self.variants, self.variants_ready = _variants
+    
+    @staticmethod
+    def open(path, mode='r+'):
+        """Open a map saved with save(); layers are paged in from disk on demand"""
+        layers = TileLayers.open(path, mode)
+        return GameMap(layers.width, layers.height, layers=layers)
+    
+    def save(self, path):
+        """Write the map layers to a single file, keeping the map backed by it"""
+        self.layers = self.layers.save(path)
+    
+    def snapshot(self):
+        """
+        Return a copy-on-write copy of the map for lookahead, previews and undo.
+        
+        Layer chunks are shared with this map and only copied once either map
+        writes to them. Tile slot grids are copied, but the units and cities
+        placed in them are the same objects as in this map.
+        """
+        snapshot = GameMap(self.width, self.height, layers=self.layers.snapshot(),
+                           _variants=(self.variants.snapshot(), self.variants_ready.copy()))
+        snapshot.tiles = {
+            position: tile.clone(snapshot)
+            for position, tile in self.tiles.items() if tile.has_state()
+        }
+        snapshot.terrain_version = self.terrain_version
+        return snapshot
+    
+    @property
+    def exploration(self):
+        """Per-player explored bitsets stored alongside the other layers"""
+        return self.layers.exploration
         
     def get_tile(self, x, y):
         """Get tile at the specified coordinates"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[y][x]
+            tile = self.tiles.get((x, y))
+            if tile is None:
+                tile = self.tiles[(x, y)] = Tile(x, y, self)
+            return tile
         return None
     
+    def mark_dirty(self, x, y):
+        """Record a change to a tile that was made outside of the map's own setters"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.journal.mark(x, y)
+    
+    def get_terrain(self, x, y):
+        """Get the terrain type name for a specific tile"""
+        return self.layers.terrain_names[self.layers.terrain[y, x]]
+    
     def set_terrain(self, x, y, terrain_type):
         """Set the terrain type for a specific tile"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.tiles[y][x].terrain_type = terrain_type
+            self._write_terrain(x, y, terrain_type)
             
-            # Update movement costs based on terrain
-            if terrain_type == 'water':
-                self.tiles[y][x].movement_cost = 2
-            elif terrain_type == 'mountain':
-                self.tiles[y][x].movement_cost = 3
-            elif terrain_type == 'forest':
-                self.tiles[y][x].movement_cost = 2
-            else:
-                self.tiles[y][x].movement_cost = 1
+            # The variants of the tile and its eight neighbours may have changed
+            y0, y1 = max(y - 1, 0), min(y + 2, self.height)
+            x0, x1 = max(x - 1, 0), min(x + 2, self.width)
+            resolved = variant_ids(self.layers.terrain, y0, y1, x0, x1)
+            changed = resolved != self.variants[y0:y1, x0:x1]
+            self.variants[y0:y1, x0:x1] = resolved
             
-            # Update defense bonuses based on terrain
-            if terrain_type == 'forest':
-                self.tiles[y][x].defense_bonus = 25
-            elif terrain_type == 'mountain':
-                self.tiles[y][x].defense_bonus = 50
-            else:
-                self.tiles[y][x].defense_bonus = 0
+            self.journal.mark(x, y)
+            for dy, dx in zip(*np.nonzero(changed)):
+                self.journal.mark(x0 + int(dx), y0 + int(dy))
+            self.terrain_version += 1
+    
+    def _write_terrain(self, x, y, terrain_type):
+        """Write a tile's terrain, movement cost and defense bonus layers"""
+        layers = self.layers
+        layers.terrain[y, x] = layers.terrain_code(terrain_type)
+        
+        # Update movement costs based on terrain
+        if terrain_type == 'water':
+            layers.movement_cost[y, x] = 2
+        elif terrain_type == 'mountain':
+            layers.movement_cost[y, x] = 3
+        elif terrain_type == 'forest':
+            layers.movement_cost[y, x] = 2
+        else:
+            layers.movement_cost[y, x] = 1
+        
+        # Update defense bonuses based on terrain
+        if terrain_type == 'forest':
+            layers.defense_bonus[y, x] = 25
+        elif terrain_type == 'mountain':
+            layers.defense_bonus[y, x] = 50
+        else:
+            layers.defense_bonus[y, x] = 0
+    
+    def get_variant_ids(self, x0, y0, x1, y1):
+        """
+        Return the cached autotile variant ids for the tiles in [x0, x1) x [y0, y1).
+        Chunks that have not been resolved yet are resolved first.
+        """
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), dtype=np.uint8)
+        
+        cy0, cy1 = y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1
+        cx0, cx1 = x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1
+        if not self.variants_ready[cy0:cy1, cx0:cx1].all():
+            for cy in range(cy0, cy1):
+                for cx in range(cx0, cx1):
+                    if not self.variants_ready[cy, cx]:
+                        ry0, rx0 = cy * CHUNK_SIZE, cx * CHUNK_SIZE
+                        ry1, rx1 = min(ry0 + CHUNK_SIZE, self.height), min(rx0 + CHUNK_SIZE, self.width)
+                        self.variants[ry0:ry1, rx0:rx1] = variant_ids(self.layers.terrain, ry0, ry1, rx0, rx1)
+                        self.variants_ready[cy, cx] = True
+        return self.variants[y0:y1, x0:x1]
+    
+    def get_tile_variant(self, x, y):
+        """Get the name of the autotile variant to draw for a tile"""
+        cy, cx = y // CHUNK_SIZE, x // CHUNK_SIZE
+        if not self.variants_ready[cy, cx]:
+            self.get_variant_ids(cx * CHUNK_SIZE, cy * CHUNK_SIZE, (cx + 1) * CHUNK_SIZE, (cy + 1) * CHUNK_SIZE)
+        return VARIANT_NAMES[self.variants[y, x]]
+    
+    def get_resource(self, x, y):
+        """Get the resource on a specific tile, or None"""
+        code = self.layers.resource[y, x]
+        if code == 0:
+            return None
+        return Resource(self.layers.resource_names[code], int(self.layers.resource_yield[y, x]))
     
     def add_resource(self, x, y, resource_type, yield_value):
         """Add a resource to a specific tile"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.tiles[y][x].resource = Resource(resource_type, yield_value)
+            self.layers.resource[y, x] = self.layers.resource_code(resource_type)
+            self.layers.resource_yield[y, x] = yield_value
+            self.journal.mark(x, y)
+            self.terrain_version += 1
     
     def place_unit_on_tile(self, unit, tile):
         """Find first available slot in the tile's 8x8 grid"""
@@ -71,6 +225,7 @@ class GameMap:
                         tile.x * 256 + slot_x * 32,
                         tile.y * 256 + slot_y * 32
                     )
+                    self.journal.mark(tile.x, tile.y)
                     return True
         return False  # Tile is full (64 units)
     
@@ -80,12 +235,15 @@ class GameMap:
             for slot_x in range(8):
                 if tile.unit_grid[slot_y][slot_x] == unit:
                     tile.unit_grid[slot_y][slot_x] = None
+                    self.journal.mark(tile.x, tile.y)
                     return True
         return False
     
     def get_tile_bitmask(self, x, y, terrain_type):
         """Calculate the 16-bit bitmask for terrain transitions"""
         bitmask = 0
+        terrain = self.layers.terrain
+        terrain_code = self.layers.terrain_code(terrain_type)
         directions = [
             (-1, -1), (0, -1), (1, -1),  # NW, N, NE
             (-1, 0),           (1, 0),   # W, E
@@ -95,33 +253,22 @@ class GameMap:
         for i, (dx, dy) in enumerate(directions):
             nx, ny = x + dx, y + dy
             if 0 <= nx < self.width and 0 <= ny < self.height:
-                if self.tiles[ny][nx].terrain_type == terrain_type:
+                if terrain[ny, nx] == terrain_code:
                     bitmask |= (1 << i)
 
         return bitmask
 
     def lookup_tile_variant(self, bitmask):
-        """
-        Map the bitmask to a specific tile variant
-        This is a simplified version - a real implementation would have all 47 variants
-        """
-        # Some of the core variants
-        tile_variants = {
-            0: "isolated",                  # No neighbors
-            255: "fully_surrounded",        # All neighbors
-            56: "horizontal_edge_top",      # N, NE, NW
-            7: "horizontal_edge_bottom",    # S, SE, SW
-            41: "vertical_edge_left",       # W, NW, SW
-            148: "vertical_edge_right",     # E, NE, SE
-            16: "inner_corner_top_right",   # NE only
-            1: "inner_corner_top_left",     # NW only
-            4: "inner_corner_bottom_right", # SE only
-            64: "inner_corner_bottom_left", # SW only
-        }
-        return tile_variants.get(bitmask, "default")
+        """Map a neighbour bitmask to one of the 47 blob autotile variants"""
+        return VARIANT_NAMES[BLOB_TABLE[bitmask & 0xFF]]
     
     def generate_map(self, terrain_data):
         """Generate the map from a 2D array of terrain types"""
         for y in range(min(self.height, len(terrain_data))):
             for x in range(min(self.width, len(terrain_data[0]))):
-                self.set_terrain(x, y, terrain_data[y][x])
+                self._write_terrain(x, y, terrain_data[y][x])
+        
+        # A freshly generated map invalidates every cache built from it
+        self.variants_ready[:] = False
+        self.journal.mark_all()
+        self.terrain_version += 1
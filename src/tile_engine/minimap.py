@@ -0,0 +1,93 @@
+import numpy as np
+import pygame
+
+# Simplified terrain colours for the minimap
+MINIMAP_COLORS = {
+    'grass': (34, 139, 34),    # Forest Green
+    'desert': (238, 214, 175),  # Sand
+    'water': (30, 144, 255),    # Dodger Blue
+    'mountain': (139, 137, 137),  # Gray
+    'forest': (0, 100, 0),      # Dark Green
+}
+DEFAULT_MINIMAP_COLOR = (100, 100, 100)
+UNEXPLORED_COLOR = (0, 0, 0)
+
+
+class Minimap:
+    """
+    A persistent picture of the map, one pixel per tile, as seen by one player.
+
+    The surface is built from the terrain code array through a colour lookup
+    table and masked by the player's exploration bitset. Afterwards only tiles
+    reported by the map journal or newly explored are repainted, and the
+    scaled copy drawn on screen is only rebuilt when the picture changed.
+    """
+    def __init__(self, game_map):
+        self.map = game_map
+        self.surface = pygame.Surface((game_map.width, game_map.height), 0, 32)
+        self.subscription = game_map.journal.subscribe()
+        self.player_id = None
+        self.explored_row = None  # Packed exploration row the surface reflects
+        self.scaled = None        # Surface scaled to the on-screen size
+        self.repainted_tiles = 0  # Tiles repainted by incremental updates, for profiling
+
+    def color_table(self):
+        """Return a (terrain codes, 3) uint8 colour lookup table"""
+        return np.array([MINIMAP_COLORS.get(name, DEFAULT_MINIMAP_COLOR)
+                         for name in self.map.layers.terrain_names], dtype=np.uint8)
+
+    def update(self, player_id):
+        """
+        Bring the surface up to date for a player.
+
+        Returns:
+            True if any pixel was repainted
+        """
+        exploration = self.map.exploration
+        row = np.array(exploration.row(player_id))
+        changes = self.subscription.poll()
+
+        if player_id != self.player_id or self.explored_row is None or changes.full:
+            self.rebuild(player_id)
+            return True
+
+        tiles = changes.tiles
+        newly_explored = row & ~self.explored_row
+        if newly_explored.any():
+            explored_tiles = np.flatnonzero(np.unpackbits(newly_explored, count=exploration.tile_count))
+            tiles = np.union1d(tiles, explored_tiles)
+        self.explored_row = row
+        if len(tiles) == 0:
+            return False
+
+        width = self.map.width
+        xs, ys = tiles % width, tiles // width
+        colors = self.color_table()[np.asarray(self.map.layers.terrain)[ys, xs]]
+        explored = np.unpackbits(row, count=exploration.tile_count)[tiles].astype(bool)
+        colors[~explored] = UNEXPLORED_COLOR
+
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[xs, ys] = colors
+        del pixels  # Unlock the surface
+
+        self.repainted_tiles += len(tiles)
+        self.scaled = None
+        return True
+
+    def rebuild(self, player_id):
+        """Repaint the whole surface for a player"""
+        exploration = self.map.exploration
+        rgb = self.color_table()[np.asarray(self.map.layers.terrain)]
+        rgb[~exploration.to_mask(player_id)] = UNEXPLORED_COLOR
+        pygame.surfarray.blit_array(self.surface, rgb.transpose(1, 0, 2))
+
+        self.player_id = player_id
+        self.explored_row = np.array(exploration.row(player_id))
+        self.scaled = None
+
+    def get_surface(self, size):
+        """Return the minimap scaled to size, rescaling only after changes"""
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        if self.scaled is None or self.scaled.get_size() != size:
+            self.scaled = pygame.transform.scale(self.surface, size)
+        return self.scaled
@@ -1,10 +1,13 @@
+import numpy as np
+
 class Player:
     def __init__(self, player_id, name, color):
         self.id = player_id
         self.name = name
         self.color = color
-        self.explored_tiles = set()  # Set of tiles this player has seen
-        self.visible_tiles = set()   # Set of tiles currently visible
+        # Explored tiles live in the map's exploration bitsets, keyed by player id
+        self.visible_mask = None     # (height, width) bool array of tiles currently visible
+        self.visibility_version = 0  # Bumped whenever visible_mask changes
         self.cities = []
         self.units = []
     
@@ -19,41 +22,30 @@ class Player:
         self.cities.append(city)
         city.player = self
         
+    def has_explored(self, game_map, x, y):
+        """Check whether this player has ever seen a tile"""
+        return game_map.exploration.is_set(self.id, x, y)
+    
+    def can_see(self, x, y):
+        """Check whether a tile is currently visible to this player"""
+        mask = self.visible_mask
+        return mask is not None and 0 <= y < mask.shape[0] and 0 <= x < mask.shape[1] and bool(mask[y, x])
+    
     def update_visibility(self, game_map):
         """Update which tiles are visible to this player based on units and cities"""
-        # Clear current visible tiles
-        self.visible_tiles.clear()
+        seen = np.zeros((game_map.height, game_map.width), dtype=bool)
+        
+        # Mark the square around every unit and city, clipped to the map
+        for source in self.units + self.cities:
+            x, y = source.tile_position
+            visibility_range = source.visibility_range
+            seen[max(0, y - visibility_range):y + visibility_range + 1,
+                 max(0, x - visibility_range):x + visibility_range + 1] = True
         
-        # Add tiles visible from units
-        for unit in self.units:
-            x, y = unit.tile_position
-            visibility_range = unit.visibility_range
-            
-            for dy in range(-visibility_range, visibility_range + 1):
-                for dx in range(-visibility_range, visibility_range + 1):
-                    nx, ny = x + dx, y + dy
-                    
-                    # Check if in map bounds
-                    if 0 <= nx < game_map.width and 0 <= ny < game_map.height:
-                        tile = game_map.get_tile(nx, ny)
-                        
-                        # Add to both explored and visible sets
-                        self.explored_tiles.add(tile)
-                        self.visible_tiles.add(tile)
+        if self.visible_mask is None or not np.array_equal(seen, self.visible_mask):
+            self.visible_mask = seen
+            self.visibility_version += 1
         
-        # Add tiles visible from cities
-        for city in self.cities:
-            x, y = city.tile_position
-            visibility_range = city.visibility_range
-            
-            for dy in range(-visibility_range, visibility_range + 1):
-                for dx in range(-visibility_range, visibility_range + 1):
-                    nx, ny = x + dx, y + dy
-                    
-                    # Check if in map bounds
-                    if 0 <= nx < game_map.width and 0 <= ny < game_map.height:
-                        tile = game_map.get_tile(nx, ny)
-                        
-                        # Add to both explored and visible sets
-                        self.explored_tiles.add(tile)
-                        self.visible_tiles.add(tile)
+        # Everything seen now stays explored
+        if seen.any():
+            game_map.exploration.set_mask(self.id, seen)
@@ -0,0 +1,108 @@
+import collections
+from .lod import LOD_ENTER_ZOOM, LOD_EXIT_ZOOM
+
+FRAME_BUDGET = 1 / 60    # Seconds of work per frame at 60 fps
+WINDOW = 30              # Frames measured before each decision
+COOLDOWN = 60            # Frames to wait after a change before judging the new level
+DOWNGRADE_RATIO = 1.0    # Step down when slow frames exceed the budget...
+UPGRADE_RATIO = 0.6      # ...and back up when they fit in this fraction of it
+PERCENTILE = 0.9         # Frame time percentile the decisions are based on
+
+
+class QualityLevel:
+    """One step of render quality settings, applied with TileEngine.set_quality()."""
+    def __init__(self, name, fog_blend, unit_detail, lod_enter_zoom, lod_exit_zoom, minimap_interval):
+        self.name = name
+        self.fog_blend = fog_blend                # Alpha blended fog, or solid fog with a colour key
+        self.unit_detail = unit_detail            # UnitRenderer stamp detail
+        self.lod_enter_zoom = lod_enter_zoom      # Zoom below which terrain is drawn one pixel per tile
+        self.lod_exit_zoom = lod_exit_zoom
+        self.minimap_interval = minimap_interval  # Frames between minimap updates
+
+
+# Best quality first; each step gives up a little more detail
+QUALITY_LEVELS = (
+    QualityLevel('high', True, 'full', LOD_ENTER_ZOOM, LOD_EXIT_ZOOM, 1),
+    QualityLevel('medium', True, 'full', 0.45, 0.6, 4),
+    QualityLevel('low', False, 'reduced', 0.6, 0.75, 10),
+    QualityLevel('lowest', False, 'reduced', 0.9, 1.05, 30),
+)
+
+
+class QualityGovernor:
+    """
+    Holds the frame budget by stepping render quality down when frames run
+    long and back up when there is headroom.
+
+    Frame times are collected over a window; once it is full, the 90th
+    percentile is compared with the budget. After a change the window is
+    cleared and no decision is made for a cooldown, so the effect of the new
+    level is measured before moving again.
+    """
+    def __init__(self, budget=FRAME_BUDGET, levels=QUALITY_LEVELS, window=WINDOW, cooldown=COOLDOWN):
+        self.budget = budget
+        self.levels = levels
+        self.index = 0
+        self.samples = collections.deque(maxlen=window)
+        self.cooldown = cooldown
+        self.frames_since_change = cooldown
+        self.change_count = 0
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def record_frame(self, seconds):
+        """
+        Add one frame's work time and adjust the quality level.
+
+        Returns:
+            True if the level changed and should be applied
+        """
+        self.samples.append(seconds)
+        self.frames_since_change += 1
+        if len(self.samples) < self.samples.maxlen or self.frames_since_change < self.cooldown:
+            return False
+
+        frame_time = self.frame_time()
+        if frame_time > self.budget * DOWNGRADE_RATIO and self.index < len(self.levels) - 1:
+            return self.set_index(self.index + 1)
+        if frame_time < self.budget * UPGRADE_RATIO and self.index > 0:
+            return self.set_index(self.index - 1)
+        return False
+
+    def set_index(self, index):
+        """Jump to a quality level, restarting the measurement"""
+        index = max(0, min(index, len(self.levels) - 1))
+        if index == self.index:
+            return False
+        self.index = index
+        self.samples.clear()
+        self.frames_since_change = 0
+        self.change_count += 1
+        return True
+
+    def frame_time(self):
+        """Percentile frame time over the current window, or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int((len(ordered) - 1) * PERCENTILE)]
+
+    def status(self):
+        """Current state for debug displays"""
+        frame_time = self.frame_time()
+        return {
+            'level': self.level.name,
+            'index': self.index,
+            'frame_ms': None if frame_time is None else round(frame_time * 1000, 2),
+            'budget_ms': round(self.budget * 1000, 2),
+            'changes': self.change_count,
+        }
+
+    def status_lines(self):
+        """Status as text lines"""
+        status = self.status()
+        frame_ms = '-' if status['frame_ms'] is None else f"{status['frame_ms']:.2f}"
+        return [f"Quality: {status['level']} ({status['changes']} changes)",
+                f"Frame p90: {frame_ms} / {status['budget_ms']:.2f} ms"]
@@ -0,0 +1,245 @@
+import glob
+import json
+import numbers
+import os
+import threading
+import pygame
+from .autotile import VARIANT_NAMES
+from src.utils.logger import Logger
+
+MANIFEST_DIR = os.path.join("data", "tiles")
+PREBUILT_MANIFEST = os.path.join("assets", "atlas", "atlas_manifest.json")  # Written by scripts/build_tile_atlas.py
+PAGE_WIDTH = 2048  # Widest atlas page; taller terrains wrap onto more shelves
+
+# Map terrain names that differ from the manifest "name" fields
+TERRAIN_ALIASES = {
+    'grass': 'grassland',
+}
+
+
+def read_manifests(manifest_dir=MANIFEST_DIR):
+    """Read every data/tiles/*.json manifest into {terrain: manifest dict}, logging unreadable ones"""
+    manifests = {}
+    for path in sorted(glob.glob(os.path.join(manifest_dir, "*.json"))):
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            manifests[manifest['name']] = manifest
+        except (OSError, ValueError, KeyError) as e:
+            Logger().error(f"Failed to read tile manifest {path}: {e}")
+    return manifests
+
+
+def find_manifest(manifests, terrain):
+    """Return the manifest of a map terrain name, or None"""
+    return manifests.get(TERRAIN_ALIASES.get(terrain, terrain))
+
+
+class TileAtlas:
+    """
+    Packs the tile images listed in data/tiles/*.json into atlas pages.
+
+    Each terrain is loaded the first time one of its tiles is asked for:
+    its variant images are loaded once per distinct file, converted to the
+    display format and packed onto a page of their own, so unloading a
+    terrain frees exactly its pages. Variants whose image is missing fall
+    back to the terrain's base image and share its region.
+
+    When scripts/build_tile_atlas.py has been run, terrains whose images are
+    all in its sheets are served straight from those shared sheets instead.
+    """
+    def __init__(self, manifest_dir=MANIFEST_DIR, page_width=PAGE_WIDTH, prebuilt_manifest=PREBUILT_MANIFEST):
+        self.page_width = page_width
+        self.manifests = read_manifests(manifest_dir)  # {terrain: manifest dict}, read eagerly since they are small
+        self.regions = {}        # {terrain: {variant name: (page, Rect)}}
+        self.pages = {}          # {terrain: [Surface]}
+        self.page_bytes = 0      # Bytes held by every loaded page
+        self.used_bytes = 0      # Bytes actually covered by packed images
+        self.subsurfaces = {}    # {(page, rect tuple): Surface}
+        self.lock = threading.Lock()  # Chunks may be rasterized on a background thread; guards every dict above
+        self.prebuilt = {}       # {image path: (sheet index, Rect)} from the offline atlas
+        self.sheet_files = []    # Offline atlas sheet paths
+        self.sheets = {}         # {sheet index: Surface}, loaded on first use and shared by terrains
+
+        if prebuilt_manifest and os.path.exists(prebuilt_manifest):
+            try:
+                with open(prebuilt_manifest, 'r') as f:
+                    atlas = json.load(f)
+                sheet_dir = os.path.dirname(prebuilt_manifest)
+                self.sheet_files = [os.path.join(sheet_dir, sheet) for sheet in atlas['sheets']]
+                self.prebuilt = {path: (entry[0], pygame.Rect(entry[1:5])) for path, entry in atlas['images'].items()}
+            except (OSError, ValueError, KeyError) as e:
+                Logger().error(f"Failed to read tile atlas manifest {prebuilt_manifest}: {e}")
+
+    def resolve_terrain(self, terrain):
+        """Return the manifest name for a map terrain name, or None if unknown"""
+        terrain = TERRAIN_ALIASES.get(terrain, terrain)
+        return terrain if terrain in self.manifests else None
+
+    def is_loaded(self, terrain):
+        terrain = self.resolve_terrain(terrain)
+        return terrain in self.regions
+
+    def load_terrain(self, terrain):
+        """
+        Load and pack every variant image of a terrain.
+
+        Returns:
+            True if the terrain has at least one image packed
+        """
+        terrain = self.resolve_terrain(terrain)
+        if terrain is None:
+            return False
+        with self.lock:
+            if terrain not in self.regions and not self._load_prebuilt(terrain, self.manifests[terrain]):
+                self._pack(terrain, self._load_images(self.manifests[terrain]))
+            return bool(self.regions[terrain])
+
+    def _load_prebuilt(self, terrain, manifest):
+        """Point a terrain's regions into the offline atlas sheets, if its images were packed there"""
+        base = manifest.get('base_image')
+        if base not in self.prebuilt:
+            return False
+        
+        regions = {}
+        paths = {'base': base}
+        paths.update(manifest.get('variants', {}))
+        for name, path in paths.items():
+            index, rect = self.prebuilt.get(path, self.prebuilt[base])
+            sheet = self._get_sheet(index)
+            if sheet is None:
+                return False
+            regions[name] = (sheet, rect)
+        self.pages[terrain] = []  # Sheets are shared, so the terrain owns no pages
+        self.regions[terrain] = regions
+        return True
+
+    def _get_sheet(self, index):
+        """Load an offline atlas sheet once"""
+        if index not in self.sheets:
+            try:
+                sheet = pygame.image.load(self.sheet_files[index])
+            except (pygame.error, FileNotFoundError, IndexError) as e:
+                Logger().warning(f"Failed to load tile atlas sheet {index}: {e}")
+                return None
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            self.sheets[index] = sheet
+            size = sheet.get_width() * sheet.get_height() * sheet.get_bytesize()
+            self.page_bytes += size
+            self.used_bytes += sum(rect.width * rect.height for sheet_index, rect in self.prebuilt.values()
+                                   if sheet_index == index) * sheet.get_bytesize()
+        return self.sheets[index]
+
+    def _load_images(self, manifest):
+        """Load each distinct image a manifest references, keyed by variant name"""
+        paths = {'base': manifest.get('base_image')}
+        paths.update(manifest.get('variants', {}))
+
+        images = {}   # {path: Surface}
+        for path in set(filter(None, paths.values())):
+            if not os.path.exists(path):
+                continue
+            try:
+                image = pygame.image.load(path)
+            except pygame.error as e:
+                Logger().warning(f"Failed to load tile image {path}: {e}")
+                continue
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha() if image.get_alpha() is not None else image.convert()
+            images[path] = image
+
+        base_path = paths['base'] if paths['base'] in images else None
+        by_variant = {}
+        for name, path in paths.items():
+            path = path if path in images else base_path
+            if path is not None:
+                by_variant[name] = (path, images[path])
+        return by_variant
+
+    def _pack(self, terrain, by_variant):
+        """Shelf-pack a terrain's images onto as few pages as fit page_width"""
+        placements = {}   # {path: (page index, Rect)}
+        unique = {}
+        for path, image in by_variant.values():
+            unique[path] = image
+
+        # Tallest first keeps shelves tight
+        order = sorted(unique, key=lambda path: unique[path].get_height(), reverse=True)
+        page_sizes = [[0, 0]]
+        x = shelf_y = shelf_h = 0
+        for path in order:
+            w, h = unique[path].get_size()
+            if x + w > self.page_width and x > 0:
+                x, shelf_y, shelf_h = 0, shelf_y + shelf_h, 0
+            if shelf_y + h > self.page_width and shelf_y > 0:
+                page_sizes.append([0, 0])
+                x = shelf_y = shelf_h = 0
+            placements[path] = (len(page_sizes) - 1, pygame.Rect(x, shelf_y, w, h))
+            page_sizes[-1][0] = max(page_sizes[-1][0], x + w)
+            page_sizes[-1][1] = max(page_sizes[-1][1], shelf_y + h)
+            x += w
+            shelf_h = max(shelf_h, h)
+
+        pages = []
+        if placements:
+            for size in page_sizes:
+                page = pygame.Surface(size, pygame.SRCALPHA)
+                if pygame.display.get_surface() is not None:
+                    page = page.convert_alpha()
+                pages.append(page)
+                self.page_bytes += size[0] * size[1] * page.get_bytesize()
+            for path, (index, rect) in placements.items():
+                pages[index].blit(unique[path], rect)
+                self.used_bytes += rect.width * rect.height * pages[index].get_bytesize()
+
+        self.pages[terrain] = pages
+        self.regions[terrain] = {name: (pages[placements[path][0]], placements[path][1])
+                                 for name, (path, _) in by_variant.items()}
+
+    def get_region(self, terrain, variant):
+        """
+        Get where a tile variant lives in the atlas.
+
+        Args:
+            terrain: Map terrain name, e.g. 'desert'
+            variant: Autotile variant id (index into VARIANT_NAMES, a Python or
+                     NumPy integer) or variant name
+
+        Returns:
+            (page surface, Rect), or None if the terrain has no images
+        """
+        if not self.load_terrain(terrain):
+            return None
+        name = VARIANT_NAMES[variant] if isinstance(variant, numbers.Integral) else variant
+        with self.lock:
+            regions = self.regions.get(self.resolve_terrain(terrain))
+        if regions is None:
+            return None  # Unloaded by another thread in the meantime
+        return regions.get(name) or regions.get('base')
+
+    def get_surface(self, terrain, variant):
+        """Get a tile variant as a subsurface of its atlas page, or None"""
+        region = self.get_region(terrain, variant)
+        if region is None:
+            return None
+        page, rect = region
+        key = (page, tuple(rect))
+        with self.lock:
+            surface = self.subsurfaces.get(key)
+            if surface is None:
+                surface = self.subsurfaces[key] = page.subsurface(rect)
+        return surface
+
+    def unload_terrain(self, terrain):
+        """Free a terrain's atlas pages; they are rebuilt on next use"""
+        terrain = self.resolve_terrain(terrain)
+        with self.lock:
+            pages = self.pages.pop(terrain, [])
+            regions = self.regions.pop(terrain, {})
+            for page in pages:
+                self.page_bytes -= page.get_width() * page.get_height() * page.get_bytesize()
+            for page, rect in {(page, tuple(rect)) for page, rect in regions.values()}:
+                if any(page is owned for owned in pages):
+                    self.used_bytes -= rect[2] * rect[3] * page.get_bytesize()
+                    self.subsurfaces.pop((page, rect), None)
@@ -1,10 +1,29 @@
 import pygame
+import numpy as np
 from .map import GameMap
 from .player import Player
 from .viewport import Viewport
 from .info_panel import InfoPanel
 from .unit_manager import UnitManager
 from .city_manager import CityManager
+from .chunk_cache import TerrainChunkCache
+from .minimap import Minimap, MINIMAP_COLORS, DEFAULT_MINIMAP_COLOR
+from .fog import FogOverlay
+from .unit_renderer import UnitRenderer
+from .tile_atlas import TileAtlas
+from .compositor import MapCompositor
+from .lod import LodSwitch, LodRenderer
+from .chunk_prefetcher import ChunkPrefetcher
+from .heatmap import create_heatmaps
+
+# Number keys toggling the overlays; pressing the shown overlay's key hides it
+HEATMAP_KEYS = {
+    pygame.K_1: 'movement_cost',
+    pygame.K_2: 'defense_bonus',
+    pygame.K_3: 'food_yield',
+    pygame.K_4: 'production_yield',
+    pygame.K_5: 'gold_yield',
+}
 
 class TileEngine:
     def __init__(self, screen_width, screen_height, map_width, map_height):
@@ -25,10 +44,33 @@ class TileEngine:
         self.info_panel = InfoPanel(screen_width, screen_height)
         self.unit_manager = UnitManager(self.map)
         self.city_manager = CityManager(self.map)
+        self.tile_atlas = TileAtlas()  # Tile textures, loaded per terrain on first use
+        self.terrain_cache = TerrainChunkCache(self.map, atlas=self.tile_atlas)  # Pre-rasterized terrain and resources
+        self.prefetcher = ChunkPrefetcher(self.terrain_cache)  # Queues chunks ahead of panning on the cache's builder
+        self.minimap = Minimap(self.map)
+        self.fog = FogOverlay(self.map)
+        self.unit_renderer = UnitRenderer(self.unit_manager)
+        self.lod_switch = LodSwitch()           # Far zooms draw one pixel per tile instead of chunks
+        self.lod_renderer = LodRenderer(self.map)
+        self.heatmaps = create_heatmaps(self.map, self.tile_atlas.manifests)  # Toggleable overlays, {name: HeatmapRenderer}
+        self.active_heatmap = None
+        self.minimap_interval = 1               # Frames between minimap updates
+        self.frame_count = 0
         
         # Selection state
         self.selected_tile = None
         self.selected_unit = None
+        
+        # Map view layers, bottom to top, each redrawn only when its source changes
+        self.compositor = MapCompositor()
+        self.compositor.add_layer('terrain', self.terrain_layer_source, self.render_terrain, opaque=True)
+        self.compositor.add_layer('heatmap', self.heatmap_layer_source, self.render_heatmap)
+        self.compositor.add_layer('cities', lambda: self.city_manager.version, self.render_cities)
+        self.compositor.add_layer('units', self.units_layer_source,
+                                  lambda surface, rect: self.unit_renderer.render(surface, self.viewport, rect))
+        self.compositor.add_layer('fog', self.fog_layer_source,
+                                  lambda surface, rect: self.fog.render(surface, self.viewport, self.players[self.current_player_id]))
+        self.compositor.add_layer('selection', lambda: self.selected_tile, self.render_selection)
     
     def add_player(self, name, color):
         player = Player(len(self.players), name, color)
@@ -41,6 +83,13 @@ class TileEngine:
         self.city_manager.update()
         self.update_visible_tiles()
         
+        # Rasterize the chunks the viewport is heading for before they scroll in
+        if not self.lod_switch.active:
+            self.prefetcher.update(self.viewport, (self.screen_width, self.screen_height))
+        
+        # Close this frame's batch of map changes for renderer and cache subscribers
+        self.map.journal.commit()
+        
     def next_turn(self):
         """Advance to the next turn"""
         self.turn += 1
@@ -70,6 +119,10 @@ class TileEngine:
         elif event.type == pygame.MOUSEMOTION:
             if self.viewport.is_dragging:
                 self.viewport.handle_drag(event.pos)
+        
+        elif event.type == pygame.KEYDOWN:
+            if event.key in HEATMAP_KEYS:
+                self.toggle_heatmap(HEATMAP_KEYS[event.key])
     
     def handle_tile_selection(self, screen_pos):
         """Convert screen position to tile coordinates and select the tile"""
@@ -137,8 +190,51 @@ class TileEngine:
         # Center viewport on this position
         self.viewport.center_on_position(target_world_x, target_world_y)
         
+    def frame_signature(self):
+        """
+        Everything the rendered frame depends on, used to detect idle frames.
+        
+        Finished background work (terrain chunks, scaled stamps) is picked
+        up here, so a frame whose only change is a completed build differs.
+        """
+        player = self.players[self.current_player_id] if self.players else None
+        heatmap = self.heatmaps.get(self.active_heatmap)
+        if heatmap is not None:
+            heatmap.update()
+        return (
+            self.viewport.x, self.viewport.y, self.viewport.zoom,
+            self.map.journal.version,
+            self.terrain_cache.poll(),
+            self.lod_renderer.version,
+            self.unit_manager.version,
+            self.unit_renderer.stamps.update(),
+            self.current_player_id,
+            player.visibility_version if player else None,
+            self.fog.version,
+            self.selected_tile,
+            self.active_heatmap,
+            heatmap.version if heatmap is not None else None,
+            self.turn,
+        )
+        
+    def set_quality(self, settings):
+        """
+        Apply render quality settings, e.g. from a QualityGovernor.
+        
+        Args:
+            settings: QualityLevel with fog_blend, unit_detail, lod_enter_zoom,
+                      lod_exit_zoom and minimap_interval
+        """
+        self.fog.blend = settings.fog_blend
+        self.unit_renderer.set_detail(settings.unit_detail)
+        self.lod_switch.enter_zoom = settings.lod_enter_zoom
+        self.lod_switch.exit_zoom = settings.lod_exit_zoom
+        self.minimap_interval = settings.minimap_interval
+    
     def render(self, screen):
         """Render the entire game view"""
+        self.frame_count += 1
+        
         # Clear screen
         screen.fill((0, 0, 0))
         
@@ -152,78 +248,83 @@ class TileEngine:
         self.info_panel.render(screen)
     
     def render_map(self, screen):
-        """Render the visible portion of the map"""
-        visible_tiles = self.viewport.get_visible_tiles()
-        for tile_y, tile_x in visible_tiles:
-            tile = self.map.get_tile(tile_x, tile_y)
-            if not tile:
-                continue
-                
-            # Get screen position for this tile
-            screen_x, screen_y = self.viewport.world_to_screen(
-                tile_x * 256, tile_y * 256
-            )
-            
-            # Only render if on screen
-            if (-256 <= screen_x <= self.screen_width and 
-                -256 <= screen_y <= self.screen_height):
-                
-                # Render base terrain
-                self.render_tile(screen, tile, screen_x, screen_y)
-                
-                # Render resources if any
-                if tile.resource:
-                    self.render_resource(screen, tile.resource, screen_x, screen_y)
-                
-                # Render city if present
-                if tile.has_city:
-                    self.render_city(screen, tile.city, screen_x, screen_y)
-                
-                # Render units
-                units = self.unit_manager.get_units_on_tile(tile)
-                for unit in units:
-                    self.render_unit(screen, unit, screen_x, screen_y)
-                
-                # Render fog of war
-                player = self.players[self.current_player_id]
-                self.render_fog_of_war(screen, tile, player, screen_x, screen_y)
-                
-                # Render selection highlight if selected
-                if self.selected_tile == (tile_x, tile_y):
-                    pygame.draw.rect(screen, (255, 255, 0), 
-                                    (screen_x, screen_y, 256, 256), 2)
-
-    def render_tile(self, screen, tile, screen_x, screen_y):
-        """Render a single tile with proper transitions"""
-        bitmask = self.map.get_tile_bitmask(tile.x, tile.y, tile.terrain_type)
-        tile_variant = self.map.lookup_tile_variant(bitmask)
-        
-        # In a real implementation, you'd load the appropriate texture based on tile_variant
-        # For this example, we'll use colored rectangles
-        terrain_colors = {
-            'grass': (100, 200, 100),
-            'desert': (240, 220, 130),
-            'water': (64, 164, 223),
-            'mountain': (139, 137, 137),
-            'forest': (34, 139, 34),
-        }
-        color = terrain_colors.get(tile.terrain_type, (128, 128, 128))
-        
-        # Scale rectangle based on zoom
-        zoom_adjusted_size = int(256 * self.viewport.zoom)
-        
-        # Draw tile
-        pygame.draw.rect(screen, color, 
-                         (screen_x, screen_y, zoom_adjusted_size, zoom_adjusted_size))
+        """Render the visible portion of the map from the cached layers"""
+        self.compositor.render(screen, self.viewport)
+    
+    def terrain_layer_source(self):
+        """Terrain must be redrawn on terrain changes, LOD switches and when better chunk levels arrive"""
+        if self.lod_switch.update(self.viewport.zoom):
+            self.lod_renderer.update()
+            return ('lod', self.lod_renderer.version)
+        self.terrain_cache.begin_frame()
+        return ('chunks', self.map.terrain_version, self.terrain_cache.collected_count)
+    
+    def render_terrain(self, screen, rect=None):
+        """Render terrain from the LOD picture when zoomed far out, else from the cached chunks touching rect"""
+        if self.lod_switch.active:
+            self.lod_renderer.render(screen, self.viewport)
+        else:
+            self.terrain_cache.render(screen, self.viewport, rect or screen.get_rect())
+    
+    def units_layer_source(self):
+        """Units must be redrawn when they move and when better scaled stamps arrive"""
+        return (self.unit_manager.version, self.unit_renderer.stamps.update())
+    
+    def toggle_heatmap(self, name):
+        """Show the named overlay, or hide it if it is already shown"""
+        if name is not None and name not in self.heatmaps:
+            raise ValueError(f"Unknown heatmap: {name}")
+        self.active_heatmap = None if name == self.active_heatmap else name
+        return self.active_heatmap
+    
+    def heatmap_layer_source(self):
+        """The overlay must be redrawn when it is toggled or its layer's values change"""
+        if self.active_heatmap is None:
+            return None
+        heatmap = self.heatmaps[self.active_heatmap]
+        heatmap.update()
+        return (heatmap.name, heatmap.version)
+    
+    def render_heatmap(self, screen, rect=None):
+        """Render the active overlay, if any"""
+        if self.active_heatmap is not None:
+            self.heatmaps[self.active_heatmap].render(screen, self.viewport)
+    
+    def fog_layer_source(self):
+        """Fog must be redrawn when the current player's visibility or exploration changes"""
+        player = self.players[self.current_player_id]
+        self.fog.update(player)
+        return (player.id, self.fog.version)
     
-    def render_resource(self, screen, resource, screen_x, screen_y):
-        """Render a resource on a tile"""
-        # In a real implementation, you'd render a resource sprite
-        resource_color = (255, 215, 0)  # Gold color for resources
-        resource_size = int(32 * self.viewport.zoom)
-        pygame.draw.circle(screen, resource_color, 
-                         (screen_x + 128, screen_y + 128), resource_size)
+    def render_cities(self, screen, rect=None):
+        """Render the cities on visible tiles touching rect, by default the whole screen"""
+        # Query the city index instead of visiting every visible tile, which
+        # runs into thousands of tiles when zoomed far out
+        start_x, start_y, end_x, end_y = self.viewport.get_visible_tile_rect()
+        if start_x >= end_x or start_y >= end_y:
+            return
+        cities = list(self.city_manager.get_cities_in_rect(start_x, start_y, end_x - 1, end_y - 1))
+        if not cities:
+            return
+        
+        # Project every city tile to the screen in one call
+        tiles = np.array([city.tile_position for city in cities], dtype=np.float64).reshape(-1, 2) * 256
+        _, _, visible = self.viewport.project(tiles[:, 0], tiles[:, 1], 256, rect)
+        origin_x, origin_y = self.viewport.pixel_origin()
+        screen_xs = (tiles[:, 0] * self.viewport.zoom - origin_x).tolist()
+        screen_ys = (tiles[:, 1] * self.viewport.zoom - origin_y).tolist()
+        for i in np.flatnonzero(visible).tolist():
+            self.render_city(screen, cities[i], screen_xs[i], screen_ys[i])
     
+    def render_selection(self, screen, rect=None):
+        """Render the selection highlight if a tile is selected"""
+        if self.selected_tile:
+            origin_x, origin_y = self.viewport.pixel_origin()
+            screen_x = round(self.selected_tile[0] * 256 * self.viewport.zoom) - origin_x
+            screen_y = round(self.selected_tile[1] * 256 * self.viewport.zoom) - origin_y
+            pygame.draw.rect(screen, (255, 255, 0), 
+                            (screen_x, screen_y, 256, 256), 2)
+
     def render_city(self, screen, city, screen_x, screen_y):
         """Render a city on a tile"""
         # In a real implementation, you'd render a city sprite
@@ -239,30 +340,6 @@ class TileEngine:
         ]
         pygame.draw.polygon(screen, city_color, points)
     
-    def render_unit(self, screen, unit, tile_x, tile_y):
-        """Render a unit on its slot position within a tile"""
-        slot_x, slot_y = unit.slot_position
-        unit_x = tile_x + (slot_x * 32) * self.viewport.zoom
-        unit_y = tile_y + (slot_y * 32) * self.viewport.zoom
-        unit_size = int(24 * self.viewport.zoom)
-        
-        # Draw unit as a colored circle
-        pygame.draw.circle(screen, unit.player.color, 
-                        (unit_x + 16, unit_y + 16), unit_size)
-    
-    def render_fog_of_war(self, screen, tile, player, screen_x, screen_y):
-        """Render fog of war for unexplored or non-visible tiles"""
-        if tile not in player.explored_tiles:
-            # Draw completely black fog (unexplored)
-            pygame.draw.rect(screen, (0, 0, 0, 255), 
-                            (screen_x, screen_y, 256 * self.viewport.zoom, 256 * self.viewport.zoom))
-        elif tile not in player.visible_tiles:
-            # Draw semi-transparent fog (explored but not visible)
-            fog_surface = pygame.Surface((256, 256), pygame.SRCALPHA)
-            pygame.draw.rect(fog_surface, (0, 0, 0, 128), 
-                            (0, 0, 256, 256))
-            screen.blit(fog_surface, (screen_x, screen_y))
-    
     def render_minimap(self, screen, player_id=None):
         """Render the minimap in the corner of the screen"""
         if player_id is None:
@@ -275,22 +352,12 @@ class TileEngine:
         # Draw border
         pygame.draw.rect(screen, (128, 128, 128), (10, 10, minimap_width + 4, minimap_height + 4), 2)
 
-        # Draw minimap terrain
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                tile = self.map.get_tile(x, y)
-
-                # Only draw explored tiles
-                if tile in self.players[player_id].explored_tiles:
-                    # Get color based on terrain
-                    color = self.get_terrain_color(tile.terrain_type)
-
-                    # Draw minimap pixel
-                    pygame.draw.rect(screen, color,
-                        (12 + x * (minimap_width / self.map_width),
-                        12 + y * (minimap_height / self.map_height),
-                        minimap_width / self.map_width + 1,
-                        minimap_height / self.map_height + 1))
+        # Draw minimap terrain, repainting only tiles that changed or were newly explored;
+        # a lower quality setting refreshes it only every few frames
+        player = self.players[player_id]
+        if player.id != self.minimap.player_id or self.frame_count % self.minimap_interval == 0:
+            self.minimap.update(player.id)
+        screen.blit(self.minimap.get_surface((minimap_width, minimap_height)), (12, 12))
 
         # Draw viewport rectangle
         viewport_x_ratio = self.viewport.x / (self.map_width * 256)
@@ -306,11 +373,4 @@ class TileEngine:
     
     def get_terrain_color(self, terrain_type):
         """Get a simplified color for the minimap based on terrain type"""
-        colors = {
-            'grass': (34, 139, 34),    # Forest Green
-            'desert': (238, 214, 175),  # Sand
-            'water': (30, 144, 255),    # Dodger Blue
-            'mountain': (139, 137, 137),  # Gray
-            'forest': (0, 100, 0),      # Dark Green
-        }
-        return colors.get(terrain_type, (100, 100, 100))
+        return MINIMAP_COLORS.get(terrain_type, DEFAULT_MINIMAP_COLOR)
@@ -0,0 +1,205 @@
+import json
+import os
+import struct
+import numpy as np
+from src.engine.tile_bitsets import PlayerTileBitsets
+from .chunked_layer import ChunkedLayer
+
+# Per-tile layers stored for every map, in file order
+LAYER_SPECS = (
+    ('terrain', np.uint8),         # Code into TileLayers.terrain_names
+    ('movement_cost', np.uint8),
+    ('defense_bonus', np.uint8),
+    ('resource', np.uint8),        # Code into TileLayers.resource_names, 0 = no resource
+    ('resource_yield', np.int16),
+)
+
+MAGIC = b'AGLMAP01'
+HEADER_SIZE = 65536  # Reserved for the JSON header; layers start after it
+PAGE_SIZE = 4096     # Layer offsets are page aligned so each layer maps cleanly
+
+
+def _align(offset):
+    return (offset + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+
+class TileLayers:
+    """
+    Per-tile map data (terrain, costs, resources, exploration) held in NumPy arrays.
+
+    Layers either live in memory or are np.memmap views into one backing file
+    with a small JSON header, so huge worlds are paged in by the OS only where
+    they are read. Use TileLayers.create() for a new map and TileLayers.open()
+    to map an existing file without reading it. Every layer is a ChunkedLayer,
+    so snapshot() is cheap and only copies the chunks that are later written.
+    """
+    def __init__(self, width, height, arrays, exploration, terrain_names, resource_names, path=None):
+        self.width = width
+        self.height = height
+        self.arrays = arrays                  # {layer name: (height, width) ChunkedLayer}
+        self.exploration = exploration        # PlayerTileBitsets, one row per player
+        self.terrain_names = terrain_names    # Terrain code -> name
+        self.resource_names = resource_names  # Resource code -> name ('' for none)
+        self.path = path
+
+    def __getattr__(self, name):
+        # Expose layers as attributes, e.g. layers.terrain
+        arrays = self.__dict__.get('arrays')
+        if arrays is not None and name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    @staticmethod
+    def create(width, height, path=None, max_players=8):
+        """
+        Create zeroed layers in memory, or in a new file at path.
+
+        max_players exploration rows are reserved in a file and it can't hold
+        more; in memory it is only the starting capacity, grown on demand.
+        """
+        if path is None:
+            arrays = {name: ChunkedLayer(np.zeros((height, width), dtype=dtype)) for name, dtype in LAYER_SPECS}
+            bits = ChunkedLayer(np.zeros((max_players, (width * height + 7) // 8), dtype=np.uint8))
+            exploration = PlayerTileBitsets(width, height, bits=bits, growable=True)
+        else:
+            layout = TileLayers._layout(width, height, max_players)
+            with open(path, 'wb') as f:
+                f.truncate(layout['size'])  # Sparse on most file systems
+            arrays, bits = TileLayers._map_file(path, 'r+', width, height, layout)
+            exploration = PlayerTileBitsets(width, height, capacity=max_players, bits=bits)
+
+        layers = TileLayers(width, height, arrays, exploration, ['grass'], [''], path)
+        layers.movement_cost[:] = 1  # Default terrain is grass, costing one move
+        if path is not None:
+            layers.flush()
+        return layers
+
+    @staticmethod
+    def open(path, mode='r+'):
+        """Memory-map the layers stored in an existing map file"""
+        with open(path, 'rb') as f:
+            magic, header_length = struct.unpack('<8sI', f.read(12))
+            if magic != MAGIC:
+                raise ValueError(f"Not a map layer file: {path}")
+            header = json.loads(f.read(header_length).decode('utf-8'))
+
+        width, height = header['width'], header['height']
+        layout = header['layout']
+        arrays, bits = TileLayers._map_file(path, mode, width, height, layout)
+        exploration = PlayerTileBitsets(width, height, bits=bits)
+        for player_id in header['players']:
+            exploration.add_player(player_id)
+
+        return TileLayers(width, height, arrays, exploration,
+                          header['terrain_names'], header['resource_names'], path)
+
+    @staticmethod
+    def _layout(width, height, max_players):
+        """Compute page aligned offsets for every layer in a backing file"""
+        offsets = {}
+        offset = HEADER_SIZE
+        for name, dtype in LAYER_SPECS:
+            offsets[name] = offset
+            offset = _align(offset + width * height * np.dtype(dtype).itemsize)
+        row_bytes = (width * height + 7) // 8
+        offsets['exploration'] = offset
+        offset = _align(offset + max_players * row_bytes)
+        return {'offsets': offsets, 'max_players': max_players, 'size': offset}
+
+    @staticmethod
+    def _map_file(path, mode, width, height, layout):
+        """Create np.memmap views for every layer described by a layout"""
+        offsets = layout['offsets']
+        arrays = {
+            name: ChunkedLayer(np.memmap(path, dtype=dtype, mode=mode, offset=offsets[name], shape=(height, width)))
+            for name, dtype in LAYER_SPECS
+        }
+        row_bytes = (width * height + 7) // 8
+        bits = np.memmap(path, dtype=np.uint8, mode=mode, offset=offsets['exploration'],
+                         shape=(layout['max_players'], row_bytes))
+        return arrays, ChunkedLayer(bits)
+
+    def terrain_code(self, name):
+        """Return the code for a terrain name, registering new names"""
+        try:
+            return self.terrain_names.index(name)
+        except ValueError:
+            if len(self.terrain_names) >= 256:
+                raise ValueError("Too many terrain types for an 8-bit terrain layer")
+            self.terrain_names.append(name)
+            self.write_header()  # Codes already written to the layer must stay readable
+            return len(self.terrain_names) - 1
+
+    def resource_code(self, name):
+        """Return the code for a resource name, registering new names"""
+        try:
+            return self.resource_names.index(name)
+        except ValueError:
+            if len(self.resource_names) >= 256:
+                raise ValueError("Too many resource types for an 8-bit resource layer")
+            self.resource_names.append(name)
+            self.write_header()
+            return len(self.resource_names) - 1
+
+    def snapshot(self):
+        """Return in-memory copy-on-write layers sharing unchanged chunks with these"""
+        arrays = {name: array.snapshot() for name, array in self.arrays.items()}
+        return TileLayers(self.width, self.height, arrays, self.exploration.snapshot(),
+                          list(self.terrain_names), list(self.resource_names))
+
+    def _header(self, layout):
+        return {
+            'width': self.width,
+            'height': self.height,
+            'layout': layout,
+            'terrain_names': self.terrain_names,
+            'resource_names': self.resource_names,
+            'players': self.exploration.player_ids(),
+        }
+
+    def write_header(self):
+        """
+        Write the header of a file backed map. Called whenever a terrain or
+        resource name is registered, so the file's names always cover the
+        codes in its layers; layer pages still reach disk on flush().
+        """
+        if self.path is None:
+            return
+
+        layout = TileLayers._layout(self.width, self.height, self.exploration.capacity)
+        header = json.dumps(self._header(layout)).encode('utf-8')
+        if len(header) + 12 > HEADER_SIZE:
+            raise ValueError("Map layer header is too large")
+        with open(self.path, 'r+b') as f:
+            f.write(struct.pack('<8sI', MAGIC, len(header)))
+            f.write(header)
+
+    def flush(self):
+        """Write the header and any dirty pages of a file backed map to disk"""
+        if self.path is None:
+            return
+
+        self.write_header()
+        for array in self.arrays.values():
+            array.flush()
+        self.exploration.bits.flush()
+
+    def save(self, path):
+        """
+        Write the layers to a map file and return layers backed by that file.
+        Saving to the current backing file only flushes it.
+        """
+        if self.path is not None and os.path.abspath(path) == os.path.abspath(self.path):
+            self.flush()
+            return self
+
+        saved = TileLayers.create(self.width, self.height, path, max_players=self.exploration.capacity)
+        for name, array in self.arrays.items():
+            saved.arrays[name][:] = array
+        for player_id in self.exploration.player_ids():
+            saved.exploration.add_player(player_id)
+        saved.exploration.bits[:len(self.exploration.rows)] = self.exploration.bits[:len(self.exploration.rows)]
+        saved.terrain_names = list(self.terrain_names)
+        saved.resource_names = list(self.resource_names)
+        saved.flush()
+        return saved
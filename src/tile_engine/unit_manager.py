@@ -0,0 +1,76 @@
+from src.engine.spatial_index import SpatialIndex
+
+class UnitManager:
+    """
+    Tracks the units placed on the tile engine map.
+    Units are indexed by tile so per-tile, viewport and radius lookups don't scan every unit.
+    """
+    def __init__(self, game_map):
+        self.map = game_map
+        self.units = []
+        self.spatial_index = SpatialIndex()
+        self.version = 0  # Bumped whenever a unit is placed, moved or removed
+    
+    def add_unit(self, unit, x, y):
+        """Place a new unit on the tile at (x, y)"""
+        tile = self.map.get_tile(x, y)
+        if tile is None or not self.map.place_unit_on_tile(unit, tile):
+            return False
+        
+        unit.tile_position = (x, y)
+        self.units.append(unit)
+        self.spatial_index.insert(unit, (x, y), "unit")
+        self.version += 1
+        return True
+    
+    def move_unit(self, unit, x, y):
+        """Move a unit to the tile at (x, y), keeping tile slots and the index in sync"""
+        new_tile = self.map.get_tile(x, y)
+        if new_tile is None:
+            return False
+        
+        old_tile = self.map.get_tile(*unit.tile_position)
+        if not self.map.place_unit_on_tile(unit, new_tile):
+            return False  # Destination tile is full
+        if old_tile is not None:
+            self.map.remove_unit_from_tile(unit, old_tile)
+        
+        unit.tile_position = (x, y)
+        self.spatial_index.move(unit, (x, y))
+        self.version += 1
+        return True
+    
+    def remove_unit(self, unit):
+        """Remove a destroyed unit from the map"""
+        if unit not in self.spatial_index:
+            return False
+        
+        tile = self.map.get_tile(*unit.tile_position)
+        if tile is not None:
+            self.map.remove_unit_from_tile(unit, tile)
+        self.units.remove(unit)
+        self.spatial_index.remove(unit)
+        self.version += 1
+        return True
+    
+    def get_units_on_tile(self, tile):
+        """Return all units on a tile"""
+        if tile is None:
+            return []
+        return self.spatial_index.query_tile(tile.x, tile.y)
+    
+    def get_units_in_rect(self, min_x, min_y, max_x, max_y):
+        """Return all units inside an inclusive tile rectangle (e.g. the viewport)"""
+        return self.spatial_index.query_rect(min_x, min_y, max_x, max_y)
+    
+    def get_units_in_radius(self, position, radius):
+        """Return all units within a tile radius of a position"""
+        return self.spatial_index.query_radius(position, radius)
+    
+    def get_nearest_unit(self, position, predicate=None):
+        """Return the unit closest to a position, optionally filtered by predicate"""
+        return self.spatial_index.nearest("unit", position, predicate=predicate)
+    
+    def update(self):
+        """Update unit movement and animation each frame"""
+        pass
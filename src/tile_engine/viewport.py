@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 
 class Viewport:
     def __init__(self, screen_width, screen_height, map_width, map_height):
@@ -16,6 +17,12 @@ class Viewport:
         self.is_dragging = False
         self.drag_start = (0, 0)
         self.drag_current = (0, 0)
+        
+        # Visible tile range, recomputed only when the view moves or zooms
+        self.visible_key = None
+        self.visible_rect = None
+        self.visible_slices = None
+        self.visible_tiles = None
 
     def screen_to_world(self, screen_pos):
         """Convert screen coordinates to world coordinates"""
@@ -29,6 +36,40 @@ class Viewport:
         screen_y = (world_y - self.y) * self.zoom
         return screen_x, screen_y
     
+    def pixel_origin(self):
+        """
+        Get the viewport's top-left corner in whole pixels at the current zoom.
+        
+        Cached map layers are positioned against this offset, so a pan by
+        whole pixels moves every layer, and every strip drawn after it, by
+        exactly the same amount.
+        """
+        return round(self.x * self.zoom), round(self.y * self.zoom)
+    
+    def project(self, world_x, world_y, extent=0, rect=None):
+        """
+        Convert many world positions to screen coordinates in one call.
+        
+        Args:
+            world_x: Array of world x coordinates (top-left corners)
+            world_y: Array of world y coordinates
+            extent: World size of the square each position is the corner of,
+                    used to cull items entirely outside the screen
+            rect: Screen area to cull against instead of the whole screen
+        
+        Returns:
+            (screen_x, screen_y, visible) arrays; visible is a boolean mask
+        """
+        screen_x = (np.asarray(world_x, dtype=np.float64) - self.x) * self.zoom
+        screen_y = (np.asarray(world_y, dtype=np.float64) - self.y) * self.zoom
+        size = extent * self.zoom
+        left, top, right, bottom = 0, 0, self.screen_width, self.screen_height
+        if rect is not None:
+            left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        visible = ((screen_x + size > left) & (screen_x < right) &
+                   (screen_y + size > top) & (screen_y < bottom))
+        return screen_x, screen_y, visible
+    
     def start_drag(self, screen_pos):
         """Start dragging the viewport"""
         self.is_dragging = True
@@ -94,9 +135,11 @@ class Viewport:
         # For now, it's a stub that would be called by the main game loop
         pass
     
-    def get_visible_tiles(self):
-        """Get list of tile coordinates visible in the current viewport"""
-        visible_tiles = []
+    def get_visible_tile_rect(self):
+        """Get the (start_x, start_y, end_x, end_y) tile range visible in the viewport, end exclusive"""
+        key = (self.x, self.y, self.zoom, self.screen_width, self.screen_height)
+        if key == self.visible_key:
+            return self.visible_rect
         
         # Calculate tile range that could be visible
         start_tile_x = max(0, int(self.x / 256))
@@ -109,9 +152,27 @@ class Viewport:
         end_tile_x = min(start_tile_x + tiles_wide, self.map_width)
         end_tile_y = min(start_tile_y + tiles_high, self.map_height)
         
-        # Generate list of visible tile coordinates
-        for y in range(start_tile_y, end_tile_y):
-            for x in range(start_tile_x, end_tile_x):
-                visible_tiles.append((y, x))
-                
-        return visible_tiles
+        self.visible_key = key
+        self.visible_rect = (start_tile_x, start_tile_y, end_tile_x, end_tile_y)
+        self.visible_slices = (slice(start_tile_y, end_tile_y), slice(start_tile_x, end_tile_x))
+        self.visible_tiles = None
+        return self.visible_rect
+    
+    def get_visible_slices(self):
+        """
+        Get the visible tile range as (rows, columns) slices.
+        
+        Map arrays are indexed [y, x], so layers.terrain[viewport.get_visible_slices()]
+        is a view of the visible tiles without building any per-tile tuples.
+        """
+        self.get_visible_tile_rect()
+        return self.visible_slices
+    
+    def get_visible_tiles(self):
+        """Get list of (y, x) tile coordinates visible in the current viewport"""
+        start_tile_x, start_tile_y, end_tile_x, end_tile_y = self.get_visible_tile_rect()
+        if self.visible_tiles is None:
+            # Generate list of visible tile coordinates once per view
+            self.visible_tiles = [(y, x) for y in range(start_tile_y, end_tile_y)
+                                  for x in range(start_tile_x, end_tile_x)]
+        return self.visible_tiles
@@ -0,0 +1,178 @@
+import math
+import queue
+import threading
+import pygame
+from src.utils.logger import Logger
+
+# Discrete zoom levels surfaces are pre-scaled to; Viewport.zoom ranges 0.25 - 4.0
+ZOOM_LEVELS = (0.25, 0.5, 1.0, 2.0, 4.0)
+
+
+def nearest_level(zoom, levels=ZOOM_LEVELS):
+    """Return the level closest to zoom, measured in powers of two"""
+    return min(levels, key=lambda level: abs(math.log2(level) - math.log2(zoom)))
+
+
+class PyramidBuilder:
+    """
+    Runs surface scaling jobs on a single background thread.
+
+    Jobs are deduplicated by key and their results are handed back to the
+    main thread through collect(), so caches are only modified from there.
+    With background=False jobs run immediately, which keeps tests and
+    headless benchmarks deterministic.
+    """
+    def __init__(self, background=True):
+        self.background = background
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = set()  # Keys submitted but not yet collected
+        self.thread = None
+
+    def submit(self, key, build):
+        """Queue build() to produce the result for key, unless it is already queued"""
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        if not self.background:
+            self.results.put((key, self._run_job(build)))
+            return
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._worker, name="PyramidBuilder", daemon=True)
+            self.thread.start()
+        self.jobs.put((key, build))
+
+    def collect(self):
+        """Return [(key, result)] for every job finished since the last call"""
+        finished = []
+        while True:
+            try:
+                key, result = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+            self.pending.discard(key)
+            if result is not None:
+                finished.append((key, result))
+
+    def cancel(self, predicate=None):
+        """
+        Drop queued jobs that haven't started, all of them or those whose key
+        matches predicate. Jobs already running still hand back their result.
+
+        Returns:
+            Number of jobs dropped
+        """
+        kept = []
+        dropped = 0
+        while True:
+            try:
+                key, build = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if predicate is None or predicate(key):
+                self.pending.discard(key)
+                dropped += 1
+            else:
+                kept.append((key, build))
+            self.jobs.task_done()
+        for job in kept:
+            self.jobs.put(job)
+        return dropped
+
+    def wait(self):
+        """Block until every queued job has run"""
+        self.jobs.join()
+
+    def _worker(self):
+        while True:
+            key, build = self.jobs.get()
+            self.results.put((key, self._run_job(build)))
+            self.jobs.task_done()
+
+    def _run_job(self, build):
+        try:
+            return build()
+        except Exception as e:
+            Logger().error(f"Failed to build zoom level surface: {e}")
+            return None
+
+
+class SurfacePyramid:
+    """
+    Pre-scaled copies of sprite surfaces at every zoom level.
+
+    Sprites are registered at level 1.0. The first time a level is used, all
+    registered sprites are smoothscaled to it once, in the background; until
+    then get() serves the nearest level that is already built.
+    """
+    def __init__(self, builder=None, levels=ZOOM_LEVELS):
+        self.builder = builder if builder is not None else PyramidBuilder()
+        self.levels = levels
+        self.surfaces = {1.0: {}}  # {level: {key: Surface}}
+        self.revisions = {}        # {key: int}, bumped when a sprite is replaced
+        self.version = 0           # Bumped whenever a sprite is added or a scaled copy arrives
+
+    def add(self, key, surface):
+        """Register a sprite drawn at zoom 1.0, replacing its scaled copies"""
+        self.surfaces[1.0][key] = surface
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+        self.version += 1
+        for level, surfaces in self.surfaces.items():
+            if level != 1.0:
+                surfaces.pop(key, None)
+                self._request(level, [key])
+
+    def get(self, key, zoom):
+        """
+        Get a sprite for a zoom.
+
+        Returns:
+            (surface, level) where level is the zoom the surface was scaled for,
+            or (None, None) for an unknown key
+        """
+        self._install()
+        level = nearest_level(zoom, self.levels)
+        if level not in self.surfaces:
+            self.surfaces[level] = {}
+            self._request(level, list(self.surfaces[1.0]))
+
+        # Fall back to built levels, closest first, while a level is being built
+        for candidate in sorted(self.surfaces, key=lambda l: abs(math.log2(l) - math.log2(level))):
+            surface = self.surfaces[candidate].get(key)
+            if surface is not None:
+                return surface, candidate
+        return None, None
+
+    def _request(self, level, keys):
+        """Queue smoothscaling the given sprites to a level"""
+        if not keys:
+            return
+        base = [(key, self.revisions[key], self.surfaces[1.0][key]) for key in keys]
+
+        def build():
+            return [(key, revision, pygame.transform.smoothscale(
+                        surface, (max(1, round(surface.get_width() * level)),
+                                  max(1, round(surface.get_height() * level)))))
+                    for key, revision, surface in base]
+        self.builder.submit((level, tuple((key, revision) for key, revision, _ in base)), build)
+
+    def update(self):
+        """
+        Pick up finished background jobs.
+
+        Returns:
+            self.version, which changes when sprites drawn earlier may now be
+            served from a better level
+        """
+        self._install()
+        return self.version
+
+    def _install(self):
+        """Store finished background jobs, skipping sprites replaced since they were queued"""
+        for (level, _), scaled in self.builder.collect():
+            surfaces = self.surfaces.setdefault(level, {})
+            for key, revision, surface in scaled:
+                if self.revisions.get(key) == revision:
+                    surfaces[key] = surface
+                    self.version += 1
@@ -1,5 +1,6 @@
 import pygame
 from src.ui.ui_component import UIComponent
+from src.ui.text_cache import TextCache
 from src.utils.logger import Logger
 
 class Button(UIComponent):
@@ -23,8 +24,8 @@ class Button(UIComponent):
         self.border_radius = 10          # Rounded corners
         
     def initialize(self):
-        self.font = pygame.font.SysFont(None, self.font_size)
-        self.rendered_text = self.font.render(self.text, True, self.text_color)
+        self.font = TextCache().get_font(None, self.font_size)
+        self.rendered_text = TextCache().render(self.text, self.font_size, self.text_color)
     
     def set_text(self, new_text):
         """Set new button text and update the rendered text."""
@@ -32,7 +33,8 @@ class Button(UIComponent):
         if self.font is None:
             self.initialize()
         # Make sure to regenerate the rendered text with current text_color
-        self.rendered_text = self.font.render(self.text, True, self.text_color)
+        self.rendered_text = TextCache().render(self.text, self.font_size, self.text_color)
+        self.mark_dirty()
         
     def set_action(self, action):
         # debug
@@ -55,7 +57,8 @@ class Button(UIComponent):
                 self.text_color = self.default_text_color
             if self.font is None:
                 self.initialize()
-            self.rendered_text = self.font.render(self.text, True, self.text_color)
+            self.rendered_text = TextCache().render(self.text, self.font_size, self.text_color)
+            self.mark_dirty()
             return True
         return False
     
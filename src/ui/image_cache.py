@@ -0,0 +1,111 @@
+import os
+import threading
+import pygame
+from src.utils.logger import Logger
+
+# Screen art shared by the menus
+MENU_BACKDROP = os.path.join("assets", "images", "main_menu_backdrop.jpg")
+MENU_LOGO = os.path.join("assets", "images", "logo.png")
+
+class ImageCache:
+    """
+    Shared images for UI backdrops, logos and other screen art.
+
+    Each file is decoded once; scaled and converted variants are memoized
+    by (path, target size, convert mode), so screens that show the same
+    backdrop share one surface. Files can be decoded ahead of time on a
+    background thread with warm_up() while the game is starting.
+
+    Converting needs a display mode; images asked for in a convert mode
+    before one is set are converted the first time they are asked for again
+    after it.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ImageCache, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.originals = {}   # {path: decoded Surface}
+        self.images = {}      # {(path, size, convert): Surface}
+        self.unconverted = set()  # Keys of images cached before a display mode was set
+        self.lock = threading.Lock()  # Guards every dict above, filled from the warm-up thread too
+        self.warm_thread = None
+        self.decode_count = 0
+
+    def _decode(self, path):
+        """Decode a file once; errors propagate like pygame.image.load."""
+        with self.lock:
+            image = self.originals.get(path)
+            if image is None:
+                image = self.originals[path] = pygame.image.load(path)
+                self.decode_count += 1
+            return image
+
+    def load(self, path, size=None, convert=None):
+        """
+        Get an image, decoding and scaling it only the first time.
+
+        Args:
+            path: Image file path
+            size: (width, height) to scale to, or None for the original size
+            convert: None, 'opaque' for convert() or 'alpha' for convert_alpha();
+                     applied on the first call after a display mode is set
+
+        Returns:
+            Surface shared with every other caller; blit it, don't draw on it
+        """
+        key = (path, tuple(size) if size is not None else None, convert)
+        display = pygame.display.get_surface() is not None
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None and (key not in self.unconverted or not display):
+                return image
+
+        if image is None:
+            image = self._decode(path)
+            if size is not None and image.get_size() != key[1]:
+                image = pygame.transform.scale(image, key[1])
+        if convert and display:
+            image = image.convert_alpha() if convert == 'alpha' else image.convert()
+
+        with self.lock:
+            # Another thread may have stored this key meanwhile; share its surface
+            if key not in self.images or key in self.unconverted:
+                self.images[key] = image
+                if convert and not display:
+                    self.unconverted.add(key)
+                else:
+                    self.unconverted.discard(key)
+            return self.images[key]
+
+    def warm_up(self, paths, background=True):
+        """Decode files ahead of use, on a background thread by default."""
+        def decode_all():
+            for path in paths:
+                try:
+                    self._decode(path)
+                except (pygame.error, OSError) as e:
+                    Logger().warning(f"Failed to preload image {path}: {e}")
+
+        if not background:
+            decode_all()
+            return
+        self.warm_thread = threading.Thread(target=decode_all, daemon=True)
+        self.warm_thread.start()
+
+    def wait(self):
+        """Block until a background warm-up has finished."""
+        if self.warm_thread is not None:
+            self.warm_thread.join()
+            self.warm_thread = None
+
+    def clear(self):
+        """Drop every cached image."""
+        with self.lock:
+            self.originals.clear()
+            self.images.clear()
+            self.unconverted.clear()
@@ -1,8 +1,9 @@
 import pygame
-import os
 from datetime import datetime
 from src.ui.ui_component import UIComponent
 from src.ui.button import Button
+from src.ui.text_cache import TextCache
+from src.ui.image_cache import ImageCache, MENU_BACKDROP
 from src.engine.core_states import GameState
 from src.storage.game_storage_manager import GameStorageManager
 
@@ -27,9 +28,7 @@ class LoadGameScreen(UIComponent):
         
         # Load background
         try:
-            bg_path = os.path.join("assets", "images", "main_menu_backdrop.jpg")
-            self.background = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(self.background, screen_size)
+            self.background = ImageCache().load(MENU_BACKDROP, screen_size, 'opaque')
         except pygame.error as e:
             print(f"Error loading menu assets: {e}")
             # Fallback color if images can't be loaded
@@ -37,9 +36,9 @@ class LoadGameScreen(UIComponent):
             self.background.fill((0, 0, 60))  # Dark blue for load game screen
         
         # Initialize fonts
-        self.font = pygame.font.SysFont(None, 32)
-        self.title_font = pygame.font.SysFont(None, 48)
-        self.title_text = self.title_font.render("Load Game", True, (255, 255, 255))
+        self.font = TextCache().get_font(None, 32)
+        self.title_font = TextCache().get_font(None, 48)
+        self.title_text = TextCache().render("Load Game", 48, (255, 255, 255))
         
         # Create game list rectangle (area where saved games will be displayed)
         list_width = 500
@@ -113,16 +112,19 @@ class LoadGameScreen(UIComponent):
         """Refresh the list of saved games from the storage manager"""
         self.saved_games = self.storage_manager.get_all_game_names()
         self.selected_game = None
+        self.mark_dirty()
         
     def scroll_up(self):
         """Scroll up in the games list"""
         if self.scroll_offset > 0:
             self.scroll_offset -= 1
+            self.mark_dirty(self.list_rect)
             
     def scroll_down(self):
         """Scroll down in the games list"""
         if len(self.saved_games) > self.max_visible_games and self.scroll_offset < len(self.saved_games) - self.max_visible_games:
             self.scroll_offset += 1
+            self.mark_dirty(self.list_rect)
             
     def load_selected_game(self):
         """Load the selected game"""
@@ -173,6 +175,8 @@ class LoadGameScreen(UIComponent):
         
         if 0 <= clicked_index < len(self.saved_games):
             self.selected_game = self.saved_games[clicked_index]
+            # Selection changes the list highlight and the load/delete buttons
+            self.mark_dirty()
     
     def render(self, screen):
         if not self.visible:
@@ -194,7 +198,7 @@ class LoadGameScreen(UIComponent):
         # Draw saved games
         if not self.saved_games:
             # Show "No saved games" message
-            no_games_text = self.font.render("No saved games found", True, (200, 200, 200))
+            no_games_text = TextCache().render("No saved games found", 32, (200, 200, 200))
             text_x = self.list_rect.centerx - (no_games_text.get_width() // 2)
             text_y = self.list_rect.centery - (no_games_text.get_height() // 2)
             screen.blit(no_games_text, (text_x, text_y))
@@ -212,7 +216,7 @@ class LoadGameScreen(UIComponent):
                     pygame.draw.rect(screen, (70, 70, 100), game_rect)  # Highlight color
                 
                 # Draw game name
-                name_text = self.font.render(game['name'], True, (255, 255, 255))
+                name_text = TextCache().render(game['name'], 32, (255, 255, 255))
                 screen.blit(name_text, (game_rect.left + 10, game_rect.top + 5))
                 
                 # Draw last saved date
@@ -221,7 +225,7 @@ class LoadGameScreen(UIComponent):
                 except:
                     date_str = game['last_saved_at']
                     
-                date_text = pygame.font.SysFont(None, 24).render(f"Last saved: {date_str}", True, (200, 200, 200))
+                date_text = TextCache().render(f"Last saved: {date_str}", 24, (200, 200, 200))
                 screen.blit(date_text, (game_rect.left + 10, game_rect.top + 30))
                 
                 # Draw separator line
@@ -1,7 +1,7 @@
 import pygame
-import os
 from src.ui.ui_component import UIComponent
 from src.ui.button import Button
+from src.ui.image_cache import ImageCache, MENU_BACKDROP, MENU_LOGO
 from src.engine.core_states import GameState
 
 class MainMenu(UIComponent):
@@ -17,17 +17,14 @@ class MainMenu(UIComponent):
         
         # Load background and logo
         try:
-            bg_path = os.path.join("assets", "images", "main_menu_backdrop.jpg")
-            self.background = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(self.background, screen_size)
+            self.background = ImageCache().load(MENU_BACKDROP, screen_size, 'opaque')
             
-            logo_path = os.path.join("assets", "images", "logo.png")
-            self.logo = pygame.image.load(logo_path)
+            logo = ImageCache().load(MENU_LOGO)
             # Keep logo aspect ratio while scaling to reasonable size
-            logo_width = min(screen_size[0] * 0.7, self.logo.get_width())
-            logo_scale = logo_width / self.logo.get_width()
-            logo_height = self.logo.get_height() * logo_scale
-            self.logo = pygame.transform.scale(self.logo, (int(logo_width), int(logo_height)))
+            logo_width = min(screen_size[0] * 0.7, logo.get_width())
+            logo_scale = logo_width / logo.get_width()
+            logo_height = logo.get_height() * logo_scale
+            self.logo = ImageCache().load(MENU_LOGO, (int(logo_width), int(logo_height)), 'alpha')
         except pygame.error as e:
             print(f"Error loading menu assets: {e}")
             # Fallback color if images can't be loaded
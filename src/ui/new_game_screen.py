@@ -1,7 +1,8 @@
 import pygame
-import os
 from src.ui.ui_component import UIComponent
 from src.ui.button import Button
+from src.ui.text_cache import TextCache
+from src.ui.image_cache import ImageCache, MENU_BACKDROP
 from src.engine.core_states import GameState
 
 class NewGameScreen(UIComponent):
@@ -25,9 +26,7 @@ class NewGameScreen(UIComponent):
         
         # Load background
         try:
-            bg_path = os.path.join("assets", "images", "main_menu_backdrop.jpg")
-            self.background = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(self.background, screen_size)
+            self.background = ImageCache().load(MENU_BACKDROP, screen_size, 'opaque')
         except pygame.error as e:
             print(f"Error loading menu assets: {e}")
             # Fallback color if images can't be loaded
@@ -35,9 +34,9 @@ class NewGameScreen(UIComponent):
             self.background.fill((0, 0, 80))  # Darker blue for new game screen
         
         # Initialize fonts
-        self.font = pygame.font.SysFont(None, 32)
-        self.title_font = pygame.font.SysFont(None, 48)
-        self.title_text = self.title_font.render("Create New Game", True, (255, 255, 255))
+        self.font = TextCache().get_font(None, 32)
+        self.title_font = TextCache().get_font(None, 48)
+        self.title_text = TextCache().render("Create New Game", 48, (255, 255, 255))
         
         # Create input rectangle
         input_width = 300
@@ -94,10 +93,13 @@ class NewGameScreen(UIComponent):
             
     def handle_click(self, pos):
         # Check if user clicked on input box
+        was_active = self.active_input
         if self.input_rect.collidepoint(pos):
             self.active_input = True
         else:
             self.active_input = False
+        if self.active_input != was_active:
+            self.mark_dirty(self.input_rect)
             
         # Check if user clicked on buttons
         for button in self.buttons:
@@ -120,6 +122,7 @@ class NewGameScreen(UIComponent):
             if len(self.game_name) < 20:
                 self.game_name += event.unicode
         
+        self.mark_dirty(self.input_rect)
         return True
         
     def update(self, delta_time):
@@ -128,6 +131,8 @@ class NewGameScreen(UIComponent):
         if self.cursor_timer > 0.5:  # Toggle every 0.5 seconds
             self.cursor_visible = not self.cursor_visible
             self.cursor_timer = 0
+            if self.active_input:
+                self.mark_dirty(self.input_rect)
         
     def render(self, screen):
         if not self.visible:
@@ -143,7 +148,7 @@ class NewGameScreen(UIComponent):
         screen.blit(self.title_text, (title_x, title_y))
         
         # Draw name entry prompt
-        prompt_text = self.font.render("Enter a name for your new game:", True, (255, 255, 255))
+        prompt_text = TextCache().render("Enter a name for your new game:", 32, (255, 255, 255))
         prompt_x = (self.size[0] - prompt_text.get_width()) // 2
         prompt_y = self.input_rect.top - 40
         screen.blit(prompt_text, (prompt_x, prompt_y))
@@ -154,7 +159,7 @@ class NewGameScreen(UIComponent):
         pygame.draw.rect(screen, box_color, self.input_rect, 2)  # Draw outline
         
         # Render current text with black color
-        text_surface = self.font.render(self.game_name, True, (0, 0, 0))  # Black text
+        text_surface = TextCache().render(self.game_name, 32, (0, 0, 0))  # Black text
         
         # Ensure text fits in the input box
         text_width = text_surface.get_width()
@@ -1,6 +1,7 @@
 import pygame
 from .ui_component import UIComponent
 from .button import Button
+from .text_cache import TextCache
 from src.utils.logger import Logger
 import time  # Add this import for time.sleep
 
@@ -79,15 +80,13 @@ class OptionsMenuScreen:
         screen_width, screen_height = screen.get_size()
         
         # Create UI components
-        title_font = pygame.font.Font(None, 48)
-        self.title = title_font.render("Options", True, (255, 255, 255))
+        self.title = TextCache().render("Options", 48, (255, 255, 255))
         self.title_rect = self.title.get_rect(center=(screen_width // 2, 50))
         
         # Volume sliders
-        label_font = pygame.font.Font(None, 24)
-        self.master_label = label_font.render("Master Volume", True, (255, 255, 255))
-        self.music_label = label_font.render("Music Volume", True, (255, 255, 255))
-        self.sound_label = label_font.render("Sound Effects Volume", True, (255, 255, 255))
+        self.master_label = TextCache().render("Master Volume", 24, (255, 255, 255))
+        self.music_label = TextCache().render("Music Volume", 24, (255, 255, 255))
+        self.sound_label = TextCache().render("Sound Effects Volume", 24, (255, 255, 255))
         
         slider_width = 300
         slider_height = 30
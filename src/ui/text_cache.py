@@ -0,0 +1,71 @@
+import collections
+import pygame
+
+class TextCache:
+    """
+    Shared fonts and rendered text surfaces for the UI.
+
+    Fonts are created once per (name, size) instead of on every SysFont call,
+    and rendered strings are kept in an LRU cache keyed by
+    (font, text, colour, antialias), so static labels and hover states are
+    rendered once and then blitted.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TextCache, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self, max_surfaces=512):
+        self.max_surfaces = max_surfaces
+        self.fonts = {}                              # {(name, size): Font}
+        self.surfaces = collections.OrderedDict()    # {(name, size, text, colour, antialias): Surface}
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, name=None, size=32):
+        """Get the shared font for a system font name (None for the default font) and size."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def render(self, text, size=32, color=(255, 255, 255), name=None, antialias=True):
+        """
+        Get a rendered text surface, rendering it only on a cache miss.
+
+        Args:
+            text: String to render
+            size: Font size
+            color: Text colour
+            name: System font name, None for the default font
+            antialias: Whether to antialias the text
+
+        Returns:
+            Surface shared with every other caller; blit it, don't draw on it
+        """
+        key = (name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(name, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached font and surface, e.g. after pygame.quit()."""
+        self.fonts.clear()
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,3 +1,5 @@
+import pygame
+
 class UIComponent:
     def __init__(self, id, component_type, position, size):
         self.id = id
@@ -5,8 +7,18 @@ class UIComponent:
         self.position = position
         self.size = size
         self.visible = True
+        self.dirty_rects = [pygame.Rect(position, size)]  # Screen areas changed since the last frame
+
+    def mark_dirty(self, rect=None):
+        """Record that part of the component (all of it by default) needs to be presented again."""
+        self.dirty_rects.append(pygame.Rect(rect) if rect is not None else pygame.Rect(self.position, self.size))
+
+    def take_dirty_rects(self):
+        """Return and clear the rectangles changed since the last call."""
+        rects, self.dirty_rects = self.dirty_rects, []
+        return rects
 
     # Consider adding a base render method for consistency
     def render(self, screen):
         """Base render method to be overridden by subclasses."""
-        pass
\ No newline at end of file
+        pass
@@ -11,6 +11,7 @@ class UIManager:
         self.game_engine = game_engine
         self.screen_size = (0, 0)
         self.last_update_time = pygame.time.get_ticks()
+        self.presented_state = None  # Game state of the last frame collected for presenting
 
     def initialize(self, game_engine, screen_size):
         self.game_engine = game_engine
@@ -80,12 +81,36 @@ class UIManager:
         if self.game_engine.game_state == GameState.NEW_GAME and 'new_game_screen' in self.components:
             self.components['new_game_screen'].update(delta_time)
         
+    def get_active_component(self):
+        """Return the screen component for the current game state, if any."""
+        screens = {
+            GameState.MAIN_MENU: 'main_menu',
+            GameState.NEW_GAME: 'new_game_screen',
+            GameState.LOAD_GAME: 'load_game_screen',
+            GameState.OPTIONS_MENU: None,  # Drawn by the engine's OptionsMenuScreen, not a component
+        }
+        return self.components.get(screens.get(self.game_engine.game_state))
+    
+    def collect_dirty_rects(self):
+        """
+        Return the screen rectangles that changed since the last call.
+        Switching to another game state invalidates the whole screen.
+        """
+        component = self.get_active_component()
+        rects = []
+        if component:
+            rects.extend(component.take_dirty_rects())
+            for button in getattr(component, 'buttons', []):
+                rects.extend(button.take_dirty_rects())
+        
+        if self.game_engine.game_state != self.presented_state:
+            self.presented_state = self.game_engine.game_state
+            return [pygame.Rect((0, 0), self.screen_size)]
+        return rects
+        
     def render(self, screen):
         # Render appropriate UI components based on game state
-        if self.game_engine.game_state == GameState.MAIN_MENU and 'main_menu' in self.components:
-            self.components['main_menu'].render(screen)
-        elif self.game_engine.game_state == GameState.NEW_GAME and 'new_game_screen' in self.components:
-            self.components['new_game_screen'].render(screen)
-        elif self.game_engine.game_state == GameState.LOAD_GAME and 'load_game_screen' in self.components:
-            self.components['load_game_screen'].render(screen)
+        component = self.get_active_component()
+        if component:
+            component.render(screen)
         # Other UI rendering for different game states will be added here
\ No newline at end of file
@@ -1,3 +1,5 @@
+from src.engine.core_states import UnitState
+
 class Unit:
     def __init__(self, id, unit_type, position):
         self.id = id
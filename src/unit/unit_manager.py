@@ -1,11 +1,40 @@
 from src.unit.unit_serializer import UnitSerializer
+from src.engine.spatial_index import SpatialIndex
 
 class UnitManager:
-    def __init__(self):
+    def __init__(self, spatial_index=None):
         self.units = {}  # {unit_id: Unit}
+        # Spatial index shared with other managers (e.g. cities) when one is passed in
+        self.spatial_index = spatial_index if spatial_index is not None else SpatialIndex()
 
     def add_unit(self, unit):
         self.units[unit.id] = unit
+        self.spatial_index.insert(unit, unit.position, "unit")
+
+    def move_unit(self, unit_id, position):
+        """Move a unit to a new (x, y) position and keep the spatial index in sync"""
+        unit = self.units.get(unit_id)
+        if unit is None:
+            return False
+        unit.position = position
+        self.spatial_index.move(unit, position)
+        return True
+
+    def remove_unit(self, unit_id):
+        """Remove a destroyed or disbanded unit"""
+        unit = self.units.pop(unit_id, None)
+        if unit is None:
+            return False
+        self.spatial_index.remove(unit)
+        return True
+
+    def get_units_at(self, x, y):
+        """Return all units on the tile at (x, y)"""
+        return self.spatial_index.query_tile(x, y, "unit")
+
+    def get_units_in_radius(self, position, radius):
+        """Return all units within a tile radius of a position"""
+        return self.spatial_index.query_radius(position, radius, "unit")
 
     def update_units(self):
         # Update unit behaviors, check movement and combat states, etc.
@@ -0,0 +1,67 @@
+import unittest
+import glob
+import json
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.autotile import BLOB_TABLE, VARIANT_MASKS, VARIANT_NAMES, N, S, E, W, NE, variant_ids
+from src.tile_engine.map import GameMap
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'tiles'))
+
+
+class TestAutotile(unittest.TestCase):
+    def test_table_has_47_variants(self):
+        """Test every 8-bit mask resolves to one of the 47 blob variants."""
+        self.assertEqual(len(VARIANT_MASKS), 47)
+        self.assertEqual(len(BLOB_TABLE), 256)
+        self.assertEqual(set(BLOB_TABLE.tolist()), set(range(47)))
+
+        # Corners without both adjacent edges do not change the variant
+        self.assertEqual(BLOB_TABLE[N | NE], BLOB_TABLE[N])
+        self.assertNotEqual(BLOB_TABLE[N | E | NE], BLOB_TABLE[N | E])
+
+    def test_names_match_tile_data(self):
+        """Test variant names line up with the variants defined for each terrain."""
+        for path in glob.glob(os.path.join(DATA_DIR, '*.json')):
+            with open(path) as f:
+                names = set(json.load(f)['variants'])
+            self.assertEqual(set(VARIANT_NAMES), names, path)
+
+        self.assertEqual(VARIANT_NAMES[BLOB_TABLE[0xFF]], "fully_surrounded")
+        self.assertEqual(VARIANT_NAMES[BLOB_TABLE[0]], "isolated")
+        self.assertEqual(VARIANT_NAMES[BLOB_TABLE[S | E | W]], "horizontal_edge_top")
+        self.assertEqual(VARIANT_NAMES[BLOB_TABLE[S | E]], "outer_corner_top_left")
+
+    def test_vectorized_matches_bitmask(self):
+        """Test resolving a whole map agrees with the per tile bitmask."""
+        rng = np.random.default_rng(3)
+        names = ['grass', 'water', 'forest']
+        game_map = GameMap(20, 15)
+        game_map.generate_map([[names[i] for i in row] for row in rng.integers(0, 3, (15, 20))])
+
+        ids = variant_ids(game_map.layers.terrain)
+        for y in range(15):
+            for x in range(20):
+                bitmask = game_map.get_tile_bitmask(x, y, game_map.get_terrain(x, y))
+                self.assertEqual(VARIANT_NAMES[ids[y, x]], game_map.lookup_tile_variant(bitmask))
+                self.assertEqual(game_map.get_tile_variant(x, y), game_map.lookup_tile_variant(bitmask))
+
+    def test_cache_refreshes_neighbours(self):
+        """Test changing terrain updates the cached variants around the tile."""
+        game_map = GameMap(10, 10)
+        np.testing.assert_array_equal(game_map.get_variant_ids(0, 0, 10, 10), variant_ids(game_map.layers.terrain))
+
+        game_map.set_terrain(5, 5, 'water')
+        np.testing.assert_array_equal(game_map.get_variant_ids(0, 0, 10, 10), variant_ids(game_map.layers.terrain))
+        self.assertEqual(game_map.get_tile_variant(5, 5), "isolated")
+        self.assertEqual(game_map.get_tile_variant(5, 4), "horizontal_edge_bottom")
+        self.assertEqual(game_map.get_tile_variant(4, 4), "inner_corner_bottom_right")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import pygame
+import json
+import shutil
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.build_tile_atlas import MaxRectsPacker, build_tile_atlas, MANIFEST_NAME
+from src.tile_engine.tile_atlas import TileAtlas
+
+
+class TestMaxRectsPacker(unittest.TestCase):
+    def test_rects_do_not_overlap(self):
+        """Test mixed sizes are packed inside the sheet without overlapping."""
+        packer = MaxRectsPacker(256, 256)
+        placed = [packer.insert(w, h) for w, h in [(128, 128), (64, 128), (128, 64), (64, 64), (64, 64), (192, 128)]]
+
+        self.assertNotIn(None, placed)
+        for i, rect in enumerate(placed):
+            self.assertTrue(pygame.Rect(0, 0, 256, 256).contains(rect))
+            for other in placed[i + 1:]:
+                self.assertFalse(rect.colliderect(other))
+
+    def test_full_sheet_rejects(self):
+        """Test an image that no longer fits is rejected."""
+        packer = MaxRectsPacker(128, 128)
+        self.assertIsNotNone(packer.insert(128, 64))
+        self.assertIsNotNone(packer.insert(128, 64))
+        self.assertIsNone(packer.insert(1, 1))
+
+
+class TestBuildTileAtlas(unittest.TestCase):
+    def setUp(self):
+        """Create a project tree with two terrains and one missing variant."""
+        self.root = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.root, "assets", "atlas")
+        os.makedirs(os.path.join(self.root, "data", "tiles"))
+        os.makedirs(os.path.join(self.root, "assets", "tiles"))
+        self.write_image("assets/tiles/grass.png", (0, 200, 0))
+        self.write_image("assets/tiles/grass_edge.png", (0, 100, 0), (64, 32))
+        self.write_image("assets/tiles/desert.png", (230, 210, 120))
+        self.write_manifest("grassland", "assets/tiles/grass.png",
+                            {"horizontal_edge_top": "assets/tiles/grass_edge.png",
+                             "isolated": "assets/tiles/missing.png"})
+        self.write_manifest("desert", "assets/tiles/desert.png", {})
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_image(self, path, color, size=(64, 64)):
+        image = pygame.Surface(size)
+        image.fill(color)
+        pygame.image.save(image, os.path.join(self.root, path))
+
+    def write_manifest(self, name, base, variants):
+        with open(os.path.join(self.root, "data", "tiles", f"{name}.json"), 'w') as f:
+            json.dump({"name": name, "base_image": base, "variants": variants}, f)
+
+    def read_manifest(self):
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+
+    def test_build_writes_sheets_and_manifest(self):
+        """Test existing images are packed into one sheet and listed by path."""
+        self.assertEqual(build_tile_atlas(self.root, sheet_size=256), 3)
+        manifest = self.read_manifest()
+
+        self.assertEqual(manifest['sheets'], ["tiles_0.png"])
+        self.assertEqual(sorted(manifest['images']),
+                         ["assets/tiles/desert.png", "assets/tiles/grass.png", "assets/tiles/grass_edge.png"])
+        sheet = pygame.image.load(os.path.join(self.output_dir, "tiles_0.png"))
+        index, x, y, w, h = manifest['images']["assets/tiles/grass_edge.png"]
+        self.assertEqual((w, h), (64, 32))
+        self.assertEqual(tuple(sheet.get_at((x, y)))[:3], (0, 100, 0))
+
+    def test_unchanged_inputs_are_skipped(self):
+        """Test a rebuild only redraws images whose content changed."""
+        build_tile_atlas(self.root, sheet_size=256)
+        self.assertEqual(build_tile_atlas(self.root, sheet_size=256), 0)
+
+        self.write_image("assets/tiles/desert.png", (200, 50, 50))
+        layout = self.read_manifest()['images']
+        self.assertEqual(build_tile_atlas(self.root, sheet_size=256), 1)
+        self.assertEqual(self.read_manifest()['images'], layout)
+
+        sheet = pygame.image.load(os.path.join(self.output_dir, "tiles_0.png"))
+        _, x, y, _, _ = layout["assets/tiles/desert.png"]
+        self.assertEqual(tuple(sheet.get_at((x, y)))[:3], (200, 50, 50))
+
+    def test_small_sheets_overflow(self):
+        """Test images that don't fit one sheet spill onto another."""
+        build_tile_atlas(self.root, sheet_size=64)
+        self.assertEqual(len(self.read_manifest()['sheets']), 3)
+
+    def test_tile_atlas_uses_prebuilt_sheets(self):
+        """Test the runtime atlas serves terrains straight from the built sheets."""
+        build_tile_atlas(self.root, sheet_size=256)
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            atlas = TileAtlas()
+            surface = atlas.get_surface('grass', 'isolated')
+            self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (0, 200, 0))
+            self.assertEqual(atlas.pages['grassland'], [])
+            self.assertEqual(len(atlas.sheets), 1)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
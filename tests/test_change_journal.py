@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.change_journal import ChangeJournal
+from src.tile_engine.map import GameMap
+
+
+class MockUnit:
+    """Minimal unit that can be slotted onto a tile."""
+    pass
+
+
+class TestChangeJournal(unittest.TestCase):
+    def setUp(self):
+        """Create a map spanning several 16x16 chunks."""
+        self.game_map = GameMap(40, 20)
+        self.journal = self.game_map.journal
+
+    def test_mutations_are_recorded(self):
+        """Test that map setters leave a trace in the journal."""
+        subscription = self.journal.subscribe()
+        self.game_map.set_terrain(3, 4, 'water')
+        self.game_map.add_resource(35, 18, 'gold', 2)
+        self.game_map.place_unit_on_tile(MockUnit(), self.game_map.get_tile(3, 4))
+
+        changes = subscription.poll()
+        self.assertFalse(changes.full)
+        # New terrain also changes the autotile variant of the eight neighbours
+        neighbourhood = [(x, y) for y in (3, 4, 5) for x in (2, 3, 4)]
+        self.assertEqual(changes.tiles.tolist(), [y * 40 + x for x, y in neighbourhood] + [18 * 40 + 35])
+        xs, ys = changes.tile_coords()
+        self.assertEqual(list(zip(xs.tolist(), ys.tolist())), neighbourhood + [(35, 18)])
+        self.assertEqual(changes.chunks.tolist(), [0, 5])
+
+        # Nothing new since the last poll
+        self.assertFalse(subscription.poll())
+
+    def test_chunk_versions_are_monotonic(self):
+        """Test per-chunk versions only ever increase and track the latest batch."""
+        self.game_map.set_terrain(0, 0, 'forest')
+        first = self.journal.commit()
+        self.game_map.set_terrain(20, 0, 'forest')
+        second = self.journal.commit()
+
+        self.assertGreater(second, first)
+        self.assertEqual(self.journal.chunk_version(0, 0), first)
+        self.assertEqual(self.journal.chunk_version(1, 0), second)
+        self.assertEqual(self.journal.chunk_version(2, 1), 0)
+
+        # Committing without changes keeps the version
+        self.assertEqual(self.journal.commit(), second)
+
+    def test_changes_since_merges_batches(self):
+        """Test pulling across several batches returns the union of their tiles."""
+        start = self.journal.version
+        for x in (1, 2, 1):
+            self.game_map.set_terrain(x, 1, 'desert')
+            self.journal.commit()
+
+        changes = self.journal.changes_since(start)
+        # Rows 0-2, columns 0-3: the two tiles plus neighbours whose variant changed
+        self.assertEqual(changes.tiles.tolist(), [y * 40 + x for y in range(3) for x in range(4)])
+        self.assertEqual(changes.version, self.journal.version)
+
+    def test_truncated_history_reports_full_rebuild(self):
+        """Test consumers that fall too far behind are told to rebuild."""
+        journal = ChangeJournal(8, 8, chunk_size=4, max_batches=2)
+        for x in range(4):
+            journal.mark(x, 0)
+            journal.commit()
+
+        self.assertTrue(journal.changes_since(0).full)
+        self.assertFalse(journal.changes_since(2).full)
+
+        journal.mark_all()
+        changes = journal.changes_since(journal.version)
+        self.assertTrue(changes.full)
+        np.testing.assert_array_equal(changes.chunks, np.arange(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.chunk_cache import TerrainChunkCache, TERRAIN_COLORS, RESOURCE_COLOR
+from src.tile_engine.map import GameMap
+from src.tile_engine.viewport import Viewport
+from src.tile_engine.zoom_pyramid import PyramidBuilder
+
+
+class MockUnit:
+    """Minimal unit that can be slotted onto a tile."""
+    pass
+
+
+class HeldBuilder(PyramidBuilder):
+    """Synchronous builder that hands back nothing until released."""
+    def __init__(self):
+        super().__init__(background=False)
+        self.held = True
+
+    def collect(self):
+        return [] if self.held else super().collect()
+
+
+class TestTerrainChunkCache(unittest.TestCase):
+    def setUp(self):
+        """Create a 32x32 map (4x4 chunks) and a cache building levels synchronously."""
+        self.game_map = GameMap(32, 32)
+        self.game_map.journal.commit()
+        self.cache = TerrainChunkCache(self.game_map, builder=PyramidBuilder(background=False))
+
+    def test_chunk_is_rasterized_once(self):
+        """Test an unchanged chunk is served from the cache."""
+        first, level = self.cache.get_chunk(1, 2, 0.25)
+        self.assertEqual((first.get_size(), level), ((512, 512), 0.25))
+        self.assertIs(self.cache.get_chunk(1, 2, 0.25)[0], first)
+        self.assertEqual(self.cache.rasterized_count, 1)
+        self.assertEqual(tuple(first.get_at((0, 0)))[:3], TERRAIN_COLORS['grass'])
+
+    def test_dirty_chunk_is_rebuilt(self):
+        """Test only chunks reported dirty by the journal are rasterized again."""
+        untouched, _ = self.cache.get_chunk(0, 0, 0.25)
+        stale, _ = self.cache.get_chunk(2, 0, 0.25)
+
+        self.game_map.add_resource(17, 2, 'gold', 1)
+        self.game_map.journal.commit()
+        self.cache.begin_frame()
+
+        self.assertIs(self.cache.get_chunk(0, 0, 0.25)[0], untouched)
+        rebuilt, _ = self.cache.get_chunk(2, 0, 0.25)
+        self.assertIsNot(rebuilt, stale)
+        self.assertEqual(tuple(rebuilt.get_at((1 * 64 + 32, 2 * 64 + 32)))[:3], RESOURCE_COLOR)
+
+    def test_unit_moves_keep_chunks(self):
+        """Test journal marks from unit placement don't drop terrain chunks."""
+        chunk, _ = self.cache.get_chunk(0, 0, 0.25)
+        self.game_map.place_unit_on_tile(MockUnit(), self.game_map.get_tile(1, 1))
+        self.game_map.journal.commit()
+        self.cache.begin_frame()
+
+        self.assertIs(self.cache.get_chunk(0, 0, 0.25)[0], chunk)
+        self.assertEqual(self.cache.rasterized_count, 1)
+
+    def test_budget_evicts_off_screen_chunks(self):
+        """Test the least recently drawn chunks are evicted to stay within budget."""
+        self.cache.budget_bytes = 3 * 512 * 512 * pygame.Surface((1, 1)).get_bytesize()
+        for cx in range(4):
+            self.cache.begin_frame()
+            self.cache.get_chunk(cx, 0, 0.25)
+
+        self.assertEqual([key[0] for key in self.cache.chunks], [1, 2, 3])
+        self.assertLessEqual(self.cache.used_bytes, self.cache.budget_bytes)
+
+        # Chunks drawn this frame are kept even when over budget
+        self.cache.budget_bytes = 0
+        self.cache.get_chunk(0, 1, 0.25)
+        self.assertEqual(list(self.cache.chunks), [(3, 0, 0.25), (0, 1, 0.25)])
+        self.cache.begin_frame()
+        self.cache.get_chunk(0, 1, 0.25)
+        self.assertEqual(list(self.cache.chunks), [(0, 1, 0.25)])
+
+    def test_new_level_is_built_in_background(self):
+        """Test a chunk at a new level is served from the nearest level until built."""
+        self.cache.get_chunk(0, 0, 0.25)
+        surface, level = self.cache.get_chunk(0, 0, 0.5)
+        self.assertEqual((surface.get_width(), level), (512, 0.25))
+
+        self.cache.begin_frame()
+        surface, level = self.cache.get_chunk(0, 0, 0.5)
+        self.assertEqual((surface.get_width(), level), (1024, 0.5))
+
+    def test_stale_background_build_is_discarded(self):
+        """Test a level built before a map change is not installed."""
+        self.cache.get_chunk(0, 0, 0.25)
+        self.cache.get_chunk(0, 0, 0.5)
+        self.game_map.set_terrain(0, 0, 'water')
+        self.game_map.journal.commit()
+        self.cache.begin_frame()
+        self.assertEqual(list(self.cache.chunks), [])
+
+    def test_late_build_invalidates_view(self):
+        """Test a build finishing on a frame the terrain isn't redrawn still bumps collected_count."""
+        builder = HeldBuilder()
+        cache = TerrainChunkCache(self.game_map, builder=builder)
+        viewport = Viewport(800, 600, 32, 32)
+        screen = pygame.Surface((800, 600))
+        viewport.zoom = 0.25
+        cache.render(screen, viewport)
+        viewport.zoom = 0.5
+        cache.render(screen, viewport)        # Drawn from the 0.25 chunks, 0.5 queued
+
+        # Frames where only the layer source is checked and nothing is redrawn
+        cache.begin_frame()
+        cache.begin_frame()
+        collected = cache.collected_count
+
+        builder.held = False
+        cache.begin_frame()
+        self.assertGreater(cache.collected_count, collected)
+
+    def test_render_blits_visible_chunks(self):
+        """Test rendering draws only the chunks overlapping the viewport."""
+        viewport = Viewport(600, 600, 32, 32)
+        viewport.zoom = 0.25
+        viewport.x = viewport.y = 1024
+        screen = pygame.Surface((600, 600))
+        self.cache.render(screen, viewport)
+
+        self.assertEqual(sorted(key[:2] for key in self.cache.frame_keys), [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertEqual(tuple(screen.get_at((599, 599)))[:3], TERRAIN_COLORS['grass'])
+
+    def test_render_between_levels_uses_nearest_level(self):
+        """Test a zoom between levels draws from the nearest level."""
+        self.game_map.set_terrain(1, 0, 'water')
+        self.game_map.journal.commit()
+        viewport = Viewport(300, 300, 32, 32)
+        viewport.zoom = 0.3
+        screen = pygame.Surface((300, 300))
+        self.cache.render(screen, viewport)
+
+        self.assertEqual({key[2] for key in self.cache.frame_keys}, {0.25})
+        self.assertEqual(tuple(screen.get_at((int(1.5 * 256 * 0.3), 10)))[:3], TERRAIN_COLORS['water'])
+
+
+    def test_render_rect_draws_only_chunks_touching_it(self):
+        """Test drawing a strip between levels touches only its chunks and matches a full draw."""
+        for i in range(32):
+            self.game_map.set_terrain(i, (i * 7) % 32, 'water')
+        self.game_map.journal.commit()
+        viewport = Viewport(600, 600, 32, 32)
+        viewport.zoom = 0.3
+        viewport.x = viewport.y = 1500
+        full = pygame.Surface((600, 600))
+        self.cache.render(full, viewport)
+
+        self.cache.frame_keys = set()
+        strip = pygame.Rect(570, 0, 30, 600)
+        screen = pygame.Surface((600, 600))
+        screen.set_clip(strip)
+        self.cache.render(screen, viewport, strip)
+        screen.set_clip(None)
+
+        self.assertEqual(sorted(key[:2] for key in self.cache.frame_keys), [(1, 0), (1, 1)])
+        self.assertEqual(pygame.image.tobytes(screen.subsurface(strip), 'RGB'),
+                         pygame.image.tobytes(full.subsurface(strip), 'RGB'))
+
+if __name__ == '__main__':
+    unittest.main()
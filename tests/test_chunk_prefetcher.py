@@ -0,0 +1,156 @@
+import unittest
+import pygame
+import threading
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.chunk_cache import TerrainChunkCache
+from src.tile_engine.chunk_prefetcher import ChunkPrefetcher
+from src.tile_engine.map import GameMap
+from src.tile_engine.viewport import Viewport
+from src.tile_engine.zoom_pyramid import PyramidBuilder
+
+
+class FakeClock:
+    """Clock advancing by a fixed step every time it is read."""
+    def __init__(self, step=0.0):
+        self.time = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.time += self.step
+        return self.time
+
+
+class QueuedBuilder(PyramidBuilder):
+    """Builder that queues jobs until run_all() is called, without a thread."""
+    def __init__(self):
+        super().__init__(background=True)
+
+    def submit(self, key, build):
+        if key not in self.pending:
+            self.pending.add(key)
+            self.jobs.put((key, build))
+
+    def run_all(self):
+        while not self.jobs.empty():
+            key, build = self.jobs.get()
+            self.results.put((key, self._run_job(build)))
+            self.jobs.task_done()
+
+
+class TestChunkPrefetcher(unittest.TestCase):
+    def setUp(self):
+        """Create a 64x64 map (8x8 chunks) and a prefetcher building synchronously."""
+        self.game_map = GameMap(64, 64)
+        self.game_map.journal.commit()
+        self.cache = TerrainChunkCache(self.game_map, builder=PyramidBuilder(background=False))
+        self.clock = FakeClock()
+        self.prefetcher = ChunkPrefetcher(self.cache, frame_budget=1.0, clock=self.clock)
+        self.viewport = Viewport(800, 600, 64, 64)
+        self.viewport.x, self.viewport.y = 4096, 4096
+
+    def step(self, dx=0, dy=0, seconds=0.1):
+        """Move the viewport and run one frame: prefetch, then install finished builds."""
+        self.viewport.x += dx
+        self.viewport.y += dy
+        self.clock.time += seconds
+        installed = self.prefetcher.update(self.viewport)
+        self.cache.begin_frame()
+        return installed
+
+    def test_still_viewport_prefetches_nothing(self):
+        """Test nothing is rasterized while the viewport doesn't move."""
+        self.step()
+        self.step()
+        self.assertEqual(self.cache.rasterized_count, 0)
+
+    def test_chunks_ahead_are_ready_before_they_are_drawn(self):
+        """Test chunks in the direction of motion are cached before they scroll into view."""
+        screen = pygame.Surface((800, 600))
+        self.cache.render(screen, self.viewport)   # The chunk on screen now
+        self.step()
+        self.step(dx=300)     # 3000 world px/s to the right
+        self.step(dx=300)     # Hands back the chunks built last frame
+
+        self.assertGreater(self.prefetcher.prefetched_count, 0)
+        self.assertIn((3, 2, 1.0), self.cache.chunks)
+        self.assertFalse(any(cx < 2 for cx, _, _ in self.cache.chunks))
+
+        # Scrolling there now needs no synchronous rasterization
+        rasterized = self.cache.rasterized_count
+        self.viewport.x = 5500
+        self.cache.render(screen, self.viewport)
+        self.assertEqual(self.cache.rasterized_count, rasterized)
+
+    def test_shares_the_cache_builder(self):
+        """Test prefetches go through the cache's builder, so there is one queue and thread."""
+        self.assertIs(self.prefetcher.builder, self.cache.builder)
+
+    def test_turning_around_drops_queued_work(self):
+        """Test queued prefetches for the old direction are dropped, on-demand builds kept."""
+        builder = QueuedBuilder()
+        self.cache = TerrainChunkCache(self.game_map, builder=builder)
+        self.prefetcher = ChunkPrefetcher(self.cache, frame_budget=1.0, clock=self.clock)
+        builder.submit((0, 0, 1.0, self.cache.generation(0, 0)), lambda: None)  # On-demand build
+
+        self.step()
+        self.step(dx=400)
+        queued = len(self.prefetcher.submitted)
+        self.assertGreater(queued, 0)
+
+        self.step(dx=-400)
+        self.assertEqual(self.prefetcher.direction, 1)
+        self.assertEqual(self.prefetcher.cancelled_count, queued)
+        self.assertIn((0, 0, 1.0, self.cache.generation(0, 0)), builder.pending)
+
+        builder.run_all()
+        self.cache.begin_frame()
+        self.assertFalse(any(cx > 2 for cx, _, _ in self.cache.chunks))
+
+    def test_zoom_change_cancels(self):
+        """Test changing zoom resets the velocity and cancels queued work."""
+        self.step()
+        self.step(dx=400)
+        self.viewport.zoom = 0.5
+        self.step()
+        self.assertEqual(self.prefetcher.velocity, (0.0, 0.0))
+        self.assertEqual(self.prefetcher.direction, 1)
+
+    def test_frame_budget_limits_work(self):
+        """Test no chunk is queued once the frame budget is spent."""
+        self.prefetcher.frame_budget = 0.5
+        self.clock.step = 1.0  # Every clock read blows the budget
+        self.step()
+        self.step(dx=400)
+        self.assertEqual(self.cache.rasterized_count, 0)
+
+
+class TestBuilderCancel(unittest.TestCase):
+    def test_cancel_drops_queued_jobs(self):
+        """Test queued jobs are dropped while the running one completes."""
+        builder = PyramidBuilder()
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_job():
+            started.set()
+            release.wait()
+            return "running"
+
+        builder.submit("running", blocking_job)
+        started.wait()
+        builder.submit("queued_a", lambda: "a")
+        builder.submit("queued_b", lambda: "b")
+
+        self.assertEqual(builder.cancel(lambda key: key == "queued_a"), 1)
+        release.set()
+        builder.wait()
+        self.assertEqual(sorted(key for key, _ in builder.collect()), ["queued_b", "running"])
+        self.assertEqual(builder.pending, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.chunk_cache import TerrainChunkCache, TERRAIN_COLORS
+from src.tile_engine.compositor import MapCompositor
+from src.tile_engine.map import GameMap
+from src.tile_engine.player import Player
+from src.tile_engine.unit_manager import UnitManager
+from src.tile_engine.unit_renderer import UnitRenderer
+from src.tile_engine.viewport import Viewport
+from src.tile_engine.zoom_pyramid import PyramidBuilder, SurfacePyramid
+
+
+class MockUnit:
+    """Minimal unit that can be slotted onto a tile."""
+    unit_type = "Warriors"
+
+
+class TestMapCompositor(unittest.TestCase):
+    def setUp(self):
+        """Compose terrain and units for a small map with one unit."""
+        self.game_map = GameMap(16, 16)
+        self.game_map.journal.commit()
+        self.unit_manager = UnitManager(self.game_map)
+        self.unit = MockUnit()
+        Player(0, "Alice", (255, 0, 0)).add_unit(self.unit)
+        self.unit_manager.add_unit(self.unit, 0, 0)
+
+        self.terrain_cache = TerrainChunkCache(self.game_map, builder=PyramidBuilder(background=False))
+        self.unit_renderer = UnitRenderer(self.unit_manager, SurfacePyramid(PyramidBuilder(background=False)))
+        self.viewport = Viewport(800, 600, 16, 16)
+        self.screen = pygame.Surface((800, 600))
+
+        self.compositor = self.make_compositor()
+
+    def make_compositor(self):
+        compositor = MapCompositor()
+        compositor.add_layer('terrain', lambda: self.game_map.terrain_version,
+                             lambda surface, rect: self.terrain_cache.render(surface, self.viewport, rect),
+                             opaque=True)
+        compositor.add_layer('units', lambda: self.unit_manager.version,
+                             lambda surface, rect: self.unit_renderer.render(surface, self.viewport, rect))
+        return compositor
+
+    def test_first_frame_draws_every_layer(self):
+        """Test the first frame draws all layers in order."""
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), ['terrain', 'units'])
+        self.assertEqual(tuple(self.screen.get_at((16, 16)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(self.screen.get_at((200, 200)))[:3], TERRAIN_COLORS['grass'])
+
+    def test_unchanged_frame_redraws_nothing(self):
+        """Test a frame with no changes reuses every layer."""
+        self.compositor.render(self.screen, self.viewport)
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), [])
+        self.assertEqual(tuple(self.screen.get_at((16, 16)))[:3], (255, 0, 0))
+
+    def test_unit_move_redraws_only_units(self):
+        """Test moving a unit leaves the terrain layer cached."""
+        self.compositor.render(self.screen, self.viewport)
+        self.unit_manager.move_unit(self.unit, 1, 0)
+
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), ['units'])
+        self.assertEqual(tuple(self.screen.get_at((16, 16)))[:3], TERRAIN_COLORS['grass'])
+        self.assertEqual(tuple(self.screen.get_at((256 + 16, 16)))[:3], (255, 0, 0))
+
+    def test_map_change_redraws_only_terrain(self):
+        """Test a journal change redraws the terrain but not the units."""
+        self.compositor.render(self.screen, self.viewport)
+        self.game_map.set_terrain(2, 0, 'water')
+        self.game_map.journal.commit()
+
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), ['terrain'])
+        self.assertEqual(tuple(self.screen.get_at((512 + 100, 100)))[:3], TERRAIN_COLORS['water'])
+
+    def test_viewport_change_redraws_everything(self):
+        """Test scrolling invalidates every layer."""
+        self.compositor.render(self.screen, self.viewport)
+        self.viewport.x += 10
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), ['terrain', 'units'])
+
+    def test_pan_scrolls_layers(self):
+        """Test panning redraws only the exposed strips and matches a full redraw."""
+        self.unit_manager.move_unit(self.unit, 1, 1)
+        self.viewport.x, self.viewport.y = 100, 100
+        self.compositor.render(self.screen, self.viewport)
+
+        self.viewport.x += 10
+        self.viewport.y -= 20
+        self.compositor.render(self.screen, self.viewport)
+        terrain = self.compositor.get_layer('terrain')
+        self.assertEqual((terrain.scroll_count, terrain.redraw_count), (1, 1))
+        exposed = 10 * 600 + 790 * 20
+        self.assertEqual(self.compositor.drawn_area, 2 * exposed)
+
+        fresh = pygame.Surface((800, 600))
+        self.make_compositor().render(fresh, self.viewport)
+        self.assertEqual(pygame.image.tobytes(self.screen, 'RGB'), pygame.image.tobytes(fresh, 'RGB'))
+
+    def test_pan_draws_only_chunks_touching_strips(self):
+        """Test the exposed strips reach the draw callbacks, which skip chunks away from them."""
+        self.game_map.journal.commit()
+        self.compositor.render(self.screen, self.viewport)
+        self.terrain_cache.frame_keys = set()
+
+        self.viewport.x += 40
+        self.compositor.render(self.screen, self.viewport)
+        # Only the strip on the right edge, inside the second column of chunks
+        self.assertEqual(sorted(key[:2] for key in self.terrain_cache.frame_keys), [(0, 0)])
+
+    def test_pan_from_half_pixel_leaves_no_seam(self):
+        """Test a pan from an origin that rounds either way scrolls by the offset the layers draw at."""
+        self.game_map.set_terrain(0, 0, 'water')
+        self.game_map.set_terrain(3, 0, 'water')
+        self.game_map.journal.commit()
+        self.viewport.zoom = 0.5
+        self.viewport.x = 101   # 50.5 pixels, rounded down; 103 gives 51.5, rounded up
+        self.compositor.render(self.screen, self.viewport)
+
+        for x in (103, 105, 121):
+            self.viewport.x = x
+            self.compositor.render(self.screen, self.viewport)
+            fresh = pygame.Surface((800, 600))
+            self.make_compositor().render(fresh, self.viewport)
+            self.assertEqual(pygame.image.tobytes(self.screen, 'RGB'), pygame.image.tobytes(fresh, 'RGB'))
+        self.assertEqual(self.compositor.get_layer('terrain').scroll_count, 3)
+
+    def test_pan_at_fractional_zoom_matches_full_redraw(self):
+        """Test whole pixel pans at zooms between levels leave the same pixels as a full redraw."""
+        for x in range(16):
+            for y in range(16):
+                self.game_map.set_terrain(x, y, ('water', 'desert', 'forest', 'grass')[(x * 7 + y * 3) % 4])
+        self.game_map.journal.commit()
+
+        for zoom in (0.7, 1.3):
+            self.viewport.zoom = zoom
+            self.viewport.x = self.viewport.y = 100
+            compositor = self.make_compositor()
+            compositor.render(self.screen, self.viewport)
+            for dx, dy in ((10, 0), (0, -7), (13, 5)):
+                self.viewport.x += dx / zoom
+                self.viewport.y += dy / zoom
+                compositor.render(self.screen, self.viewport)
+                fresh = pygame.Surface((800, 600))
+                self.make_compositor().render(fresh, self.viewport)
+                self.assertEqual(pygame.image.tobytes(self.screen, 'RGB'), pygame.image.tobytes(fresh, 'RGB'))
+            self.assertEqual(compositor.get_layer('terrain').scroll_count, 3)
+
+    def test_sub_pixel_pan_redraws(self):
+        """Test pans that don't move by whole pixels redraw the layers in full."""
+        self.compositor.render(self.screen, self.viewport)
+        self.viewport.zoom = 0.5
+        self.compositor.render(self.screen, self.viewport)
+        self.viewport.x += 3
+        self.compositor.render(self.screen, self.viewport)
+        self.assertEqual(self.compositor.get_layer('terrain').scroll_count, 0)
+
+    def test_exposed_strips(self):
+        """Test strips cover exactly the area a scroll uncovers."""
+        strips = self.compositor.exposed_strips((100, 50), -10, 5)
+        self.assertEqual(strips, [pygame.Rect(90, 0, 10, 50), pygame.Rect(0, 0, 90, 5)])
+
+    def test_invalidate(self):
+        """Test a layer can be invalidated by name."""
+        self.compositor.render(self.screen, self.viewport)
+        self.compositor.invalidate('units')
+        self.assertEqual(self.compositor.render(self.screen, self.viewport), ['units'])
+        self.assertEqual(self.compositor.get_layer('units').redraw_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
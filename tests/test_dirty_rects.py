@@ -0,0 +1,83 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.core_states import GameState
+from src.ui.button import Button
+from src.ui.new_game_screen import NewGameScreen
+from src.ui.ui_manager import UIManager
+
+
+class MockEngine:
+    """Bare engine exposing only the game state the UI manager reads."""
+    def __init__(self):
+        self.game_state = GameState.NEW_GAME
+
+
+class TestDirtyRects(unittest.TestCase):
+    def setUp(self):
+        """Set up a UI manager showing the new game screen."""
+        pygame.font.init()
+        self.engine = MockEngine()
+        self.ui_manager = UIManager(self.engine)
+        self.ui_manager.screen_size = (800, 600)
+        self.screen = NewGameScreen(self.engine)
+        self.screen.initialize((800, 600))
+        self.ui_manager.add_component(self.screen)
+
+    def test_state_change_repaints_screen(self):
+        """Test the first frame of a game state presents the whole screen."""
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), [pygame.Rect(0, 0, 800, 600)])
+
+    def test_options_menu_round_trip_repaints_screen(self):
+        """Test entering and leaving the options menu each present the whole screen."""
+        full_screen = [pygame.Rect(0, 0, 800, 600)]
+        self.engine.game_state = GameState.MAIN_MENU
+        self.ui_manager.collect_dirty_rects()
+
+        self.engine.game_state = GameState.OPTIONS_MENU
+        self.assertIsNone(self.ui_manager.get_active_component())
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), full_screen)
+        self.engine.game_state = GameState.MAIN_MENU
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), full_screen)
+
+    def test_idle_frame_has_no_rects(self):
+        """Test nothing is presented when no component changed."""
+        self.ui_manager.collect_dirty_rects()
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), [])
+
+    def test_button_hover_marks_button(self):
+        """Test a hover change reports only the button's rectangle."""
+        self.ui_manager.collect_dirty_rects()
+        button = self.screen.buttons[0]
+        button.handle_mouse_move((button.position[0] + 1, button.position[1] + 1))
+
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), [pygame.Rect(button.position, button.size)])
+
+        # Moving within the button doesn't change its look
+        button.handle_mouse_move((button.position[0] + 2, button.position[1] + 2))
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), [])
+
+    def test_typing_marks_input_box(self):
+        """Test key presses report the input box."""
+        self.ui_manager.collect_dirty_rects()
+        self.screen.active_input = True
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a")
+        self.screen.handle_key_event(event)
+
+        self.assertEqual(self.ui_manager.collect_dirty_rects(), [self.screen.input_rect])
+
+    def test_set_text_marks_button(self):
+        """Test changing a button label marks it dirty."""
+        button = Button("test_btn", "Old", (10, 20), (100, 40))
+        button.take_dirty_rects()
+        button.set_text("New")
+        self.assertEqual(button.take_dirty_rects(), [pygame.Rect(10, 20, 100, 40)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.fog import FogOverlay, UNEXPLORED_ALPHA, EXPLORED_ALPHA, VISIBLE_ALPHA, CLEAR_KEY
+from src.tile_engine.map import GameMap
+from src.tile_engine.player import Player
+from src.tile_engine.viewport import Viewport
+
+
+class MockUnit:
+    """Minimal unit with a position and sight range."""
+    def __init__(self, x, y, visibility_range=1):
+        self.tile_position = (x, y)
+        self.visibility_range = visibility_range
+
+
+class TestFogOverlay(unittest.TestCase):
+    def setUp(self):
+        """Create a player that has explored two areas and currently sees one."""
+        self.game_map = GameMap(20, 20)
+        self.player = Player(0, "Alice", (255, 0, 0))
+        self.unit = MockUnit(2, 2)
+        self.player.add_unit(self.unit)
+        self.player.update_visibility(self.game_map)
+        self.unit.tile_position = (10, 10)
+        self.player.update_visibility(self.game_map)
+        self.fog = FogOverlay(self.game_map)
+
+    def alpha(self, x, y):
+        return self.fog.surface.get_at((x, y)).a
+
+    def test_visibility_mask(self):
+        """Test visibility is a mask that only bumps its version on change."""
+        self.assertTrue(self.player.can_see(11, 11))
+        self.assertFalse(self.player.can_see(2, 2))
+        version = self.player.visibility_version
+        self.player.update_visibility(self.game_map)
+        self.assertEqual(self.player.visibility_version, version)
+
+    def test_alpha_per_tile(self):
+        """Test one fog pixel per tile with alpha from exploration and visibility."""
+        self.assertTrue(self.fog.update(self.player))
+        self.assertEqual(self.fog.surface.get_size(), (20, 20))
+        self.assertEqual(self.alpha(10, 10), VISIBLE_ALPHA)
+        self.assertEqual(self.alpha(2, 2), EXPLORED_ALPHA)
+        self.assertEqual(self.alpha(15, 2), UNEXPLORED_ALPHA)
+
+    def test_rebuilt_only_on_change(self):
+        """Test the fog is rebuilt only when visibility or exploration changes."""
+        self.fog.update(self.player)
+        self.assertFalse(self.fog.update(self.player))
+
+        self.game_map.exploration.set_tile(0, 15, 2)
+        self.assertTrue(self.fog.update(self.player))
+        self.assertEqual(self.alpha(15, 2), EXPLORED_ALPHA)
+
+        self.unit.tile_position = (15, 2)
+        self.player.update_visibility(self.game_map)
+        self.assertTrue(self.fog.update(self.player))
+        self.assertEqual(self.alpha(15, 2), VISIBLE_ALPHA)
+        self.assertEqual(self.alpha(10, 10), EXPLORED_ALPHA)
+
+    def test_render_scales_once(self):
+        """Test the fog under the viewport is scaled and reused while nothing changes."""
+        viewport = Viewport(320, 320, 20, 20)
+        viewport.zoom = 0.125
+        viewport.x = viewport.y = 256 * 8
+        screen = pygame.Surface((320, 320))
+        screen.fill((255, 255, 255))
+        self.fog.render(screen, viewport, self.player)
+        scaled = self.fog.scaled
+
+        self.assertEqual(scaled.get_size(), (320, 320))
+        self.assertEqual(tuple(screen.get_at((2 * 32 + 16, 2 * 32 + 16)))[:3], (255, 255, 255))  # Tile (10, 10)
+        self.assertEqual(tuple(screen.get_at((9 * 32 + 16, 16)))[:3], (0, 0, 0))                  # Tile (17, 8)
+
+        self.fog.render(screen, viewport, self.player)
+        self.assertIs(self.fog.scaled, scaled)
+
+
+    def test_solid_fog(self):
+        """Test solid fog hides only unexplored tiles and rebuilds on mode change."""
+        self.fog.update(self.player)
+        version = self.fog.version
+        self.fog.blend = False
+        self.assertTrue(self.fog.update(self.player))
+        self.assertGreater(self.fog.version, version)
+
+        solid = self.fog.solid_surface
+        self.assertEqual(solid.get_colorkey()[:3], CLEAR_KEY)
+        self.assertEqual(tuple(solid.get_at((15, 2)))[:3], (0, 0, 0))
+        self.assertEqual(tuple(solid.get_at((2, 2)))[:3], CLEAR_KEY)
+        self.assertEqual(tuple(solid.get_at((10, 10)))[:3], CLEAR_KEY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,7 @@ class TestGameEngine(unittest.TestCase):
             
             # Verify options menu was created
             self.assertEqual(self.game_engine.options_menu, mock_options_menu)
+            self.assertEqual(self.game_engine.game_state, GameState.OPTIONS_MENU)
             mock_options_menu_class.assert_called_once()
 
     def test_return_to_main_menu(self):
@@ -0,0 +1,108 @@
+import unittest
+import pygame
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.heatmap import HeatmapRenderer, create_heatmaps, ramp_table, yield_values, NO_DATA_KEY, DEFAULT_RAMP
+from src.tile_engine.map import GameMap
+from src.tile_engine.tile_atlas import read_manifests
+from src.tile_engine.viewport import Viewport
+
+
+class TestHeatmaps(unittest.TestCase):
+    def setUp(self):
+        """Create a grass map with a mountain range and a gold mine."""
+        self.game_map = GameMap(40, 40)
+        self.game_map.generate_map([['mountain' if x == 5 else 'grass' for x in range(40)] for y in range(40)])
+        self.game_map.add_resource(8, 3, 'gold', 10)
+        self.game_map.add_resource(9, 3, 'wheat', 4)
+        self.game_map.journal.commit()
+        self.heatmaps = create_heatmaps(self.game_map)
+        self.viewport = Viewport(800, 600, 40, 40)
+
+    def color(self, heatmap, x, y):
+        return tuple(heatmap.surface.get_at((x, y)))[:3]
+
+    def test_ramp_ends(self):
+        """Test the lowest and highest values map to the ramp's end stops."""
+        table = ramp_table(DEFAULT_RAMP)
+        self.assertEqual(tuple(table[0]), DEFAULT_RAMP[0])
+        self.assertEqual(tuple(table[-1]), DEFAULT_RAMP[-1])
+
+    def test_layer_values_are_colour_mapped(self):
+        """Test movement cost and defense overlays colour tiles from the layer arrays."""
+        movement = self.heatmaps['movement_cost']
+        movement.update()
+        self.assertEqual(self.color(movement, 0, 0), DEFAULT_RAMP[0])    # Grass costs 1
+        self.assertEqual(self.color(movement, 5, 0), DEFAULT_RAMP[-1])   # Mountains cost 3
+
+        defense = self.heatmaps['defense_bonus']
+        defense.update()
+        self.assertEqual(self.color(defense, 0, 0), NO_DATA_KEY)         # No bonus, drawn clear
+        self.assertEqual(self.color(defense, 5, 0), DEFAULT_RAMP[-1])
+
+    def test_yield_overlays_from_terrain_and_resources(self):
+        """Test yield overlays add the tile manifests' terrain yields to the resource yields."""
+        food = yield_values(self.game_map, 'food', read_manifests())
+        self.assertEqual((food[0, 0], food[0, 5], food[3, 9]), (2, 0, 6))   # Grassland, mountain, grass + 4
+
+        gold, production = self.heatmaps['gold_yield'], self.heatmaps['production_yield']
+        gold.update()
+        production.update()
+        self.assertEqual(self.color(gold, 8, 3), DEFAULT_RAMP[-1])
+        self.assertEqual(self.color(gold, 0, 0), NO_DATA_KEY)
+        self.assertEqual(self.color(production, 0, 0), NO_DATA_KEY)
+        self.assertNotEqual(self.color(production, 5, 0), NO_DATA_KEY)
+
+    def test_rebuilt_only_when_version_changes(self):
+        """Test the overlay is repainted only after its layer changes."""
+        movement = self.heatmaps['movement_cost']
+        self.assertTrue(movement.update())
+        self.assertFalse(movement.update())
+
+        self.game_map.set_terrain(0, 0, 'mountain')
+        self.game_map.journal.commit()
+        self.assertTrue(movement.update())
+        self.assertEqual(self.color(movement, 0, 0), DEFAULT_RAMP[-1])
+
+    def test_layers_replaced_by_save_are_followed(self):
+        """Test overlays read the map's current layers after a save swaps them for file backed ones."""
+        movement = self.heatmaps['movement_cost']
+        movement.update()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.game_map.save(os.path.join(temp_dir, "world.map"))
+            self.game_map.set_terrain(0, 0, 'mountain')
+            self.game_map.journal.commit()
+            self.assertTrue(movement.update())
+            self.assertEqual(self.color(movement, 0, 0), DEFAULT_RAMP[-1])
+
+    def test_custom_layer_and_version(self):
+        """Test any per-tile array can be drawn, keyed on its own version."""
+        values = np.zeros((40, 40), dtype=np.int32)
+        state = {'version': 0}
+        heatmap = HeatmapRenderer(self.game_map, 'threat', lambda: values, (0, 1),
+                                  version=lambda: state['version'])
+        heatmap.update()
+        values[:, :] = 1
+        state['version'] += 1
+        self.assertTrue(heatmap.update())
+        self.assertEqual(self.color(heatmap, 7, 7), DEFAULT_RAMP[-1])
+
+    def test_render_blends_over_map(self):
+        """Test the overlay is blended over the screen and clear tiles are left alone."""
+        screen = pygame.Surface((800, 600))
+        screen.fill((0, 0, 255))
+        self.viewport.zoom = 0.25
+        self.heatmaps['defense_bonus'].render(screen, self.viewport)
+
+        self.assertEqual(tuple(screen.get_at((10, 10)))[:3], (0, 0, 255))   # Grass, no bonus
+        blended = tuple(screen.get_at((5 * 64 + 10, 10)))[:3]               # Mountain column
+        self.assertNotIn(blended, [(0, 0, 255), DEFAULT_RAMP[-1]])
+
+if __name__ == '__main__':
+    unittest.main()
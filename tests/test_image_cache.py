@@ -0,0 +1,74 @@
+import unittest
+import pygame
+import shutil
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.image_cache import ImageCache
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        """Write a small image to a temporary directory and reset the cache."""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "backdrop.png")
+        image = pygame.Surface((40, 30))
+        image.fill((10, 20, 30))
+        pygame.image.save(image, self.path)
+        self.cache = ImageCache()
+        self.cache.clear()
+        self.cache.decode_count = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_file_is_decoded_once(self):
+        """Test several sizes of one file share a single decode."""
+        self.cache.load(self.path, (80, 60))
+        self.cache.load(self.path, (20, 15))
+        self.cache.load(self.path)
+        self.assertEqual(self.cache.decode_count, 1)
+
+    def test_scaled_variants_are_memoized(self):
+        """Test the same path, size and mode return the same surface."""
+        backdrop = self.cache.load(self.path, (80, 60), 'opaque')
+        self.assertEqual(backdrop.get_size(), (80, 60))
+        self.assertIs(self.cache.load(self.path, [80, 60], 'opaque'), backdrop)
+        self.assertIsNot(self.cache.load(self.path, (80, 60), 'alpha'), backdrop)
+
+    def test_images_loaded_before_display_are_converted_later(self):
+        """Test a convert mode asked for before set_mode is applied once a display exists."""
+        early = self.cache.load(self.path, (80, 60), 'opaque')
+        self.assertIn((self.path, (80, 60), 'opaque'), self.cache.unconverted)
+        pygame.display.set_mode((10, 10))
+        try:
+            converted = self.cache.load(self.path, (80, 60), 'opaque')
+            self.assertIsNot(converted, early)
+            self.assertEqual(converted.get_size(), (80, 60))
+            self.assertIs(self.cache.load(self.path, (80, 60), 'opaque'), converted)
+            self.assertEqual(self.cache.unconverted, set())
+        finally:
+            pygame.display.quit()
+
+    def test_warm_up_decodes_in_background(self):
+        """Test a background warm-up leaves nothing to decode on first use."""
+        self.cache.warm_up([self.path])
+        self.cache.wait()
+        self.assertEqual(self.cache.decode_count, 1)
+        self.cache.load(self.path, (80, 60))
+        self.assertEqual(self.cache.decode_count, 1)
+
+    def test_missing_file_raises(self):
+        """Test load errors reach the caller, and warm-up only logs them."""
+        missing = os.path.join(self.test_dir, "missing.png")
+        self.cache.warm_up([missing], background=False)
+        with self.assertRaises((pygame.error, FileNotFoundError)):
+            self.cache.load(missing)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.info_panel import InfoPanel
+
+
+class MockCity:
+    name = "Rome"
+
+
+class TestInfoPanel(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.panel = InfoPanel(800, 600)
+        self.screen = pygame.Surface((800, 600))
+
+    def test_empty_panel_draws_nothing(self):
+        """Test nothing is drawn before a tile is selected."""
+        self.panel.render(self.screen)
+        self.assertIsNone(self.panel.surface)
+
+    def test_new_tile_clears_previous_details(self):
+        """Test selecting another tile drops the last tile's resource, units and city."""
+        self.panel.set_terrain("grass", 1)
+        self.panel.set_resource("gold", 3)
+        self.panel.set_unit_list([object(), object()])
+        self.panel.set_city(MockCity())
+        self.assertEqual(self.panel.get_lines(), ["Terrain: grass (move 1)", "Resource: gold (+3)",
+                                                  "Units: 2", "City: Rome"])
+
+        self.panel.set_terrain("water", 3)
+        self.assertEqual(self.panel.get_lines(), ["Terrain: water (move 3)"])
+
+    def test_panel_is_reused_while_unchanged(self):
+        """Test the panel surface is only rebuilt when its text changes."""
+        self.panel.set_terrain("grass", 1)
+        self.panel.render(self.screen)
+        surface = self.panel.surface
+        self.panel.render(self.screen)
+        self.assertIs(self.panel.surface, surface)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.chunk_cache import TerrainChunkCache, TERRAIN_COLORS
+from src.tile_engine.lod import LodSwitch, LodRenderer
+from src.tile_engine.map import GameMap
+from src.tile_engine.viewport import Viewport
+from src.tile_engine.zoom_pyramid import PyramidBuilder
+
+
+class TestLodSwitch(unittest.TestCase):
+    def test_hysteresis(self):
+        """Test the switch enters and leaves LOD at different zooms."""
+        switch = LodSwitch(enter_zoom=0.3, exit_zoom=0.45)
+        self.assertFalse(switch.update(0.4))
+        self.assertTrue(switch.update(0.25))
+        # Zooming back in a little stays in LOD until the exit zoom
+        self.assertTrue(switch.update(0.4))
+        self.assertFalse(switch.update(0.5))
+        self.assertFalse(switch.update(0.4))
+
+
+class TestLodRenderer(unittest.TestCase):
+    def setUp(self):
+        """Create a map with a block of water, viewed at the lowest zoom."""
+        self.game_map = GameMap(40, 40)
+        self.game_map.generate_map([['water' if 5 <= x < 10 and y < 5 else 'grass' for x in range(40)]
+                                    for y in range(40)])
+        self.game_map.journal.commit()
+        self.renderer = LodRenderer(self.game_map)
+        self.viewport = Viewport(800, 600, 40, 40)
+        self.viewport.zoom = 0.25
+        self.screen = pygame.Surface((800, 600))
+
+    def test_matches_detailed_view(self):
+        """Test the LOD picture matches the detailed chunks pixel for pixel."""
+        self.viewport.x, self.viewport.y = 512, 256
+        self.renderer.render(self.screen, self.viewport)
+
+        detailed = pygame.Surface((800, 600))
+        TerrainChunkCache(self.game_map, builder=PyramidBuilder(background=False)).render(detailed, self.viewport)
+        self.assertEqual(pygame.image.tobytes(self.screen, 'RGB'), pygame.image.tobytes(detailed, 'RGB'))
+
+    def test_views_line_up_at_fractional_zoom(self):
+        """Test views a whole number of pixels apart overlap exactly at a zoom between levels."""
+        for x in range(40):
+            self.game_map.set_terrain(x, x % 7, ('water', 'desert', 'forest')[x % 3])
+        self.game_map.journal.commit()
+        self.viewport.zoom = 0.27
+        self.viewport.x = 300
+        self.renderer.render(self.screen, self.viewport)
+
+        shifted = pygame.Surface((800, 600))
+        self.viewport.x += 13 / 0.27
+        self.renderer.render(shifted, self.viewport)
+        overlap = pygame.Rect(13, 0, 787, 600)
+        self.assertEqual(pygame.image.tobytes(self.screen.subsurface(overlap), 'RGB'),
+                         pygame.image.tobytes(shifted.subsurface((0, 0), overlap.size), 'RGB'))
+
+        detailed = pygame.Surface((800, 600))
+        TerrainChunkCache(self.game_map, builder=PyramidBuilder(background=False)).render(detailed, self.viewport)
+        self.assertEqual(pygame.image.tobytes(shifted, 'RGB'), pygame.image.tobytes(detailed, 'RGB'))
+
+    def test_terrain_changes_repaint_tiles(self):
+        """Test set_terrain shows up after an incremental update."""
+        self.renderer.render(self.screen, self.viewport)
+        version = self.renderer.version
+        self.game_map.set_terrain(0, 0, 'water')
+        self.game_map.journal.commit()
+
+        self.renderer.render(self.screen, self.viewport)
+        self.assertEqual(self.renderer.version, version + 1)
+        self.assertEqual(tuple(self.screen.get_at((10, 10)))[:3], TERRAIN_COLORS['water'])
+
+    def test_unit_marks_do_not_repaint(self):
+        """Test journal marks that didn't change terrain leave the picture alone."""
+        self.renderer.update()
+        version = self.renderer.version
+        self.game_map.mark_dirty(3, 3)
+        self.game_map.journal.commit()
+        self.assertFalse(self.renderer.update())
+        self.assertEqual(self.renderer.version, version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from unittest import mock
+import time
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.chunked_layer import ChunkedLayer
+from src.tile_engine.map import GameMap
+
+
+class MockUnit:
+    """Minimal unit that can be slotted onto a tile."""
+    pass
+
+
+class TestChunkedLayer(unittest.TestCase):
+    def setUp(self):
+        """Create a 40x40 layer spanning several 16x16 chunks."""
+        self.layer = ChunkedLayer(np.arange(1600, dtype=np.int32).reshape(40, 40))
+
+    def test_snapshot_shares_until_written(self):
+        """Test a snapshot reads through to its source and copies on write."""
+        snapshot = self.layer.snapshot()
+        self.assertEqual(snapshot.private, {})
+        self.assertEqual(snapshot[5, 7], 5 * 40 + 7)
+
+        snapshot[5, 7] = -1
+        self.assertEqual(list(snapshot.private), [0])
+        self.assertEqual(self.layer[5, 7], 5 * 40 + 7)
+        self.assertEqual(snapshot[5, 7], -1)
+
+    def test_source_writes_do_not_leak_into_snapshot(self):
+        """Test writing to the source gives sharing snapshots their own copy first."""
+        first = self.layer.snapshot()
+        second = first.snapshot()
+        self.layer[0:20, 30] = 7
+
+        self.assertEqual(self.layer[19, 30], 7)
+        self.assertEqual(first[19, 30], 19 * 40 + 30)
+        self.assertEqual(second[19, 30], 19 * 40 + 30)
+        self.assertEqual(sorted(first.private), [1, 4])
+        self.assertEqual(second.private, {})
+
+    def test_region_reads_assemble_chunks(self):
+        """Test slices of a snapshot match the equivalent array slices."""
+        expected = np.array(self.layer)
+        snapshot = self.layer.snapshot()
+        snapshot[10:20, 10:20] = 0
+        expected[10:20, 10:20] = 0
+
+        np.testing.assert_array_equal(snapshot[3:37, 8:33], expected[3:37, 8:33])
+        np.testing.assert_array_equal(snapshot[12], expected[12])
+        np.testing.assert_array_equal(np.asarray(snapshot), expected)
+        with self.assertRaises(ValueError):
+            snapshot[12][0] = 1  # Reads are read-only
+
+
+class TestMapSnapshot(unittest.TestCase):
+    def setUp(self):
+        """Create a map with some terrain, resources and exploration."""
+        self.game_map = GameMap(64, 48)
+        self.game_map.set_terrain(3, 4, 'forest')
+        self.game_map.add_resource(3, 4, 'wood', 2)
+        self.game_map.exploration.set_tile(1, 3, 4)
+
+    def test_snapshot_is_isolated(self):
+        """Test changes on either side are invisible to the other."""
+        snapshot = self.game_map.snapshot()
+        snapshot.set_terrain(3, 4, 'mountain')
+        snapshot.exploration.set_tile(1, 50, 40)
+        self.game_map.set_terrain(60, 40, 'water')
+        self.game_map.add_resource(3, 4, 'gold', 9)
+
+        self.assertEqual(self.game_map.get_tile(3, 4).terrain_type, 'forest')
+        self.assertEqual(self.game_map.get_tile(3, 4).defense_bonus, 25)
+        self.assertEqual(snapshot.get_tile(3, 4).terrain_type, 'mountain')
+        self.assertEqual(snapshot.get_tile(3, 4).defense_bonus, 50)
+        self.assertEqual(snapshot.get_terrain(60, 40), 'grass')
+        self.assertEqual(snapshot.get_resource(3, 4).type, 'wood')
+        self.assertEqual(self.game_map.get_resource(3, 4).type, 'gold')
+
+        self.assertTrue(snapshot.exploration.is_set(1, 3, 4))
+        self.assertTrue(snapshot.exploration.is_set(1, 50, 40))
+        self.assertFalse(self.game_map.exploration.is_set(1, 50, 40))
+
+    def test_unit_slots_are_copied(self):
+        """Test moving units in a snapshot leaves the parent's slots alone."""
+        unit = MockUnit()
+        self.game_map.place_unit_on_tile(unit, self.game_map.get_tile(5, 5))
+        snapshot = self.game_map.snapshot()
+        snapshot.remove_unit_from_tile(unit, snapshot.get_tile(5, 5))
+
+        self.assertIsNone(snapshot.get_tile(5, 5).unit_grid[0][0])
+        self.assertIs(self.game_map.get_tile(5, 5).unit_grid[0][0], unit)
+
+    def test_snapshot_creation_is_cheap(self):
+        """Test snapshotting a large map copies no tile data."""
+        game_map = GameMap(1024, 1024)
+        start = time.perf_counter()
+        snapshot = game_map.snapshot()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.05)
+        self.assertTrue(all(not layer.private for layer in snapshot.layers.arrays.values()))
+
+
+    def test_exploration_grows_past_eight_players(self):
+        """Test in-memory exploration takes more players than its initial rows, isolated from snapshots."""
+        snapshot = self.game_map.snapshot()
+        for player_id in range(2, 12):
+            self.game_map.exploration.set_tile(player_id, player_id, 0)
+        snapshot.exploration.set_tile(20, 5, 5)
+        for player_id in range(21, 30):
+            snapshot.exploration.add_player(player_id)
+
+        self.assertTrue(self.game_map.exploration.is_set(11, 11, 0))
+        self.assertTrue(self.game_map.exploration.is_set(1, 3, 4))
+        self.assertGreaterEqual(self.game_map.exploration.capacity, 11)
+        self.assertFalse(snapshot.exploration.is_set(11, 11, 0))
+        self.assertTrue(snapshot.exploration.is_set(1, 3, 4))
+        self.assertTrue(snapshot.exploration.is_set(20, 5, 5))
+        self.assertFalse(self.game_map.exploration.is_set(20, 5, 5))
+
+    def test_snapshot_allocates_no_root_layers(self):
+        """Test a snapshot is built from layer copies without allocating arrays of its own."""
+        self.game_map.get_variant_ids(0, 0, 16, 16)
+        init = ChunkedLayer.__init__
+        with mock.patch.object(ChunkedLayer, '__init__', autospec=True, side_effect=init) as created:
+            snapshot = self.game_map.snapshot()
+
+        self.assertTrue(all(call.kwargs.get('source') is not None for call in created.call_args_list))
+        self.assertIs(snapshot.variants.source, self.game_map.variants)
+        self.assertTrue(snapshot.variants_ready[0, 0])
+        self.assertEqual(snapshot.get_variant_ids(0, 0, 16, 16).tolist(),
+                         self.game_map.get_variant_ids(0, 0, 16, 16).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.map import GameMap
+from src.tile_engine.minimap import Minimap, MINIMAP_COLORS, UNEXPLORED_COLOR
+from src.tile_engine.player import Player
+
+
+class MockUnit:
+    """Minimal unit with a position and sight range."""
+    def __init__(self, x, y, visibility_range=1):
+        self.tile_position = (x, y)
+        self.visibility_range = visibility_range
+
+
+class TestMinimap(unittest.TestCase):
+    def setUp(self):
+        """Create a map with one player exploring around a unit."""
+        self.game_map = GameMap(40, 30)
+        self.game_map.set_terrain(5, 5, 'water')
+        self.player = Player(0, "Alice", (255, 0, 0))
+        self.player.add_unit(MockUnit(5, 5))
+        self.player.update_visibility(self.game_map)
+        self.minimap = Minimap(self.game_map)
+
+    def pixel(self, x, y):
+        return tuple(self.minimap.surface.get_at((x, y)))[:3]
+
+    def test_player_exploration_uses_bitsets(self):
+        """Test seen tiles are recorded in the map's exploration bitsets."""
+        self.assertTrue(self.player.has_explored(self.game_map, 4, 4))
+        self.assertTrue(self.game_map.exploration.is_set(0, 6, 6))
+        self.assertFalse(self.player.has_explored(self.game_map, 7, 5))
+        self.assertEqual(self.game_map.exploration.count(0), 9)
+
+    def test_rebuild_masks_unexplored(self):
+        """Test the first update paints explored terrain and leaves the rest black."""
+        self.assertTrue(self.minimap.update(0))
+        self.assertEqual(self.pixel(5, 5), MINIMAP_COLORS['water'])
+        self.assertEqual(self.pixel(4, 5), MINIMAP_COLORS['grass'])
+        self.assertEqual(self.pixel(20, 20), UNEXPLORED_COLOR)
+
+    def test_incremental_update(self):
+        """Test only changed and newly explored tiles are repainted."""
+        self.minimap.update(0)
+        self.assertFalse(self.minimap.update(0))
+        scaled = self.minimap.get_surface((10, 8))
+        self.assertIs(self.minimap.get_surface((10, 8)), scaled)
+
+        self.game_map.set_terrain(4, 4, 'mountain')
+        self.player.units[0].tile_position = (30, 20)
+        self.player.update_visibility(self.game_map)
+        self.assertTrue(self.minimap.update(0))
+
+        self.assertEqual(self.pixel(4, 4), MINIMAP_COLORS['mountain'])
+        self.assertEqual(self.pixel(31, 21), MINIMAP_COLORS['grass'])
+        self.assertLess(self.minimap.repainted_tiles, 20)
+        self.assertIsNot(self.minimap.get_surface((10, 8)), scaled)
+
+    def test_switching_player_rebuilds(self):
+        """Test another player's minimap does not show tiles it has not explored."""
+        self.minimap.update(0)
+        self.minimap.update(1)
+        self.assertEqual(self.pixel(5, 5), UNEXPLORED_COLOR)
+
+
+if __name__ == '__main__':
+    unittest.main()
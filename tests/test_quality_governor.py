@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.quality_governor import QualityGovernor, QUALITY_LEVELS
+
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        self.governor = QualityGovernor(budget=0.016, window=10, cooldown=20)
+
+    def run_frames(self, seconds, count):
+        """Record count frames, returning how many of them changed the level"""
+        return sum(self.governor.record_frame(seconds) for _ in range(count))
+
+    def test_steps_down_when_over_budget(self):
+        """Test slow frames lower quality one step per cooldown."""
+        self.assertEqual(self.run_frames(0.025, 10), 1)
+        self.assertEqual(self.governor.level.name, 'medium')
+
+        # The new level is measured for a full cooldown before moving again
+        self.assertEqual(self.run_frames(0.025, 19), 0)
+        self.assertEqual(self.run_frames(0.025, 1), 1)
+        self.assertEqual(self.governor.level.name, 'low')
+
+    def test_stays_within_levels(self):
+        """Test quality doesn't step past the lowest or highest level."""
+        self.run_frames(0.050, 200)
+        self.assertEqual(self.governor.index, len(QUALITY_LEVELS) - 1)
+        self.run_frames(0.001, 200)
+        self.assertEqual(self.governor.index, 0)
+
+    def test_steps_up_with_headroom_only(self):
+        """Test quality returns once frames fit well inside the budget."""
+        self.governor.set_index(2)
+        self.run_frames(0.012, 40)   # Under budget, but not by enough
+        self.assertEqual(self.governor.index, 2)
+        self.run_frames(0.005, 20)
+        self.assertEqual(self.governor.index, 1)
+
+    def test_occasional_spikes_are_ignored(self):
+        """Test a single long frame in the window doesn't lower quality."""
+        for frame in range(100):
+            self.governor.record_frame(0.040 if frame % 20 == 0 else 0.010)
+        self.assertEqual(self.governor.index, 0)
+
+    def test_status(self):
+        """Test the status reported for debug displays."""
+        self.assertEqual(self.governor.status()['frame_ms'], None)
+        self.run_frames(0.010, 5)
+        status = self.governor.status()
+        self.assertEqual(status['level'], 'high')
+        self.assertEqual(status['frame_ms'], 10.0)
+        self.assertEqual(status['budget_ms'], 16.0)
+        self.assertEqual(len(self.governor.status_lines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.spatial_index import SpatialIndex
+from src.unit.unit import Unit
+from src.unit.unit_manager import UnitManager
+from src.city.city import City
+from src.city.city_manager import CityManager
+from src.tile_engine.map import GameMap
+from src.tile_engine.unit_manager import UnitManager as TileUnitManager
+
+
+class MockUnit:
+    """Minimal tile engine unit."""
+    def __init__(self, name):
+        self.name = name
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        """Fill an index with random objects and keep a brute force copy."""
+        self.rng = random.Random(1234)
+        self.index = SpatialIndex(bucket_size=4)
+        self.positions = {}
+        for i in range(400):
+            obj = ("unit" if i % 3 else "city", i)
+            position = (self.rng.randrange(60), self.rng.randrange(40))
+            self.index.insert(obj, position, obj[0])
+            self.positions[obj] = position
+
+    def test_query_rect_matches_brute_force(self):
+        """Test rectangle queries return exactly the objects inside the rectangle."""
+        for _ in range(50):
+            min_x, min_y = self.rng.randrange(60), self.rng.randrange(40)
+            max_x, max_y = min_x + self.rng.randrange(20), min_y + self.rng.randrange(20)
+            expected = {o for o, (x, y) in self.positions.items()
+                        if min_x <= x <= max_x and min_y <= y <= max_y and o[0] == "unit"}
+            self.assertEqual(set(self.index.query_rect(min_x, min_y, max_x, max_y, "unit")), expected)
+
+    def test_query_radius_matches_brute_force(self):
+        """Test radius queries use Euclidean tile distance."""
+        for _ in range(50):
+            center = (self.rng.randrange(60), self.rng.randrange(40))
+            radius = self.rng.uniform(0, 12)
+            expected = {o for o, (x, y) in self.positions.items()
+                        if (x - center[0]) ** 2 + (y - center[1]) ** 2 <= radius * radius}
+            self.assertEqual(set(self.index.query_radius(center, radius)), expected)
+
+    def test_nearest_matches_brute_force(self):
+        """Test nearest returns an object at the minimum distance."""
+        for _ in range(50):
+            position = (self.rng.randrange(-10, 70), self.rng.randrange(-10, 50))
+            result = self.index.nearest("city", position)
+            best = min((x - position[0]) ** 2 + (y - position[1]) ** 2
+                       for o, (x, y) in self.positions.items() if o[0] == "city")
+            x, y = self.positions[result]
+            self.assertEqual((x - position[0]) ** 2 + (y - position[1]) ** 2, best)
+
+        self.assertIsNone(self.index.nearest("city", (0, 0), predicate=lambda obj: False))
+        self.assertIsNone(SpatialIndex().nearest("unit", (0, 0)))
+
+    def test_move_and_remove(self):
+        """Test moves and removals keep buckets consistent."""
+        obj = next(iter(self.positions))
+        self.index.move(obj, (100, 100))
+        self.assertIn(obj, self.index.query_tile(100, 100))
+        self.assertNotIn(obj, self.index.query_rect(0, 0, 59, 39))
+
+        for obj in list(self.positions):
+            self.assertTrue(self.index.remove(obj))
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.buckets, {})
+        self.assertFalse(self.index.remove(obj))
+
+
+class TestManagerIndexing(unittest.TestCase):
+    def test_unit_and_city_managers_share_index(self):
+        """Test engine managers keep a shared index in sync."""
+        index = SpatialIndex()
+        units = UnitManager(index)
+        cities = CityManager(index)
+        units.add_unit(Unit(1, "Spearmen", (2, 3)))
+        cities.add_city(City(1, "Capital", (4, 4)))
+
+        self.assertEqual([u.id for u in units.get_units_at(2, 3)], [1])
+        units.move_unit(1, (5, 5))
+        self.assertEqual(units.get_units_at(2, 3), [])
+        self.assertEqual(cities.get_nearest_city((6, 6)).name, "Capital")
+        self.assertEqual(len(index.query_radius((5, 5), 2)), 2)
+
+        units.remove_unit(1)
+        self.assertEqual(units.get_units_in_radius((5, 5), 3), [])
+
+    def test_tile_engine_units_on_tile(self):
+        """Test tile engine units are indexed and slotted as they move."""
+        game_map = GameMap(10, 10)
+        manager = TileUnitManager(game_map)
+        unit_a, unit_b = MockUnit("a"), MockUnit("b")
+        manager.add_unit(unit_a, 1, 1)
+        manager.add_unit(unit_b, 1, 1)
+
+        self.assertEqual(manager.get_units_on_tile(game_map.get_tile(1, 1)), [unit_a, unit_b])
+        self.assertTrue(manager.move_unit(unit_a, 2, 1))
+        self.assertEqual(manager.get_units_on_tile(game_map.get_tile(1, 1)), [unit_b])
+        self.assertEqual(manager.get_units_in_rect(2, 0, 3, 3), [unit_a])
+        self.assertIsNone(game_map.get_tile(1, 1).unit_grid[0][0])
+
+        manager.remove_unit(unit_b)
+        self.assertEqual(manager.get_units_on_tile(game_map.get_tile(1, 1)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
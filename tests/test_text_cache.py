@@ -0,0 +1,66 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.button import Button
+from src.ui.text_cache import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        """Start every test from an empty shared cache."""
+        pygame.font.init()
+        self.cache = TextCache()
+        self.cache.clear()
+
+    def test_cache_is_shared(self):
+        """Test every caller gets the same cache instance."""
+        self.assertIs(TextCache(), self.cache)
+
+    def test_fonts_are_created_once(self):
+        """Test fonts are shared per name and size."""
+        font = self.cache.get_font(None, 24)
+        self.assertIs(self.cache.get_font(None, 24), font)
+        self.assertIsNot(self.cache.get_font(None, 32), font)
+
+    def test_rendered_text_is_reused(self):
+        """Test the same text, colour and size are rendered once."""
+        first = self.cache.render("Load Game", 48, (255, 255, 255))
+        self.assertIs(self.cache.render("Load Game", 48, [255, 255, 255]), first)
+        self.assertIsNot(self.cache.render("Load Game", 48, (200, 200, 200)), first)
+        self.assertIsNot(self.cache.render("Load Game", 48, (255, 255, 255), antialias=False), first)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache drops the oldest surface when full."""
+        max_surfaces = self.cache.max_surfaces
+        self.cache.max_surfaces = 2
+        try:
+            first = self.cache.render("a")
+            self.cache.render("b")
+            self.cache.render("a")   # "b" is now the least recently used
+            self.cache.render("c")
+            self.assertIs(self.cache.render("a"), first)
+            self.assertEqual(len(self.cache.surfaces), 2)
+            self.assertNotIn((None, 32, "b", (255, 255, 255), True), self.cache.surfaces)
+        finally:
+            self.cache.max_surfaces = max_surfaces
+
+    def test_button_hover_reuses_labels(self):
+        """Test hovering a button back and forth doesn't render its label again."""
+        button = Button("btn", "Play", (0, 0), (100, 40))
+        button.initialize()
+        button.handle_mouse_move((10, 10))
+        button.handle_mouse_move((500, 500))
+        misses = self.cache.misses
+        button.handle_mouse_move((10, 10))
+        button.handle_mouse_move((500, 500))
+        self.assertEqual(self.cache.misses, misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import unittest
+import pygame
+import numpy as np
+import json
+import random
+import shutil
+import sys
+import os
+import tempfile
+import threading
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.autotile import VARIANT_NAMES, variant_ids
+from src.tile_engine.chunk_cache import TerrainChunkCache, TEXTURE_SHARE
+from src.tile_engine.map import GameMap
+from src.tile_engine.tile_atlas import TileAtlas
+from src.tile_engine.zoom_pyramid import PyramidBuilder
+
+
+class TestTileAtlas(unittest.TestCase):
+    def setUp(self):
+        """Write manifests for two terrains into a temporary data directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.write_image('grass_base.png', (0, 200, 0))
+        self.write_image('grass_edge.png', (0, 100, 0))
+        self.write_image('desert_base.png', (230, 210, 120))
+        self.write_manifest('grassland', 'grass_base.png', {
+            'isolated': 'missing.png',
+            'horizontal_edge_top': 'grass_edge.png',
+        })
+        self.write_manifest('desert', 'desert_base.png', {'isolated': 'missing.png'})
+        self.atlas = TileAtlas(self.test_dir, prebuilt_manifest=None)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_image(self, name, color, size=(64, 64)):
+        image = pygame.Surface(size)
+        image.fill(color)
+        pygame.image.save(image, os.path.join(self.test_dir, name))
+
+    def write_manifest(self, name, base, variants):
+        manifest = {
+            'name': name,
+            'base_image': os.path.join(self.test_dir, base),
+            'variants': {key: os.path.join(self.test_dir, path) for key, path in variants.items()},
+        }
+        with open(os.path.join(self.test_dir, f"{name}.json"), 'w') as f:
+            json.dump(manifest, f)
+
+    def test_terrains_load_lazily(self):
+        """Test only the terrain asked for is loaded."""
+        self.assertEqual(self.atlas.page_bytes, 0)
+        self.assertIsNotNone(self.atlas.get_surface('grass', 'isolated'))
+        self.assertTrue(self.atlas.is_loaded('grassland'))
+        self.assertFalse(self.atlas.is_loaded('desert'))
+
+    def test_missing_variants_share_base(self):
+        """Test variants without an image reuse the base image's region."""
+        base_page, base_rect = self.atlas.get_region('grass', 'base')
+        page, rect = self.atlas.get_region('grass', 'isolated')
+        self.assertIs(page, base_page)
+        self.assertEqual(rect, base_rect)
+        self.assertEqual(tuple(self.atlas.get_surface('grass', 'isolated').get_at((0, 0)))[:3], (0, 200, 0))
+
+    def test_variants_pack_into_one_page(self):
+        """Test distinct images share a page without overlapping."""
+        _, base_rect = self.atlas.get_region('grass', 'base')
+        _, edge_rect = self.atlas.get_region('grass', 'horizontal_edge_top')
+        self.assertEqual(len(self.atlas.pages['grassland']), 1)
+        self.assertFalse(base_rect.colliderect(edge_rect))
+        self.assertEqual(tuple(self.atlas.get_surface('grass', 'horizontal_edge_top').get_at((0, 0)))[:3],
+                         (0, 100, 0))
+
+    def test_variant_ids_resolve_to_names(self):
+        """Test autotile variant ids find the same region as their names."""
+        from src.tile_engine.autotile import VARIANT_NAMES, variant_ids
+        variant_id = VARIANT_NAMES.index('horizontal_edge_top')
+        self.assertEqual(self.atlas.get_region('grass', variant_id),
+                         self.atlas.get_region('grass', 'horizontal_edge_top'))
+
+    def test_full_pages_spill_over(self):
+        """Test images that don't fit a page are packed onto another one."""
+        atlas = TileAtlas(self.test_dir, page_width=64, prebuilt_manifest=None)
+        base_page, _ = atlas.get_region('grass', 'base')
+        edge_page, _ = atlas.get_region('grass', 'horizontal_edge_top')
+        self.assertEqual(len(atlas.pages['grassland']), 2)
+        self.assertIsNot(base_page, edge_page)
+
+    def test_memory_accounting(self):
+        """Test page memory is counted on load and released on unload."""
+        self.atlas.load_terrain('desert')
+        self.assertEqual(self.atlas.page_bytes, 64 * 64 * 4)
+        self.assertEqual(self.atlas.used_bytes, self.atlas.page_bytes)
+
+        self.atlas.unload_terrain('desert')
+        self.assertEqual((self.atlas.page_bytes, self.atlas.used_bytes), (0, 0))
+        self.assertFalse(self.atlas.is_loaded('desert'))
+
+    def test_unknown_terrain(self):
+        """Test terrains without a manifest have no texture."""
+        self.assertIsNone(self.atlas.get_surface('lava', 0))
+
+    def test_chunk_cache_draws_atlas_tiles(self):
+        """Test chunks are rasterized from atlas textures when available."""
+        game_map = GameMap(8, 8)
+        cache = TerrainChunkCache(game_map, builder=PyramidBuilder(background=False), atlas=self.atlas)
+        chunk, _ = cache.get_chunk(0, 0, 0.25)
+        self.assertEqual(tuple(chunk.get_at((10, 10)))[:3], (0, 200, 0))
+
+
+    def test_numpy_variant_ids(self):
+        """Test variant ids read from map arrays resolve like Python ints."""
+        variant = np.int64(VARIANT_NAMES.index('horizontal_edge_top'))
+        self.assertEqual(self.atlas.get_region('grass', variant), self.atlas.get_region('grass', 'horizontal_edge_top'))
+        self.assertIs(self.atlas.get_surface('grass', np.uint8(variant)),
+                      self.atlas.get_surface('grass', int(variant)))
+
+    def test_chunk_textures_count_towards_budget(self):
+        """Test scaled textures are bounded by their share of the budget and evicted oldest first."""
+        game_map = GameMap(8, 8)
+        for x in range(8):
+            game_map.set_terrain(x, 0, 'desert')
+        game_map.journal.commit()
+        texture_bytes = 64 * 64 * pygame.Surface((1, 1)).get_bytesize()
+        cache = TerrainChunkCache(game_map, budget_bytes=2 * TEXTURE_SHARE * texture_bytes,
+                                  builder=PyramidBuilder(background=False), atlas=self.atlas)
+        cache.get_chunk(0, 0, 0.25)
+        unbounded = TerrainChunkCache(game_map, builder=PyramidBuilder(background=False), atlas=self.atlas)
+        unbounded.get_chunk(0, 0, 0.25)
+
+        self.assertGreater(len(unbounded.textures), 2)
+        self.assertEqual(list(cache.textures), list(unbounded.textures)[-2:])
+        self.assertEqual(cache.texture_bytes, 2 * texture_bytes)
+        self.assertEqual(tuple(cache.get_chunk(0, 0, 0.25)[0].get_at((10, 10)))[:3], (230, 210, 120))
+
+    def test_background_builds_during_terrain_edits(self):
+        """Test builder thread jobs leave the map alone while it is edited and end up matching it."""
+        game_map = GameMap(32, 32)
+        game_map.journal.commit()
+        resolving_threads = set()
+        get_variant_ids = game_map.get_variant_ids
+
+        def recording_get_variant_ids(*args):
+            resolving_threads.add(threading.get_ident())
+            return get_variant_ids(*args)
+        game_map.get_variant_ids = recording_get_variant_ids
+
+        builder = PyramidBuilder()
+        cache = TerrainChunkCache(game_map, builder=builder, atlas=self.atlas)
+        chunks = [(cx, cy) for cy in range(4) for cx in range(4)]
+        for cx, cy in chunks:
+            cache.get_chunk(cx, cy, 0.25)
+
+        rng = random.Random(7)
+        for _ in range(60):
+            cache.begin_frame()
+            for cx, cy in chunks:
+                cache.get_chunk(cx, cy, rng.choice(cache.levels))
+            game_map.set_terrain(rng.randrange(32), rng.randrange(32), rng.choice(['grass', 'desert']))
+            game_map.journal.commit()
+        builder.wait()
+        cache.begin_frame()
+
+        # Variant ids are resolved and cached by the main thread only
+        self.assertEqual(resolving_threads, {threading.get_ident()})
+
+        self.assertEqual(game_map.get_variant_ids(0, 0, 32, 32).tolist(),
+                         variant_ids(game_map.layers.terrain).tolist())
+        for (cx, cy, level), surface in cache.chunks.items():
+            self.assertEqual(pygame.image.tobytes(surface, 'RGB'),
+                             pygame.image.tobytes(cache.rasterize(cx, cy, level), 'RGB'))
+
+if __name__ == '__main__':
+    unittest.main()
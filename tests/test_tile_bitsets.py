@@ -0,0 +1,67 @@
+import unittest
+import json
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.engine.tile_bitsets import PlayerTileBitsets
+from src.engine.map import Map
+from src.engine.map_serializer import MapSerializer
+
+
+class TestPlayerTileBitsets(unittest.TestCase):
+    def setUp(self):
+        """Set up a small, non byte-aligned grid."""
+        self.bitsets = PlayerTileBitsets(13, 7, capacity=2)
+
+    def test_set_and_query_tiles(self):
+        """Test single tile bits are isolated per player and per tile."""
+        self.bitsets.set_tile("p1", 3, 2)
+        self.assertTrue(self.bitsets.is_set("p1", 3, 2))
+        self.assertFalse(self.bitsets.is_set("p1", 2, 3))
+        self.assertFalse(self.bitsets.is_set("p2", 3, 2))
+        self.assertFalse(self.bitsets.is_set("p1", 99, 99))
+
+    def test_rows_match_packbits_layout(self):
+        """Test that a row unpacks to the same mask that was packed."""
+        mask = np.zeros((7, 13), dtype=bool)
+        mask[1, 4] = mask[6, 12] = mask[0, 0] = True
+        self.bitsets.set_mask("p1", mask)
+        np.testing.assert_array_equal(self.bitsets.row("p1"), np.packbits(mask.reshape(-1)))
+        np.testing.assert_array_equal(self.bitsets.to_mask("p1"), mask)
+
+    def test_union_and_count(self):
+        """Test vectorized union and popcount across players."""
+        self.bitsets.set_tile("p1", 0, 0)
+        self.bitsets.set_tile("p1", 5, 5)
+        self.bitsets.set_tile("p2", 5, 5)
+        self.bitsets.set_tile("p3", 12, 6)  # grows past the initial capacity
+
+        self.assertEqual(self.bitsets.capacity, 4)
+        self.assertEqual(self.bitsets.count("p1"), 2)
+        self.assertEqual(self.bitsets.count(), 3)
+        self.assertEqual(sorted(self.bitsets.players_at(5, 5)), ["p1", "p2"])
+        union = self.bitsets.union(["p2", "p3"])
+        self.assertEqual(int(np.unpackbits(union).sum()), 2)
+
+    def test_map_round_trip(self):
+        """Test exploration survives a JSON round trip through the map serializer."""
+        game_map = Map(10, 10)
+        game_map.mark_explored("p1", 4, 7)
+        game_map.mark_explored("p2", 9, 9)
+
+        data = json.loads(json.dumps(MapSerializer.serialize_map(game_map)))
+        self.assertNotIn('explored_by', data['tiles'][0])
+
+        restored = Map(10, 10)
+        restored.deserialize(data)
+        self.assertTrue(restored.is_explored("p1", 4, 7))
+        self.assertEqual(restored.explored_by(9, 9), ["p2"])
+        self.assertEqual(restored.explored.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
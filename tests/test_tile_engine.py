@@ -0,0 +1,66 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.tile_engine import TileEngine
+from src.tile_engine.zoom_pyramid import PyramidBuilder
+
+
+class HeldBuilder(PyramidBuilder):
+    """Synchronous builder that hands back nothing until released."""
+    def __init__(self):
+        super().__init__(background=False)
+        self.held = True
+
+    def collect(self):
+        return [] if self.held else super().collect()
+
+
+class TestFrameSignature(unittest.TestCase):
+    def setUp(self):
+        """Create a small engine whose terrain builds are handed back on demand."""
+        self.engine = TileEngine(800, 600, 16, 16)
+        self.engine.add_player("Alice", (255, 0, 0))
+        self.builder = HeldBuilder()
+        self.engine.terrain_cache.builder = self.builder
+        self.engine.prefetcher.builder = self.builder
+        self.screen = pygame.Surface((800, 600))
+
+    def render(self):
+        self.engine.update()
+        self.engine.render(self.screen)
+
+    def test_finished_build_changes_signature(self):
+        """Test a frame whose only change is a finished terrain build isn't idle."""
+        self.engine.viewport.zoom = 0.5
+        self.render()
+        self.engine.viewport.zoom = 1.0   # Drawn from 0.5 chunks while 1.0 is built
+        self.render()
+        signature = self.engine.frame_signature()
+        self.assertEqual(self.engine.frame_signature(), signature)
+
+        self.builder.held = False
+        self.assertNotEqual(self.engine.frame_signature(), signature)
+
+    def test_heatmap_toggle_changes_signature(self):
+        """Test showing an overlay changes the signature."""
+        signature = self.engine.frame_signature()
+        self.engine.toggle_heatmap('movement_cost')
+        self.assertNotEqual(self.engine.frame_signature(), signature)
+
+
+    def test_number_keys_toggle_heatmaps(self):
+        """Test the overlay keys show an overlay, switch to another and hide it again."""
+        self.engine.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1))
+        self.assertEqual(self.engine.active_heatmap, 'movement_cost')
+        self.engine.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_5))
+        self.assertEqual(self.engine.active_heatmap, 'gold_yield')
+        self.engine.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_5))
+        self.assertIsNone(self.engine.active_heatmap)
+
+if __name__ == '__main__':
+    unittest.main()
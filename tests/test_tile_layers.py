@@ -0,0 +1,113 @@
+import unittest
+import os
+import tempfile
+import time
+import numpy as np
+import sys
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.map import GameMap
+from src.tile_engine.tile_layers import TileLayers
+from src.storage.game_data_dto import GameDataDTO
+from src.storage.game_storage_manager import GameStorageManager
+
+
+class TestTileLayers(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary directory for map files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "world.map")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tiles_read_from_layers(self):
+        """Test tile attributes are backed by the layer arrays."""
+        game_map = GameMap(6, 4)
+        tile = game_map.get_tile(2, 3)
+        self.assertEqual((tile.terrain_type, tile.movement_cost, tile.defense_bonus), ('grass', 1, 0))
+        self.assertIsNone(tile.resource)
+
+        game_map.set_terrain(2, 3, 'mountain')
+        game_map.add_resource(2, 3, 'iron', 3)
+        self.assertEqual((tile.terrain_type, tile.movement_cost, tile.defense_bonus), ('mountain', 3, 50))
+        self.assertEqual((tile.resource.type, tile.resource.yield_value), ('iron', 3))
+        self.assertIs(game_map.get_tile(2, 3), tile)
+
+    def test_save_and_reopen_memory_mapped(self):
+        """Test a saved map reopens memory-mapped with all layers intact."""
+        game_map = GameMap(50, 30)
+        game_map.set_terrain(10, 20, 'water')
+        game_map.add_resource(49, 29, 'gold', 7)
+        game_map.exploration.set_tile(3, 10, 20)
+        game_map.save(self.path)
+        self.assertIsInstance(game_map.layers.terrain.data, np.memmap)
+
+        reopened = GameMap.open(self.path)
+        self.assertEqual((reopened.width, reopened.height), (50, 30))
+        self.assertEqual(reopened.get_tile(10, 20).terrain_type, 'water')
+        self.assertEqual(reopened.get_tile(10, 20).movement_cost, 2)
+        self.assertEqual(reopened.get_resource(49, 29).yield_value, 7)
+        self.assertTrue(reopened.exploration.is_set(3, 10, 20))
+        self.assertEqual(reopened.exploration.player_ids(), [3])
+
+    def test_file_backed_writes_persist(self):
+        """Test writes to a file backed map reach the file after a flush."""
+        game_map = GameMap(20, 20, backing_path=self.path)
+        game_map.set_terrain(5, 5, 'forest')
+        game_map.save(self.path)
+
+        layers = TileLayers.open(self.path, mode='r')
+        self.assertEqual(layers.terrain_names[layers.terrain[5, 5]], 'forest')
+        self.assertEqual(int(layers.defense_bonus[5, 5]), 25)
+
+    def test_new_names_reach_the_header(self):
+        """Test terrain and resource names registered after create() are written without a flush."""
+        game_map = GameMap(8, 8, backing_path=self.path)
+        game_map.set_terrain(1, 1, 'swamp')
+        game_map.add_resource(2, 2, 'silver', 4)
+
+        layers = TileLayers.open(self.path, mode='r')
+        self.assertIn('swamp', layers.terrain_names)
+        self.assertIn('silver', layers.resource_names)
+
+    def test_save_and_load_beside_the_database(self):
+        """Test a game save writes the map file next to the database and load maps it back."""
+        storage = GameStorageManager(os.path.join(self.temp_dir.name, "saves", "games.db"))
+        game_map = GameMap(16, 16)
+        game_map.set_terrain(4, 5, 'water')
+        self.assertTrue(storage.save_game(GameDataDTO("My World"), game_map=game_map))
+        self.assertTrue(os.path.exists(storage.get_map_file_path("My World")))
+
+        loaded = storage.load_map_layers("My World")
+        self.assertIsInstance(loaded.layers.terrain.data, np.memmap)
+        self.assertEqual(loaded.get_terrain(4, 5), 'water')
+        self.assertIsNone(storage.load_map_layers("Missing"))
+
+        del loaded, game_map   # Release the memory maps before the file is removed
+        self.assertTrue(storage.delete_game("My World"))
+        self.assertFalse(os.path.exists(storage.get_map_file_path("My World")))
+
+    def test_map_files_of_similar_names_differ(self):
+        """Test game names that sanitize alike still get their own map file."""
+        storage = GameStorageManager(os.path.join(self.temp_dir.name, "games.db"))
+        names = ["My World", "My_World", "My/World", "My?World"]
+        self.assertEqual(len({storage.get_map_file_path(name) for name in names}), len(names))
+
+    def test_open_is_lazy(self):
+        """Test opening a large map file does not read the layers."""
+        TileLayers.create(4096, 4096, self.path).flush()
+        start = time.perf_counter()
+        layers = TileLayers.open(self.path)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(int(layers.movement_cost[4095, 4095]), 1)
+
+        with self.assertRaises(ValueError):
+            for player_id in range(layers.exploration.capacity + 1):
+                layers.exploration.add_player(player_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
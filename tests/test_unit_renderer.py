@@ -0,0 +1,104 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.map import GameMap
+from src.tile_engine.player import Player
+from src.tile_engine.unit_manager import UnitManager
+from src.tile_engine.unit_renderer import UnitRenderer
+from src.tile_engine.viewport import Viewport
+from src.tile_engine.zoom_pyramid import PyramidBuilder, SurfacePyramid
+
+
+class MockUnit:
+    """Minimal unit that can be slotted onto a tile."""
+    def __init__(self, unit_type="Warriors"):
+        self.unit_type = unit_type
+
+
+class RecordingSurface(pygame.Surface):
+    """Surface that records the sequences passed to blits()."""
+    def blits(self, sequence, doreturn=True):
+        sequence = list(sequence)
+        self.batches.append(sequence)
+        return super().blits(sequence, doreturn)
+
+
+class TestUnitRenderer(unittest.TestCase):
+    def setUp(self):
+        """Create a 64-unit stack on screen and one unit far off screen."""
+        self.game_map = GameMap(40, 40)
+        self.unit_manager = UnitManager(self.game_map)
+        self.player = Player(0, "Alice", (255, 0, 0))
+        for _ in range(64):
+            unit = MockUnit()
+            self.player.add_unit(unit)
+            self.unit_manager.add_unit(unit, 1, 1)
+        far_unit = MockUnit("Cavalry")
+        self.player.add_unit(far_unit)
+        self.unit_manager.add_unit(far_unit, 35, 35)
+
+        self.renderer = UnitRenderer(self.unit_manager, SurfacePyramid(PyramidBuilder(background=False)))
+        self.viewport = Viewport(800, 600, 40, 40)
+        self.screen = pygame.Surface((800, 600))
+
+    def test_one_blits_call_for_visible_units(self):
+        """Test every visible unit is drawn in a single blits() call."""
+        screen = RecordingSurface((800, 600))
+        screen.batches = []
+        drawn = self.renderer.render(screen, self.viewport)
+
+        self.assertEqual(drawn, 64)
+        self.assertEqual([len(batch) for batch in screen.batches], [64])
+
+    def test_stamps_are_shared(self):
+        """Test units of the same colour and type share one stamp."""
+        self.renderer.render(self.screen, self.viewport)
+        self.assertEqual(list(self.renderer.stamps.surfaces[1.0]), [((255, 0, 0), "Warriors")])
+
+        # First slot of tile (1, 1) is centred at world (272, 272)
+        self.assertEqual(tuple(self.screen.get_at((272, 272)))[:3], (255, 0, 0))
+
+    def test_zoom_uses_scaled_stamps(self):
+        """Test zoomed out frames draw stamps from the pyramid level."""
+        self.viewport.zoom = 0.5
+        self.renderer.render(self.screen, self.viewport)
+        stamp = self.renderer.get_stamp(self.unit_manager.units[0], 0.5)
+        self.assertEqual(stamp.get_width(), 24)
+
+    def test_units_past_the_screen_edge_are_culled(self):
+        """Test units in the viewport's tile margin but off screen aren't drawn."""
+        edge_unit = MockUnit()
+        self.player.add_unit(edge_unit)
+        self.unit_manager.add_unit(edge_unit, 4, 0)   # x 1024..1280, right of an 800px screen
+
+        screen = RecordingSurface((800, 600))
+        screen.batches = []
+        self.assertEqual(self.renderer.render(screen, self.viewport), 64)
+
+
+    def test_reduced_detail_redraws_stamps(self):
+        """Test switching detail replaces the registered stamps with smaller ones."""
+        self.renderer.render(self.screen, self.viewport)
+        self.renderer.set_detail('reduced')
+        stamp = self.renderer.get_stamp(self.unit_manager.units[0], 1.0)
+        self.assertEqual(stamp.get_width(), 24)
+
+    def test_detail_change_reaches_scaled_levels(self):
+        """Test scaled stamps are rebuilt after a detail change and the pyramid reports it."""
+        self.viewport.zoom = 0.5
+        self.renderer.render(self.screen, self.viewport)
+        self.renderer.stamps.update()
+        version = self.renderer.stamps.version
+
+        self.renderer.set_detail('reduced')
+        self.renderer.render(self.screen, self.viewport)   # Falls back to the new 1.0 stamp
+        self.assertNotEqual(self.renderer.stamps.update(), version)
+        self.assertEqual(self.renderer.get_stamp(self.unit_manager.units[0], 0.5).get_width(), 12)
+
+if __name__ == '__main__':
+    unittest.main()
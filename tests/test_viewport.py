@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.viewport import Viewport
+
+
+class TestViewportProjection(unittest.TestCase):
+    def setUp(self):
+        self.viewport = Viewport(800, 600, 40, 40)
+        self.viewport.x, self.viewport.y = 1000, 500
+        self.viewport.zoom = 0.5
+
+    def test_project_matches_world_to_screen(self):
+        """Test batch projection gives the same coordinates as world_to_screen."""
+        xs = np.array([0, 1000, 1256, 3000])
+        ys = np.array([0, 500, 756, 2000])
+        screen_x, screen_y, _ = self.viewport.project(xs, ys)
+        for i in range(len(xs)):
+            self.assertEqual((screen_x[i], screen_y[i]), self.viewport.world_to_screen(xs[i], ys[i]))
+
+    def test_visibility_mask_uses_extent(self):
+        """Test items count as visible while any part of them overlaps the screen."""
+        # Left of the screen by 100 world px: only visible with a larger extent
+        xs, ys = np.array([900, 900]), np.array([600, 600])
+        _, _, visible = self.viewport.project(xs, ys, 0)
+        self.assertFalse(visible.any())
+        _, _, visible = self.viewport.project(xs, ys, 256)
+        self.assertTrue(visible.all())
+
+        # Right of the screen: the viewport spans 1600 world px at zoom 0.5
+        _, _, visible = self.viewport.project(np.array([2599, 2600]), np.array([600, 600]), 256)
+        self.assertEqual(visible.tolist(), [True, False])
+
+    def test_empty_input(self):
+        """Test projecting no positions returns empty arrays."""
+        screen_x, screen_y, visible = self.viewport.project([], [])
+        self.assertEqual((len(screen_x), len(screen_y), len(visible)), (0, 0, 0))
+
+
+class TestVisibleTileCache(unittest.TestCase):
+    def setUp(self):
+        self.viewport = Viewport(800, 600, 40, 40)
+        self.viewport.x, self.viewport.y = 512, 256
+
+    def test_rect_is_cached_until_the_view_moves(self):
+        """Test the visible range is reused while x, y and zoom are unchanged."""
+        tiles = self.viewport.get_visible_tiles()
+        self.assertIs(self.viewport.get_visible_tiles(), tiles)
+        self.assertEqual(self.viewport.get_visible_tile_rect(), (2, 1, 7, 5))
+
+        self.viewport.x += 256
+        self.assertEqual(self.viewport.get_visible_tile_rect(), (3, 1, 8, 5))
+        self.assertIsNot(self.viewport.get_visible_tiles(), tiles)
+
+        self.viewport.zoom = 0.5
+        self.assertEqual(self.viewport.get_visible_tile_rect(), (3, 1, 11, 7))
+
+    def test_slices_index_map_arrays(self):
+        """Test the slices select the same tiles as get_visible_tiles."""
+        grid = np.arange(40 * 40).reshape(40, 40)
+        rows, cols = self.viewport.get_visible_slices()
+        expected = [grid[y, x] for y, x in self.viewport.get_visible_tiles()]
+        self.assertEqual(grid[rows, cols].ravel().tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the src directory to the path so we can import from there
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tile_engine.zoom_pyramid import PyramidBuilder, SurfacePyramid, nearest_level
+
+
+class TestZoomPyramid(unittest.TestCase):
+    def test_nearest_level(self):
+        """Test zooms snap to the closest level in powers of two."""
+        self.assertEqual(nearest_level(0.3), 0.25)
+        self.assertEqual(nearest_level(0.4), 0.5)
+        self.assertEqual(nearest_level(1.4), 1.0)
+        self.assertEqual(nearest_level(1.5), 2.0)
+        self.assertEqual(nearest_level(3.9), 4.0)
+
+    def test_level_built_on_first_use(self):
+        """Test a level is scaled once in the background and served afterwards."""
+        pyramid = SurfacePyramid(PyramidBuilder(background=False))
+        pyramid.add('unit', pygame.Surface((32, 32)))
+
+        surface, level = pyramid.get('unit', 0.5)
+        self.assertEqual((surface.get_width(), level), (32, 1.0))  # Not installed yet
+
+        surface, level = pyramid.get('unit', 0.55)
+        self.assertEqual((surface.get_width(), level), (16, 0.5))
+        self.assertIs(pyramid.get('unit', 0.45)[0], surface)
+
+    def test_version_changes_when_levels_arrive(self):
+        """Test update() reports finished levels so layers drawn from fallbacks can redraw."""
+        pyramid = SurfacePyramid(PyramidBuilder(background=False))
+        pyramid.add('unit', pygame.Surface((32, 32)))
+        pyramid.get('unit', 0.5)                # Served from 1.0, 0.5 queued
+        version = pyramid.version
+
+        self.assertNotEqual(pyramid.update(), version)
+        self.assertEqual(pyramid.get('unit', 0.5)[1], 0.5)
+        self.assertEqual(pyramid.update(), pyramid.version)
+
+    def test_background_thread(self):
+        """Test levels are built on the worker thread."""
+        builder = PyramidBuilder()
+        pyramid = SurfacePyramid(builder)
+        pyramid.add('city', pygame.Surface((64, 64)))
+        pyramid.get('city', 4.0)
+        builder.wait()
+
+        surface, level = pyramid.get('city', 4.0)
+        self.assertEqual((surface.get_width(), level), (256, 4.0))
+
+    def test_replaced_sprite_is_rescaled(self):
+        """Test replacing a sprite discards its scaled copies."""
+        pyramid = SurfacePyramid(PyramidBuilder(background=False))
+        pyramid.add('unit', pygame.Surface((32, 32)))
+        pyramid.get('unit', 2.0)
+        pyramid.add('unit', pygame.Surface((40, 40)))
+
+        surface, level = pyramid.get('unit', 2.0)
+        self.assertEqual((surface.get_width(), level), (80, 2.0))
+        self.assertIsNone(pyramid.get('missing', 1.0)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()